@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+인덱싱/검색/PPT 생성 성능 측정
+
+같은 시드로 항상 같은 가짜 찬양 PPTX 라이브러리(한글/영어 가사, 선택적으로
+큰 이미지 포함)를 만들고 다음 시나리오의 시간을 잰다.
+- 전체 인덱싱 (index_praise_files)
+- 관련 찬양 표 계산 (저장 후 백그라운드)
+- 인덱스 로드 (load_from_json)
+- 파일 추가 (add_files + save_to_json)
+- 검색 (검색 타입 × 검색어 길이별 첫 검색 시간)
+- PPT 생성 (10 / 50 / 200곡)
+
+결과는 JSON 파일로 저장되어 실행끼리 비교할 수 있다. --trace를 주면 단계별
+시간 구간(tracing.span)을 Chrome 추적 형식으로 함께 저장하고 구간 합계를
+결과에 넣는다.
+
+    python benchmark.py --sizes 100,1000 --media both -o result.json
+    python benchmark.py --sizes 100 --compare result.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import struct
+import sys
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+from tracing import enable_logging, tracer
+
+CORPUS_SIZES = (100, 1000, 10000)
+DECK_SIZES = (10, 50, 200)
+QUERY_LENGTHS = (1, 2, 4, 8)
+SEARCH_TYPES = ("title", "lyrics", "both")
+# 검색어 길이/타입마다 재는 검색어 수
+QUERIES_PER_CASE = 20
+# 파일 추가 시나리오에서 추가하는 파일 수
+INCREMENTAL_FILES = 10
+# 큰 미디어 포함 라이브러리에서 곡마다 넣는 이미지 크기 (픽셀, 압축되지 않는 잡음)
+HEAVY_MEDIA_SIZE = 512
+RESULT_VERSION = 1
+
+_KOREAN_WORDS = (
+    "주님 하나님 사랑 십자가 은혜 감사 찬양 영광 나의 우리 아버지 예수 거룩 평안 "
+    "소망 믿음 빛 생명 길 진리 기쁨 노래 하늘 땅 마음 영혼 주의 보혈 능력 이름 "
+    "성령 나라 왕 찬송 경배 구원 약속 인도 위로 새로운 영원히 함께 높이 오직"
+).split()
+_ENGLISH_WORDS = (
+    "lord god love grace holy light king glory praise jesus spirit forever "
+    "amazing worthy name heart"
+).split()
+
+
+def _noise_png(rng, size):
+    """압축되지 않는 잡음 PNG (큰 미디어 흉내)"""
+    raw = b"".join(b"\x00" + rng.randbytes(size * 3) for _ in range(size))
+    def chunk(kind, data):
+        return (struct.pack(">I", len(data)) + kind + data
+                + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw, 1))
+            + chunk(b"IEND", b""))
+
+
+def _phrase(rng, low, high, english_ratio=0.0):
+    words = []
+    for _ in range(rng.randint(low, high)):
+        pool = _ENGLISH_WORDS if rng.random() < english_ratio else _KOREAN_WORDS
+        words.append(rng.choice(pool))
+    return " ".join(words)
+
+
+def generate_corpus(folder, count, seed=0, heavy_media=False, start=0):
+    """가짜 찬양 PPTX 라이브러리 생성 (같은 인자면 항상 같은 내용)
+
+    파일 이름은 "제목_번호.pptx"이고 번호는 start부터 시작한다.
+    곡마다 2~6개 슬라이드, 슬라이드마다 1~4줄 가사이며 일부 곡은 영어 가사다.
+    heavy_media이면 곡마다 큰 이미지를 한 장 넣는다.
+    """
+    from io import BytesIO
+    from pptx import Presentation
+    from pptx.util import Inches
+
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for number in range(start, start + count):
+        rng = random.Random(f"{seed}:{number}")
+        english_ratio = 0.8 if rng.random() < 0.2 else 0.1
+        prs = Presentation()
+        title = _phrase(rng, 1, 3, english_ratio)
+        for slide_index in range(rng.randint(2, 6)):
+            slide = prs.slides.add_slide(prs.slide_layouts[6])
+            if heavy_media and slide_index == 0:
+                image = BytesIO(_noise_png(rng, HEAVY_MEDIA_SIZE))
+                slide.shapes.add_picture(image, 0, 0, prs.slide_width, prs.slide_height)
+            frame = slide.shapes.add_textbox(Inches(1), Inches(1), Inches(8), Inches(4)).text_frame
+            for line_index in range(rng.randint(1, 4)):
+                paragraph = frame.paragraphs[0] if line_index == 0 else frame.add_paragraph()
+                paragraph.text = _phrase(rng, 2, 7, english_ratio)
+        path = folder / f"{title}_{number}.pptx"
+        prs.save(str(path))
+        paths.append(path)
+    return paths
+
+
+def generate_template(path):
+    """PPT 생성 시나리오용 템플릿 (가사 텍스트 상자 하나)"""
+    from pptx import Presentation
+    from pptx.util import Inches, Pt
+
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    frame = slide.shapes.add_textbox(Inches(0.5), Inches(1), Inches(9), Inches(4)).text_frame
+    frame.text = "가사 예시"
+    frame.paragraphs[0].runs[0].font.size = Pt(40)
+    prs.save(str(path))
+    return Path(path)
+
+
+def prepare_corpus(work_dir, count, seed=0, heavy_media=False):
+    """라이브러리 폴더 준비 (같은 설정으로 이미 만들어 둔 폴더는 재사용)"""
+    folder = Path(work_dir) / f"corpus_{count}_{'heavy' if heavy_media else 'text'}_{seed}"
+    manifest_path = folder / "corpus.json"
+    manifest = {"count": count, "seed": seed, "heavy_media": heavy_media}
+    if manifest_path.exists():
+        try:
+            if json.loads(manifest_path.read_text(encoding="utf-8")) == manifest:
+                return folder
+        except (OSError, ValueError):
+            pass
+    if folder.exists():
+        for path in folder.glob("*.pptx"):
+            path.unlink()
+    generate_corpus(folder, count, seed, heavy_media)
+    manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+    return folder
+
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def _summary(samples):
+    """초 단위 측정값 목록 → 밀리초 통계"""
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "median_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def sample_queries(indexer, search_type, length, count, seed=0):
+    """인덱스에 실제로 있는 부분 문자열에서 검색어를 고름 (정규화된 형태)"""
+    rng = random.Random(f"{seed}:{search_type}:{length}")
+    data = indexer.praise_data
+    fields = {"title": ("title_normalized",), "lyrics": ("lyrics_normalized",),
+              "both": ("title_normalized", "lyrics_normalized")}[search_type]
+    queries = []
+    for _ in range(count * 20):
+        if len(queries) >= count:
+            break
+        text = data[rng.randrange(len(data))][rng.choice(fields)]
+        if len(text) < length:
+            continue
+        start = rng.randrange(len(text) - length + 1)
+        query = text[start:start + length]
+        if query not in queries:
+            queries.append(query)
+    return queries
+
+
+class BenchmarkRunner:
+    """한 라이브러리 크기/미디어 설정의 시나리오 실행"""
+
+    def __init__(self, work_dir, seed=0):
+        self.work_dir = Path(work_dir)
+        self.seed = seed
+        self.results = []
+
+    def record(self, scenario, corpus, seconds=None, **fields):
+        entry = {"scenario": scenario, "corpus": corpus}
+        if seconds is not None:
+            entry["seconds"] = seconds
+        entry.update(fields)
+        self.results.append(entry)
+        if seconds is not None:
+            detail = f"{seconds:.3f}s"
+        else:
+            detail = f"median {fields['median_ms']:.2f}ms, p95 {fields['p95_ms']:.2f}ms"
+        parts = [corpus, scenario]
+        parts += [f"{key}={value}" for key, value in fields.items()
+                  if key in ("search_type", "query_length", "songs", "files")]
+        print(f"[INFO] {' '.join(parts)} {detail}", file=sys.stderr)
+        return entry
+
+    def run_corpus(self, count, heavy_media=False, deck_sizes=DECK_SIZES):
+        from json_indexer import JSONPraiseIndexer
+        from json_ppt_generator_fixed import JSONPPTGeneratorFixed
+
+        corpus = f"{count}{'-heavy' if heavy_media else ''}"
+        folder = prepare_corpus(self.work_dir, count, self.seed, heavy_media)
+        size_mb = sum(p.stat().st_size for p in folder.glob("*.pptx")) / (1024 * 1024)
+        index_dir = self.work_dir / f"index_{corpus}"
+        index_dir.mkdir(parents=True, exist_ok=True)
+        for path in index_dir.iterdir():
+            if path.is_file():
+                path.unlink()
+        index_json = index_dir / "praise_index.json"
+
+        # 전체 인덱싱
+        indexer = JSONPraiseIndexer(str(folder), str(index_json))
+        seconds, ok = _timed(indexer.index_praise_files)
+        self.record("index_full", corpus, seconds, songs=len(indexer.praise_data),
+                    library_mb=round(size_mb, 1), ok=bool(ok))
+        # 관련 찬양 표는 저장 후 백그라운드에서 계산 (다음 측정과 겹치지 않도록 따로 잼)
+        seconds, _ = _timed(indexer.wait_related)
+        self.record("related_build", corpus, seconds, songs=len(indexer.praise_data))
+
+        # 새 프로세스처럼 인덱스 로드
+        indexer = JSONPraiseIndexer(str(folder), str(index_json))
+        seconds, ok = _timed(indexer.load_from_json)
+        self.record("index_load", corpus, seconds, songs=len(indexer.praise_data), ok=bool(ok))
+        indexer.wait_related()
+
+        # 파일 추가 (라이브러리 밖에서 만든 새 파일)
+        extra_dir = index_dir / "incremental"
+        extra = generate_corpus(extra_dir, INCREMENTAL_FILES, self.seed + 1, heavy_media, start=count)
+        add_seconds, results = _timed(indexer.add_files, extra)
+        save_seconds, ok = _timed(indexer.save_to_json)
+        indexer.wait_related()
+        self.record("index_incremental", corpus, add_seconds + save_seconds,
+                    files=len(extra), added=sum(1 for _, added, _ in results if added),
+                    add_seconds=add_seconds, save_seconds=save_seconds, ok=bool(ok))
+
+        # 검색: 매번 다른 검색어로 첫 검색 시간을 잰다 (결과 캐시 효과 제외)
+        for search_type in SEARCH_TYPES:
+            for length in QUERY_LENGTHS:
+                queries = sample_queries(indexer, search_type, length, QUERIES_PER_CASE, self.seed)
+                if not queries:
+                    continue
+                samples = []
+                hits = 0
+                for query in queries:
+                    indexer.search_cache.clear()
+                    seconds, found = _timed(indexer.search_praises, query, search_type)
+                    samples.append(seconds)
+                    hits += len(found)
+                self.record("search", corpus, search_type=search_type, query_length=length,
+                            mean_results=hits / len(queries), **_summary(samples))
+
+        # PPT 생성
+        template = generate_template(index_dir / "template.pptx")
+        generator = JSONPPTGeneratorFixed(str(index_json), str(template), indexer=indexer)
+        rng = random.Random(self.seed)
+        data = indexer.praise_data
+        for songs in deck_sizes:
+            if songs > len(data):
+                continue
+            selected = [{"id": data[i]["id"], "title": data[i]["title"]}
+                        for i in rng.sample(range(len(data)), songs)]
+            output = index_dir / f"deck_{songs}.pptx"
+            seconds, ok = _timed(generator.create_ppt_from_lyrics, selected, str(output))
+            self.record("generate_deck", corpus, seconds, songs=songs,
+                        output_mb=round(output.stat().st_size / (1024 * 1024), 2) if output.exists() else 0,
+                        ok=bool(ok))
+
+        indexer.close_binary_index()
+        return self.results
+
+
+def result_key(entry):
+    """실행끼리 같은 측정을 짝짓는 키"""
+    return (entry["scenario"], entry["corpus"], entry.get("search_type"),
+            entry.get("query_length"), entry.get("songs") if entry["scenario"] == "generate_deck" else None)
+
+
+def result_value(entry):
+    """비교에 쓰는 대표값 (초, 검색은 중앙값)"""
+    if "seconds" in entry:
+        return entry["seconds"]
+    return entry["median_ms"] / 1000
+
+
+def compare_results(baseline, current):
+    """이전 결과 대비 (키, 이전 값, 현재 값, 비율) 목록"""
+    previous = {result_key(entry): entry for entry in baseline["results"]}
+    rows = []
+    for entry in current["results"]:
+        old = previous.get(result_key(entry))
+        if old is None:
+            continue
+        before, after = result_value(old), result_value(entry)
+        rows.append((result_key(entry), before, after, after / before if before else None))
+    return rows
+
+
+def run_benchmarks(sizes, media, work_dir, seed=0, deck_sizes=DECK_SIZES):
+    runner = BenchmarkRunner(work_dir, seed)
+    media_options = {"none": (False,), "heavy": (True,), "both": (False, True)}[media]
+    for count in sizes:
+        for heavy_media in media_options:
+            runner.run_corpus(count, heavy_media, deck_sizes)
+    return {
+        "version": RESULT_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {
+            "sizes": list(sizes),
+            "media": media,
+            "seed": seed,
+            "deck_sizes": list(deck_sizes),
+            "query_lengths": list(QUERY_LENGTHS),
+            "queries_per_case": QUERIES_PER_CASE,
+        },
+        "results": runner.results,
+        "spans": tracer.summary() if tracer.enabled else None,
+    }
+
+
+def _int_list(text):
+    return tuple(int(value) for value in text.split(",") if value.strip())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="찬양 인덱서 성능 측정")
+    parser.add_argument("--sizes", type=_int_list, default=CORPUS_SIZES,
+                        help="라이브러리 곡 수 (쉼표로 구분, 기본: 100,1000,10000)")
+    parser.add_argument("--media", choices=("none", "heavy", "both"), default="none",
+                        help="큰 이미지 포함 여부 (기본: none)")
+    parser.add_argument("--decks", type=_int_list, default=DECK_SIZES,
+                        help="PPT 생성 곡 수 (기본: 10,50,200)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--work-dir", default="benchmark_data",
+                        help="생성한 라이브러리/인덱스 폴더 (재실행 시 라이브러리 재사용)")
+    parser.add_argument("-o", "--output", default="benchmark_results.json", help="결과 JSON 파일")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 파일")
+    parser.add_argument("--trace", help="단계별 시간 구간을 저장할 Chrome 추적 형식 JSON 파일")
+    parser.add_argument("--verbose", action="store_true", help="인덱서/생성기 디버그 로그 표시")
+    args = parser.parse_args()
+
+    enable_logging("DEBUG" if args.verbose else "WARNING", sys.stderr)
+    if args.trace:
+        tracer.start()
+    report = run_benchmarks(args.sizes, args.media, args.work_dir, args.seed, args.decks)
+    Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"[OK] 결과 저장됨: {args.output}")
+    if args.trace:
+        tracer.export(args.trace)
+        print(f"[OK] 추적 저장됨: {args.trace}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        for key, before, after, ratio in compare_results(baseline, report):
+            label = " ".join(str(part) for part in key if part is not None)
+            change = f"{ratio:.2f}x" if ratio is not None else "-"
+            print(f"{label:40} {before * 1000:10.2f}ms → {after * 1000:10.2f}ms  {change}")
+
+
+if __name__ == "__main__":
+    main()
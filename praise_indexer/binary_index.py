@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+메모리 매핑(mmap) 바이너리 찬양 인덱스
+
+praise_index.bin 구조 (리틀 엔디언, 모든 섹션 8바이트 정렬):
+- 고정 헤더: 매직, 버전, 찬양 수, 섹션 디렉터리 (섹션별 오프셋/길이)
+- 숫자 배열: id, 슬라이드 수, 상세 세그먼트 위치, 원본 파일의 수정 시각(mtime_ns)/크기
+- 줄 경계 배열: 찬양별 line_ends / slide_ends (검색 위치 → 슬라이드/줄 변환용)
+- 가사 MinHash 서명: 찬양별 minhash (거의 같은 곡 찾기용)
+- 문자열 테이블: 필드별 UTF-8 blob + 레코드별 시작 오프셋 배열
+- 포스팅 리스트: 정규화된 제목/가사의 글자 bigram → 레코드 번호 목록
+
+파일을 읽어 파싱하지 않고 mmap으로 바로 검색하므로 열기는 찬양 수와
+무관하게 빠르고, 여러 프로세스가 같은 페이지를 공유한다.
+검색 결과로 돌려주는 레코드만 dict로 디코딩한다.
+"""
+
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from pathlib import Path
+
+MAGIC = b"PRAISEIX"
+VERSION = 5
+
+# 문자열 테이블로 저장하는 필드
+STRING_FIELDS = (
+    "title", "filename", "file_path",
+    "title_normalized", "lyrics_normalized", "preview",
+    "title_qwerty", "lyrics_qwerty",
+)
+# bigram 포스팅 리스트를 만드는 필드
+POSTING_FIELDS = ("title_normalized", "lyrics_normalized")
+# 찬양별 정수 배열 필드 (모두 이어 붙인 배열 + 레코드별 시작 위치)
+ARRAY_FIELDS = ("line_ends", "slide_ends", "minhash")
+
+# 섹션 이름 → 배열 타입 (None이면 UTF-8 blob)
+SECTIONS = [
+    ("ids", "I"),
+    ("slide_count", "I"),
+    ("detail_offset", "Q"),
+    ("detail_length", "I"),
+    ("mtime_ns", "Q"),
+    ("size", "Q"),
+]
+for _field in STRING_FIELDS:
+    SECTIONS.append((f"{_field}.offsets", "I"))
+    SECTIONS.append((f"{_field}.blob", None))
+for _field in ARRAY_FIELDS:
+    SECTIONS.append((f"{_field}.starts", "I"))
+    SECTIONS.append((f"{_field}.values", "I"))
+for _field in POSTING_FIELDS:
+    SECTIONS.append((f"{_field}.keys", "Q"))
+    SECTIONS.append((f"{_field}.starts", "I"))
+    SECTIONS.append((f"{_field}.postings", "I"))
+
+_FIXED_HEADER = struct.Struct("<8sII")
+_SECTION_ENTRY = struct.Struct("<QQ")
+
+
+def bigram_key(a, b):
+    """글자 두 개를 하나의 정수 키로 묶기 (코드포인트는 21비트 이내)"""
+    return (ord(a) << 21) | ord(b)
+
+
+def iter_bigram_keys(text):
+    """문자열의 모든 bigram 키"""
+    for i in range(len(text) - 1):
+        yield bigram_key(text[i], text[i + 1])
+
+
+def binary_index_paths(path):
+    """번갈아 쓰는 바이너리 인덱스 파일 두 개 (praise_index.bin, praise_index.alt.bin)
+
+    윈도우에서는 mmap으로 열려 있는 파일을 교체할 수 없으므로, 새 인덱스는
+    현재 스냅샷이 열지 않은 쪽 파일에 쓴다.
+    """
+    path = Path(path)
+    return path, path.with_name(f"{path.stem}.alt{path.suffix}")
+
+
+def latest_binary_index_path(path, not_before=None):
+    """두 파일 중 마지막에 쓴 파일 (없거나 not_before보다 오래되었으면 None)"""
+    latest = None
+    latest_mtime = None
+    for candidate in binary_index_paths(path):
+        try:
+            mtime = candidate.stat().st_mtime
+        except OSError:
+            continue
+        if latest is None or mtime > latest_mtime:
+            latest, latest_mtime = candidate, mtime
+    if latest is None or (not_before is not None and latest_mtime < not_before):
+        return None
+    return latest
+
+
+def write_binary_index(records, path):
+    """헤더 레코드 목록으로 바이너리 인덱스 파일 작성 (임시 파일에 쓴 뒤 교체)"""
+    path = Path(path)
+    count = len(records)
+    sections = {}
+
+    sections["ids"] = array("I", (r["id"] for r in records))
+    sections["slide_count"] = array("I", (r.get("slide_count") or 0 for r in records))
+    sections["detail_offset"] = array("Q", (r.get("detail_offset") or 0 for r in records))
+    sections["detail_length"] = array("I", (r.get("detail_length") or 0 for r in records))
+    # 모르는 수정 시각/크기는 0 (실제 파일과 다르므로 증분 인덱싱에서 변경으로 봄)
+    sections["mtime_ns"] = array("Q", (r.get("mtime_ns") or 0 for r in records))
+    sections["size"] = array("Q", (r.get("size") or 0 for r in records))
+
+    for field in STRING_FIELDS:
+        offsets = array("I", [0])
+        chunks = []
+        total = 0
+        for r in records:
+            data = (r.get(field) or "").encode("utf-8")
+            chunks.append(data)
+            total += len(data)
+            offsets.append(total)
+        sections[f"{field}.offsets"] = offsets
+        sections[f"{field}.blob"] = b"".join(chunks)
+
+    for field in ARRAY_FIELDS:
+        starts = array("I", [0])
+        values = array("I")
+        for r in records:
+            values.extend(r.get(field) or ())
+            starts.append(len(values))
+        sections[f"{field}.starts"] = starts
+        sections[f"{field}.values"] = values
+
+    for field in POSTING_FIELDS:
+        postings = {}
+        for i, r in enumerate(records):
+            for key in set(iter_bigram_keys(r.get(field) or "")):
+                postings.setdefault(key, []).append(i)
+        keys = array("Q", sorted(postings))
+        starts = array("I", [0])
+        flat = array("I")
+        for key in keys:
+            flat.extend(postings[key])
+            starts.append(len(flat))
+        sections[f"{field}.keys"] = keys
+        sections[f"{field}.starts"] = starts
+        sections[f"{field}.postings"] = flat
+
+    directory_size = _FIXED_HEADER.size + _SECTION_ENTRY.size * len(SECTIONS)
+    position = _align(directory_size)
+    layout = []
+    for name, _ in SECTIONS:
+        data = sections[name]
+        data = data.tobytes() if isinstance(data, array) else data
+        layout.append((position, data))
+        position = _align(position + len(data))
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(_FIXED_HEADER.pack(MAGIC, VERSION, count))
+            for offset, data in layout:
+                f.write(_SECTION_ENTRY.pack(offset, len(data)))
+            for offset, data in layout:
+                f.write(b"\0" * (offset - f.tell()))
+                f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        # 교체하지 못한 임시 파일은 남기지 않음
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _align(n, size=8):
+    return (n + size - 1) // size * size
+
+
+class BinaryPraiseIndex(Sequence):
+    """mmap으로 연 바이너리 인덱스 (읽기 전용 시퀀스)
+
+    index[i]는 i번째 찬양의 헤더 dict를 새로 만들어 돌려준다.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        self._views = []
+        self._id_positions = None
+
+        magic, version, count = _FIXED_HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"지원하지 않는 바이너리 인덱스: {self.path}")
+        self._count = count
+
+        self._sections = {}
+        base = memoryview(self._mm)
+        self._views.append(base)
+        for i, (name, fmt) in enumerate(SECTIONS):
+            offset, length = _SECTION_ENTRY.unpack_from(self._mm, _FIXED_HEADER.size + i * _SECTION_ENTRY.size)
+            if fmt is None:
+                self._sections[name] = (offset, length)
+            else:
+                view = base[offset:offset + length]
+                cast = view.cast(fmt)
+                self._views.extend([view, cast])
+                self._sections[name] = cast
+
+    def close(self):
+        """mmap 해제 (이후 이 인덱스는 사용할 수 없음)"""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._sections = {}
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        record = {"id": self._sections["ids"][index]}
+        for field in STRING_FIELDS:
+            record[field] = self.field(index, field)
+        record["slide_count"] = self._sections["slide_count"][index]
+        record["detail_offset"] = self._sections["detail_offset"][index]
+        record["detail_length"] = self._sections["detail_length"][index]
+        record["mtime_ns"] = self._sections["mtime_ns"][index]
+        record["size"] = self._sections["size"][index]
+        for field in ARRAY_FIELDS:
+            record[field] = self.array_field(index, field)
+        return record
+
+    def field(self, index, field):
+        """index번째 찬양의 문자열 필드 하나만 디코딩"""
+        blob_offset, _ = self._sections[f"{field}.blob"]
+        offsets = self._sections[f"{field}.offsets"]
+        start = blob_offset + offsets[index]
+        end = blob_offset + offsets[index + 1]
+        return self._mm[start:end].decode("utf-8")
+
+    def number_field(self, index, field):
+        """index번째 찬양의 숫자 필드 하나 (slide_count / mtime_ns / size 등)"""
+        return self._sections[field][index]
+
+    def array_field(self, index, field):
+        """index번째 찬양의 정수 배열 필드 (line_ends / slide_ends / minhash)"""
+        starts = self._sections[f"{field}.starts"]
+        return self._sections[f"{field}.values"][starts[index]:starts[index + 1]].tolist()
+
+    def section_sizes(self):
+        """섹션 이름 → 바이트 수 (메모리 사용량 보고용)"""
+        sizes = {}
+        for name, section in self._sections.items():
+            sizes[name] = section[1] if isinstance(section, tuple) else section.nbytes
+        return sizes
+
+    def ids(self):
+        """모든 찬양 ID 목록"""
+        return self._sections["ids"].tolist()
+
+    def index_of_id(self, praise_id):
+        """ID에 해당하는 레코드 번호 (없으면 -1, 처음 찾을 때 ID → 번호 dict 생성)"""
+        if self._id_positions is None:
+            self._id_positions = {value: i for i, value in enumerate(self._sections["ids"])}
+        return self._id_positions.get(praise_id, -1)
+
+    def matching_indices(self, field, query_normalized, candidates=None):
+        """정규화된 필드에 검색어가 들어 있는 레코드 번호 (오름차순)
+        
+        candidates(오름차순 레코드 번호)를 주면 그 레코드만 확인한다.
+        """
+        if not query_normalized:
+            return list(range(self._count)) if candidates is None else list(candidates)
+        needle = query_normalized.encode("utf-8")
+        
+        if candidates is not None:
+            blob_offset, _ = self._sections[f"{field}.blob"]
+            offsets = self._sections[f"{field}.offsets"]
+            find = self._mm.find
+            return [
+                i for i in candidates
+                if find(needle, blob_offset + offsets[i], blob_offset + offsets[i + 1]) >= 0
+            ]
+
+        if field in POSTING_FIELDS and len(query_normalized) >= 2:
+            candidates = self._posting_candidates(field, query_normalized)
+            blob_offset, _ = self._sections[f"{field}.blob"]
+            offsets = self._sections[f"{field}.offsets"]
+            if len(query_normalized) == 2:
+                return candidates
+            return [
+                i for i in candidates
+                if self._mm.find(needle, blob_offset + offsets[i], blob_offset + offsets[i + 1]) >= 0
+            ]
+        return list(self._scan(field, needle))
+
+    def _posting_candidates(self, field, query_normalized):
+        """검색어의 모든 bigram을 포함하는 레코드 번호 (포스팅 리스트 교집합)"""
+        keys = self._sections[f"{field}.keys"]
+        starts = self._sections[f"{field}.starts"]
+        postings = self._sections[f"{field}.postings"]
+
+        ranges = []
+        for key in set(iter_bigram_keys(query_normalized)):
+            k = bisect_left(keys, key)
+            if k == len(keys) or keys[k] != key:
+                return []
+            ranges.append((starts[k], starts[k + 1]))
+
+        # 가장 짧은 포스팅 리스트부터 교집합
+        ranges.sort(key=lambda r: r[1] - r[0])
+        start, end = ranges[0]
+        result = set(postings[start:end].tolist())
+        for start, end in ranges[1:]:
+            if not result:
+                break
+            result.intersection_update(postings[start:end].tolist())
+        return sorted(result)
+
+    def _scan(self, field, needle):
+        """문자열 blob 전체에서 검색어를 찾아 레코드 번호로 변환"""
+        blob_offset, blob_length = self._sections[f"{field}.blob"]
+        offsets = self._sections[f"{field}.offsets"]
+        end = blob_offset + blob_length
+        position = blob_offset
+        while True:
+            hit = self._mm.find(needle, position, end)
+            if hit < 0:
+                return
+            index = bisect_right(offsets, hit - blob_offset) - 1
+            record_end = blob_offset + offsets[index + 1]
+            if hit + len(needle) <= record_end:
+                yield index
+                position = record_end
+            else:
+                # 두 레코드 경계에 걸친 일치는 무시
+                position = hit + 1
+
+    def match_scores(self, query_normalized, search_type="title", candidates=None):
+        """검색 타입별 점수 (레코드 번호 → 점수), JSONPraiseIndexer.score_praise와 동일 기준"""
+        if search_type == "title":
+            return dict.fromkeys(self.matching_indices("title_normalized", query_normalized, candidates), 100)
+        if search_type == "lyrics":
+            return dict.fromkeys(self.matching_indices("lyrics_normalized", query_normalized, candidates), 100)
+        if search_type == "both":
+            scores = dict.fromkeys(self.matching_indices("title_normalized", query_normalized, candidates), 50)
+            for i in self.matching_indices("lyrics_normalized", query_normalized, candidates):
+                scores[i] = scores.get(i, 0) + 50
+            return scores
+        return {}
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+메모리를 적게 쓰는 찬양 레코드 표현
+
+기존 dict 레코드는 같은 가사를 lyrics, 슬라이드별 text, text_lines,
+lyrics_normalized로 네 번 들고 있고 슬라이드마다 dict 오버헤드가 붙는다.
+여기서는 가사 줄을 공유 문자열 풀에 한 번만 저장하고, 찬양은 줄 번호
+배열과 슬라이드 경계(오프셋 배열)만 가진다. lyrics / slides_text는
+필요할 때 풀에서 조립하는 가벼운 뷰로 제공하므로 기존 코드의
+praise['slides_text'][0]['text_lines'] 같은 접근은 그대로 동작한다.
+"""
+
+import threading
+from array import array
+from collections.abc import Mapping, Sequence
+
+
+class StringPool:
+    """가사 줄 공유 풀 (같은 줄은 한 번만 저장)
+
+    줄을 지우지 않으므로 프로세스 전체에 하나를 두지 않고 인덱싱/파일 추가 한 번
+    (또는 곡 하나)마다 새로 만든다. 풀을 참조하는 레코드가 모두 헤더만 남거나
+    캐시에서 밀려나면 풀도 함께 해제된다.
+    """
+
+    __slots__ = ("strings", "_ids", "_lock")
+
+    def __init__(self):
+        self.strings = []
+        self._ids = {}
+        # 병렬 추출 스레드에서 동시에 추가할 수 있으므로 추가 시에만 잠금
+        self._lock = threading.Lock()
+
+    def intern(self, text):
+        """문자열의 풀 번호 (처음 보는 줄이면 추가)"""
+        line_id = self._ids.get(text)
+        if line_id is None:
+            with self._lock:
+                line_id = self._ids.get(text)
+                if line_id is None:
+                    line_id = len(self.strings)
+                    self.strings.append(text)
+                    self._ids[text] = line_id
+        return line_id
+
+    def __len__(self):
+        return len(self.strings)
+
+
+class SlideView(Mapping):
+    """슬라이드 하나의 읽기 전용 뷰 (slide_number / text / text_lines)"""
+
+    __slots__ = ("_record", "_index")
+    _KEYS = ("slide_number", "text", "text_lines")
+
+    def __init__(self, record, index):
+        self._record = record
+        self._index = index
+
+    def _lines(self):
+        record = self._record
+        start = record.slide_starts[self._index]
+        end = record.slide_starts[self._index + 1]
+        strings = record.pool.strings
+        return [strings[i] for i in record.line_ids[start:end]]
+
+    def __getitem__(self, key):
+        if key == "slide_number":
+            return self._record.slide_numbers[self._index]
+        if key == "text_lines":
+            return self._lines()
+        if key == "text":
+            return "\n".join(self._lines())
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self):
+        return len(self._KEYS)
+
+    def __repr__(self):
+        return f"SlideView({dict(self)!r})"
+
+
+class SlidesView(Sequence):
+    """찬양의 slides_text 읽기 전용 뷰"""
+
+    __slots__ = ("_record",)
+
+    def __init__(self, record):
+        self._record = record
+
+    def __len__(self):
+        return len(self._record.slide_numbers)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return SlideView(self._record, index)
+
+    def to_list(self):
+        """기존 형식의 slides_text (dict 목록)"""
+        return [dict(slide) for slide in self]
+
+
+class SongRecord(Mapping):
+    """슬롯 기반 찬양 레코드 (dict처럼 praise['title'] 형태로 접근)
+
+    헤더 필드는 슬롯에, 가사는 줄 번호 배열(line_ids)과 슬라이드 시작
+    위치(slide_starts, 마지막에 끝 위치 포함) / 슬라이드 번호로 저장한다.
+    가사 없이 헤더만 가진 레코드는 lyrics / slides_text 키가 없다.
+    """
+
+    __slots__ = (
+        "id", "filename", "title", "file_path",
+        "title_normalized", "lyrics_normalized",
+        "title_qwerty", "lyrics_qwerty",
+        "preview", "slide_count", "detail_offset", "detail_length",
+        "line_ends", "slide_ends", "minhash", "mtime_ns", "size",
+        "pool", "line_ids", "slide_starts", "slide_numbers",
+    )
+
+    HEADER_FIELDS = (
+        "id", "filename", "title", "file_path",
+        "title_normalized", "lyrics_normalized",
+        "title_qwerty", "lyrics_qwerty",
+        "preview", "slide_count", "detail_offset", "detail_length",
+        "line_ends", "slide_ends", "minhash", "mtime_ns", "size",
+    )
+    # 정수 배열로 보관하는 헤더 필드
+    ARRAY_FIELDS = ("line_ends", "slide_ends", "minhash")
+
+    def __init__(self, pool=None, **fields):
+        for field in self.HEADER_FIELDS:
+            setattr(self, field, fields.get(field))
+        self.pool = pool
+        self.line_ids = None
+        self.slide_starts = None
+        self.slide_numbers = None
+
+    @classmethod
+    def from_dict(cls, data, pool=None):
+        """기존 dict 레코드로 생성 (slides_text가 있으면 풀에 줄을 넣어 압축)"""
+        record = cls(pool, **{field: data.get(field) for field in cls.HEADER_FIELDS})
+        for field in cls.ARRAY_FIELDS:
+            values = getattr(record, field)
+            if values is not None:
+                setattr(record, field, array("I", values))
+        slides_text = data.get("slides_text")
+        if slides_text is not None and pool is not None:
+            record.set_slides(slides_text)
+        return record
+
+    def set_slides(self, slides_text):
+        """slides_text를 줄 번호 배열과 슬라이드 경계로 압축 저장"""
+        intern = self.pool.intern
+        line_ids = array("I")
+        slide_starts = array("I", [0])
+        slide_numbers = array("I")
+        for slide in slides_text:
+            lines = slide.get("text_lines")
+            if lines is None:
+                lines = slide.get("text", "").split("\n")
+            line_ids.extend(intern(line) for line in lines)
+            slide_starts.append(len(line_ids))
+            slide_numbers.append(slide["slide_number"])
+        self.line_ids = line_ids
+        self.slide_starts = slide_starts
+        self.slide_numbers = slide_numbers
+        self.slide_count = len(slide_numbers)
+
+    def copy(self, **fields):
+        """헤더 필드 일부만 바꾼 새 레코드 (가사 배열과 풀은 공유)"""
+        for field in fields:
+            if field not in self.HEADER_FIELDS:
+                raise KeyError(field)
+        record = SongRecord(self.pool, **{field: fields.get(field, getattr(self, field))
+                                          for field in self.HEADER_FIELDS})
+        record.line_ids = self.line_ids
+        record.slide_starts = self.slide_starts
+        record.slide_numbers = self.slide_numbers
+        return record
+
+    @property
+    def has_slides(self):
+        return self.line_ids is not None
+
+    def _keys(self):
+        if self.has_slides:
+            return self.HEADER_FIELDS + ("lyrics", "slides_text")
+        return self.HEADER_FIELDS
+
+    def __getitem__(self, key):
+        if key in self.HEADER_FIELDS:
+            return getattr(self, key)
+        if self.has_slides:
+            if key == "slides_text":
+                return SlidesView(self)
+            if key == "lyrics":
+                strings = self.pool.strings
+                return "\n".join(strings[i] for i in self.line_ids)
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key not in self.HEADER_FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __iter__(self):
+        return iter(self._keys())
+
+    def __len__(self):
+        return len(self._keys())
+
+    def __eq__(self, other):
+        if isinstance(other, SongRecord):
+            return self.to_dict() == other.to_dict()
+        return Mapping.__eq__(self, other)
+
+    __hash__ = None
+
+    def to_dict(self):
+        """기존 형식의 dict (JSON 저장용)"""
+        data = {field: getattr(self, field) for field in self.HEADER_FIELDS
+                if getattr(self, field) is not None}
+        for field in self.ARRAY_FIELDS:
+            if field in data:
+                data[field] = list(data[field])
+        if self.has_slides:
+            data["lyrics"] = self["lyrics"]
+            data["slides_text"] = SlidesView(self).to_list()
+        return data
+
+    def __repr__(self):
+        return f"SongRecord(id={self.id!r}, title={self.title!r})"
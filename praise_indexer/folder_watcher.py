@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+찬양 폴더 감시 (새/변경/삭제된 PPTX를 백그라운드에서 인덱스에 반영)
+
+리눅스에서는 ctypes로 inotify를 써서 폴더 변경 알림을 받고, 그 밖의
+환경(윈도우, 네트워크 드라이브 등)에서는 (mtime, 크기) 캐시를 두고 폴더를
+주기적으로 훑어 바뀐 파일만 찾는다. 복사/저장 중에는 알림이 연달아
+오므로 DEBOUNCE_SECONDS 동안 조용해진 뒤 모아서 한 번에 반영한다.
+
+반영은 바뀐 파일만 (잠금 밖에서) 추출한 뒤 add_entries / replace_entries /
+remove_praise_by_id로 처리하고 인덱스는 한 번만 저장하므로, 비용은 바뀐 파일
+수에만 비례한다. 바뀐 파일은 기존 찬양 ID를 그대로 쓴다.
+
+    watcher = FolderWatcher(indexer, on_change=print)
+    watcher.start()
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+from tracing import get_logger, span
+
+logger = get_logger(__name__)
+
+# 변경이 멈춘 뒤 반영까지 기다리는 시간 (초)
+DEBOUNCE_SECONDS = 1.0
+# 폴링 방식에서 폴더를 훑는 간격 (초)
+POLL_INTERVAL = 2.0
+# inotify 대기 중 중지 요청 확인 간격 (초)
+STOP_CHECK_INTERVAL = 0.5
+# PowerPoint/LibreOffice 잠금 파일, macOS 리소스 포크
+IGNORED_PREFIXES = ("~$", ".~", "._")
+
+
+def is_praise_file(name):
+    """감시 대상 파일인지 (PPTX, 임시/잠금 파일 제외)"""
+    return name.lower().endswith(".pptx") and not name.startswith(IGNORED_PREFIXES)
+
+
+class StatCache:
+    """폴더의 파일 이름 → (mtime_ns, 크기) 캐시
+
+    scandir 한 번으로 폴더를 훑고, 캐시와 다른 이름만 돌려준다
+    (윈도우에서는 scandir 항목에 stat 정보가 들어 있어 파일별 시스템 호출이 없다).
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.entries = {}
+
+    def snapshot(self):
+        entries = {}
+        try:
+            with os.scandir(self.folder) as it:
+                for entry in it:
+                    if not is_praise_file(entry.name):
+                        continue
+                    try:
+                        if entry.is_file():
+                            stat = entry.stat()
+                            entries[entry.name] = (stat.st_mtime_ns, stat.st_size)
+                    except OSError:
+                        # 훑는 사이에 지워진 파일
+                        continue
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def scan(self):
+        """바뀐(추가/변경/삭제된) 파일 이름 집합"""
+        entries = self.snapshot()
+        old = self.entries
+        changed = {name for name, stat in entries.items() if old.get(name) != stat}
+        changed.update(name for name in old if name not in entries)
+        self.entries = entries
+        return changed
+
+
+class _Inotify:
+    """ctypes로 감싼 리눅스 inotify (폴더 하나, 하위 폴더 제외)"""
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+                  | IN_DELETE_SELF | IN_MOVE_SELF)
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, folder):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 실패")
+        if libc.inotify_add_watch(self.fd, os.fsencode(str(folder)), self.WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch 실패: {folder}")
+
+    def read(self, timeout):
+        """(바뀐 파일 이름 집합, 전체 다시 훑기 필요 여부), timeout 동안 알림이 없으면 빈 집합"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set(), False
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set(), False
+        names, rescan = set(), False
+        offset = 0
+        while offset + self.EVENT_HEADER.size <= len(data):
+            _, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & (self.IN_Q_OVERFLOW | self.IN_DELETE_SELF | self.IN_MOVE_SELF):
+                rescan = True
+            elif name and is_praise_file(name):
+                names.add(name)
+        return names, rescan
+
+    def close(self):
+        os.close(self.fd)
+
+
+class FolderWatcher:
+    """찬양 폴더 변경을 인덱스에 반영하는 백그라운드 스레드
+
+    on_change(result)는 변경을 반영하고 저장한 뒤 감시 스레드에서 호출된다
+    (result: {"added", "changed", "removed"} 파일 이름 목록, "failed"는 (파일 이름, 실패 이유) 목록).
+    한 번에 모은 변경은 인덱서의 batch()로 묶어 스냅샷 하나로 게시하므로,
+    검색은 반영 중에도 멈추지 않고 반쯤 바뀐 인덱스를 보지 않는다.
+    """
+
+    def __init__(self, indexer, on_change=None, debounce=DEBOUNCE_SECONDS,
+                 poll_interval=POLL_INTERVAL, use_inotify=True):
+        self.indexer = indexer
+        self.folder = indexer.praise_folder
+        self.on_change = on_change
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify and sys.platform.startswith("linux")
+        self.stat_cache = StatCache(self.folder)
+        self.backend = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, sync=True):
+        """감시 시작 (sync이면 먼저 인덱스 이후 바뀐 파일을 찾아 반영)"""
+        if self._thread is not None:
+            return True
+        if not self.folder.is_dir():
+            logger.warning("감시할 찬양 폴더가 없습니다: %s", self.folder)
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(sync,), name="folder-watcher", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def join(self, timeout=None):
+        """감시 스레드가 끝날 때까지 대기 (끝났거나 시작하지 않았으면 True)"""
+        thread = self._thread
+        if thread is None:
+            return True
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    def _open_inotify(self):
+        if not self.use_inotify:
+            return None
+        try:
+            return _Inotify(self.folder)
+        except (OSError, AttributeError) as e:
+            # inotify가 없거나(오래된 커널, libc 아님) 감시 수 한도 초과
+            logger.info("inotify 사용 불가, 폴링으로 감시: %s", e)
+            return None
+
+    def _run(self, sync):
+        inotify = self._open_inotify()
+        self.backend = "inotify" if inotify else "polling"
+        logger.info("찬양 폴더 감시 시작 (%s): %s", self.backend, self.folder)
+        # 알림을 받기 시작한 뒤에 기준 목록을 만들어야 그 사이 변경을 놓치지 않음
+        self.stat_cache.scan()
+        pending = self._initial_changes() if sync else set()
+        last_event = time.monotonic() - self.debounce if pending else 0.0
+        try:
+            while not self._stop.is_set():
+                if inotify:
+                    # 중지 요청을 확인할 수 있도록 짧게 나눠 기다림
+                    names, rescan = inotify.read(min(self.debounce, STOP_CHECK_INTERVAL))
+                    if rescan:
+                        names |= self.stat_cache.scan()
+                else:
+                    self._stop.wait(self.debounce if pending else self.poll_interval)
+                    names = self.stat_cache.scan()
+                now = time.monotonic()
+                if names:
+                    pending |= names
+                    last_event = now
+                elif pending and now - last_event >= self.debounce:
+                    batch, pending = pending, set()
+                    self.apply(batch)
+        except Exception:
+            logger.exception("찬양 폴더 감시 중단")
+        finally:
+            if inotify:
+                inotify.close()
+
+    def _initial_changes(self):
+        """인덱스와 폴더를 비교해 감시 시작 전에 (프로그램이 꺼져 있는 동안) 바뀐 파일 이름"""
+        snapshot = self.indexer.snapshot
+        added, changed, removed = self.indexer.file_changes(snapshot)
+        filenames = {praise_id: filename for praise_id, _, filename in snapshot.file_paths()}
+        names = {path.name for path in added}
+        names.update(path.name for _, path in changed)
+        names.update(filenames[praise_id] for praise_id in removed if praise_id in filenames)
+        return names
+
+    def apply(self, names):
+        """바뀐 파일들을 인덱스에 반영하고 저장 (변경 결과 dict)
+
+        추출은 잠금 밖에서 먼저 하고 인덱스 반영과 저장만 묶음(write_lock) 안에서
+        하므로, 추출하는 동안 GUI의 삭제 같은 다른 변경이 기다리지 않는다.
+        """
+        result = {"added": [], "changed": [], "removed": [], "failed": []}
+        names = sorted(names)
+        with span("watch_apply", files=len(names)):
+            existing = [name for name in names if (self.folder / name).is_file()]
+            extracted = self.indexer.extract_files([self.folder / name for name in existing])
+            entries = {name: (entry, message) for name, (entry, (_, _, message)) in zip(existing, extracted)}
+            with self.indexer.batch():
+                indexed = {}
+                for praise_id, _, filename in self.indexer.snapshot.file_paths():
+                    indexed.setdefault(filename, praise_id)
+                for name in names:
+                    praise_id = indexed.get(name)
+                    if name in entries:
+                        entry, message = entries[name]
+                        # 추출에 실패하면(저장 중인 파일 등) 기존 레코드를 유지
+                        if entry is None:
+                            result["failed"].append((name, message))
+                            continue
+                        if praise_id is not None:
+                            self.indexer.replace_entries({praise_id: entry})
+                            result["changed"].append(name)
+                        else:
+                            self.indexer.add_entries([entry])
+                            result["added"].append(name)
+                    elif praise_id is not None:
+                        self.indexer.remove_praise_by_id(praise_id)
+                        result["removed"].append(name)
+                if result["added"] or result["changed"] or result["removed"]:
+                    self.indexer.save_to_json()
+                elif not result["failed"]:
+                    # 인덱스에 없던 파일이 지워진 경우 등 반영할 것이 없음
+                    return result
+        logger.info("폴더 변경 반영: 추가 %s개, 변경 %s개, 삭제 %s개, 실패 %s개",
+                    len(result["added"]), len(result["changed"]), len(result["removed"]), len(result["failed"]))
+        for name, message in result["failed"]:
+            logger.warning("%s: 추출 실패 (%s)", name, message)
+        if self.on_change is not None:
+            self.on_change(result)
+        return result
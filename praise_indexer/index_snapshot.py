@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+인덱스 스냅샷 (게시한 뒤에는 바뀌지 않는 인덱스의 한 시점)
+
+인덱서는 현재 스냅샷 하나를 참조로 들고 있고, 인덱스를 바꾸는 쪽은 다음
+스냅샷을 따로 만든 뒤 참조만 바꿔 게시한다. 검색/PPT 생성처럼 읽는 쪽은
+시작할 때 indexer.snapshot을 한 번 잡아 끝까지 그 스냅샷만 쓰므로, 인덱싱이
+진행 중이어도 잠금 없이 항상 온전한 한 시점을 본다.
+
+검색 버퍼, 검색 캐시, 자동완성, 콘티 검색기, 상세 캐시, 거의 같은 곡 묶음도
+스냅샷마다 따로 두므로 인덱스가 바뀌면 새 스냅샷과 함께 자연히 새로 만들어진다.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+from binary_index import BinaryPraiseIndex
+from compact_store import SongRecord
+from near_duplicates import DuplicateIndex, minhash_signature
+from scan_index import ConcatenatedScanIndex
+from title_typeahead import TitleTypeahead
+
+# 상세 세그먼트를 연 채로 고정할 수 있는지 (윈도우에서는 열린 파일을 교체할 수 없음)
+PIN_DETAIL_FILE = os.name != "nt" and hasattr(os, "pread")
+
+
+class IndexSnapshot:
+    """찬양 레코드 목록과 그에 딸린 검색 구조
+
+    praise_data는 튜플 또는 mmap 바이너리 인덱스다. 캐시 dict는 여러 읽기
+    스레드가 함께 쓰므로 짧은 잠금으로 보호하고, 점수 계산/버퍼 생성 같은
+    무거운 작업은 잠금 밖에서 한다 (두 스레드가 동시에 만들면 한쪽이 버려짐).
+    """
+
+    def __init__(self, praise_data, version, typeahead=None, detail_path=None,
+                 search_cache_size=32, detail_cache_size=64):
+        if not isinstance(praise_data, BinaryPraiseIndex):
+            praise_data = tuple(praise_data)
+        self.praise_data = praise_data
+        self.version = version
+        self.search_cache = OrderedDict()
+        self.search_cache_size = search_cache_size
+        self.detail_cache = OrderedDict()
+        self.detail_cache_size = detail_cache_size
+        self.scan_index = None
+        self.typeahead = typeahead
+        self.setlist_resolver = None
+        self.duplicates = None
+        self._id_positions = None
+        self._lock = threading.Lock()
+        # 게시 시점의 상세 세그먼트를 열어 두면(POSIX) 나중에 파일이 교체되어도
+        # 이 스냅샷의 위치(detail_offset)로 예전 내용을 그대로 읽을 수 있다
+        self.detail_file = None
+        if detail_path is not None and PIN_DETAIL_FILE and os.path.exists(detail_path):
+            self.detail_file = open(detail_path, "rb")
+
+    def __len__(self):
+        return len(self.praise_data)
+
+    @property
+    def is_binary(self):
+        return isinstance(self.praise_data, BinaryPraiseIndex)
+
+    def records(self):
+        """다음 스냅샷을 만들 수정 가능한 레코드 목록 (바이너리면 파이썬 레코드로 변환)"""
+        if self.is_binary:
+            return [SongRecord.from_dict(d) for d in self.praise_data]
+        return list(self.praise_data)
+
+    def ids(self):
+        data = self.praise_data
+        return data.ids() if self.is_binary else [p['id'] for p in data]
+
+    def find(self, praise_id):
+        """ID로 찬양(헤더) 찾기"""
+        data = self.praise_data
+        if self.is_binary:
+            index = data.index_of_id(praise_id)
+            return data[index] if index >= 0 else None
+        if self._id_positions is None:
+            self._id_positions = {praise['id']: i for i, praise in enumerate(data)}
+        index = self._id_positions.get(praise_id)
+        return data[index] if index is not None else None
+
+    def find_by_field(self, field, value):
+        """헤더 필드 값이 같은 첫 찬양 (없으면 None, 전체를 훑음)"""
+        data = self.praise_data
+        if self.is_binary:
+            for i in range(len(data)):
+                if data.field(i, field) == value:
+                    return data[i]
+            return None
+        return next((praise for praise in data if praise.get(field) == value), None)
+
+    def get_scan_index(self):
+        """메모리 목록용 이어 붙인 버퍼 검색 인덱스 (처음 사용할 때 생성)"""
+        if self.scan_index is None:
+            self.scan_index = ConcatenatedScanIndex(self.praise_data)
+        return self.scan_index
+
+    def search_engine(self):
+        """점수 계산에 쓸 객체 (바이너리 인덱스 또는 버퍼 검색 인덱스)"""
+        return self.praise_data if self.is_binary else self.get_scan_index()
+
+    def get_typeahead(self):
+        """제목 자동완성 인덱스 (없으면 생성)"""
+        if self.typeahead is None:
+            data = self.praise_data
+            if self.is_binary:
+                # 제목 필드만 디코딩
+                titles = [
+                    (praise_id, data.field(i, "title"), data.field(i, "title_normalized"))
+                    for i, praise_id in enumerate(data.ids())
+                ]
+            else:
+                titles = [(p['id'], p['title'], p['title_normalized']) for p in data]
+            self.typeahead = TitleTypeahead(titles)
+        return self.typeahead
+
+    def lyrics(self):
+        """레코드별 (찬양 ID, 정규화된 가사) 목록"""
+        data = self.praise_data
+        if self.is_binary:
+            return [(praise_id, data.field(i, "lyrics_normalized")) for i, praise_id in enumerate(data.ids())]
+        return [(praise['id'], praise.get('lyrics_normalized') or "") for praise in data]
+
+    def file_paths(self):
+        """레코드별 (찬양 ID, file_path, filename) 목록"""
+        data = self.praise_data
+        if self.is_binary:
+            return [(praise_id, data.field(i, "file_path"), data.field(i, "filename"))
+                    for i, praise_id in enumerate(data.ids())]
+        return [(praise['id'], praise['file_path'], praise['filename']) for praise in data]
+
+    def file_stats(self):
+        """레코드별 (찬양 ID, filename, 인덱싱한 파일의 (mtime_ns, 크기)) 목록"""
+        data = self.praise_data
+        if self.is_binary:
+            return [(praise_id, data.field(i, "filename"),
+                     (data.number_field(i, "mtime_ns"), data.number_field(i, "size")))
+                    for i, praise_id in enumerate(data.ids())]
+        return [(praise['id'], praise['filename'], (praise.get('mtime_ns'), praise.get('size'))) for praise in data]
+
+    def signatures(self):
+        """레코드별 가사 MinHash 서명 목록 (서명이 없는 레코드는 가사로 계산)"""
+        data = self.praise_data
+        if self.is_binary:
+            return [data.array_field(i, "minhash") for i in range(len(data))]
+        signatures = []
+        for praise in data:
+            signature = praise.get('minhash')
+            if signature is None:
+                signature = minhash_signature(praise.get('lyrics_normalized') or "")
+            signatures.append(signature)
+        return signatures
+
+    def get_duplicates(self):
+        """거의 같은 곡 묶음 (처음 사용할 때 생성)"""
+        if self.duplicates is None:
+            self.duplicates = DuplicateIndex(self.signatures())
+        return self.duplicates
+
+    def cache_get(self, cache, key):
+        with self._lock:
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+        return None
+
+    def cache_put(self, cache, key, value, size):
+        with self._lock:
+            cache[key] = value
+            while len(cache) > size:
+                cache.popitem(last=False)
+
+    def cached_searches(self, search_type):
+        """이 검색 타입의 캐시된 (검색어, 점수) 목록 (캐시 복사본)"""
+        with self._lock:
+            return [(query, scores) for (query, cached_type), scores in self.search_cache.items()
+                    if cached_type == search_type and isinstance(query, str)]
+
+    def read_detail(self, store, praise):
+        """고정해 둔 상세 세그먼트에서 찬양 하나의 slides_text 읽기 (고정하지 않았으면 None)"""
+        if self.detail_file is None:
+            return None
+        raw = os.pread(self.detail_file.fileno(), praise['detail_length'], praise['detail_offset'])
+        return store.decode_detail(praise['id'], raw)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+인덱스 무결성 검사 (저장된 파일 경로 ↔ 찬양 폴더)
+
+인덱스의 file_path는 찬양 폴더 기준 상대 경로(폴더 밖에서 직접 추가한 파일은
+절대 경로)로 저장한다. 예전 인덱스에는 실행 위치에 따라 달라지는 경로
+("praise_indexer\\Praise_PPT\\..." 등)가 남아 있으므로, 찬양 폴더를 scandir로
+한 번만 훑어 이름 → 파일 표를 만든 뒤 모든 레코드를 표에서 확인한다
+(폴더 안 파일은 파일별 stat 호출이 없음).
+
+- 정상: 저장된 경로에 파일이 있음
+- 경로 갱신: 경로는 틀렸지만 같은 이름의 파일이 찬양 폴더에 있음 (옮겨졌거나 예전 형식)
+- 없음: 어디에도 파일이 없음
+- 색인 안 됨: 찬양 폴더에 있지만 어느 레코드도 가리키지 않는 파일
+
+경로 갱신은 파일을 건드리지 않으므로 시작할 때 바로 반영하고, 레코드 삭제/
+파일 추가는 praise_cli.py check --repair로 명시적으로 한다.
+"""
+
+from pathlib import Path
+
+from folder_watcher import StatCache
+from tracing import get_logger, span
+
+logger = get_logger(__name__)
+
+
+class IntegrityReport:
+    """무결성 검사 결과
+
+    relinked: [(찬양 ID, 저장된 경로, 새 경로)], missing: [(찬양 ID, 저장된 경로)],
+    orphaned: [찬양 폴더의 파일 이름], ok: 정상 레코드 수
+    """
+
+    def __init__(self):
+        self.ok = 0
+        self.relinked = []
+        self.missing = []
+        self.orphaned = []
+
+    @property
+    def clean(self):
+        return not (self.relinked or self.missing or self.orphaned)
+
+    def to_dict(self):
+        return {
+            "ok": self.ok,
+            "relinked": [{"id": praise_id, "file_path": old, "new_path": new}
+                         for praise_id, old, new in self.relinked],
+            "missing": [{"id": praise_id, "file_path": old} for praise_id, old in self.missing],
+            "orphaned": list(self.orphaned),
+        }
+
+
+def _is_within(path, root):
+    try:
+        path.resolve().relative_to(root)
+        return True
+    except (OSError, ValueError):
+        return False
+
+
+def check_integrity(indexer, snapshot=None):
+    """인덱스의 모든 파일 경로를 찬양 폴더 한 번 훑기로 확인 (IntegrityReport)"""
+    if snapshot is None:
+        snapshot = indexer.snapshot
+    root = indexer.praise_folder
+    report = IntegrityReport()
+    with span("check_integrity", songs=len(snapshot)):
+        files = StatCache(root).snapshot()
+        resolved_root = root.resolve()
+        referenced = set()
+        for praise_id, stored, filename in snapshot.file_paths():
+            stored = stored or ""
+            if stored in files:
+                # 현재 형식 (찬양 폴더 기준 상대 경로)
+                referenced.add(stored)
+                report.ok += 1
+                continue
+            path = Path(stored)
+            if path.is_absolute() and not _is_within(path, resolved_root) and path.is_file():
+                # 찬양 폴더 밖에서 직접 추가한 파일
+                report.ok += 1
+                continue
+            if filename in files:
+                referenced.add(filename)
+                report.relinked.append((praise_id, stored, filename))
+            else:
+                report.missing.append((praise_id, stored))
+        report.orphaned = sorted(name for name in files if name not in referenced)
+    return report
+
+
+def repair(indexer, report, remove_missing=False, add_orphaned=False):
+    """검사 결과 반영: 경로 갱신 (+ 없는 파일의 레코드 삭제, 색인 안 된 파일 추가)
+
+    바뀐 것이 있으면 스냅샷 하나로 게시하고 한 번만 저장한다.
+    반환값은 (갱신, 삭제, 추가, 추가 실패) 수와 추가하지 못한 파일별 이유
+    errors([{"file", "error"}]) dict.
+    """
+    result = {"relinked": 0, "removed": 0, "added": 0, "failed": 0, "errors": []}
+    extracted = []
+    if add_orphaned and report.orphaned:
+        # 추출은 잠금 밖에서 먼저
+        extracted = indexer.extract_files([indexer.praise_folder / name for name in report.orphaned])
+    with indexer.batch():
+        if report.relinked:
+            indexer.set_file_paths({praise_id: new for praise_id, _, new in report.relinked})
+            result["relinked"] = len(report.relinked)
+        if remove_missing:
+            for praise_id, _ in report.missing:
+                if indexer.remove_praise_by_id(praise_id):
+                    result["removed"] += 1
+        if extracted:
+            entries = [entry for entry, _ in extracted if entry]
+            indexer.add_entries(entries)
+            result["added"] = len(entries)
+            result["failed"] = len(extracted) - len(entries)
+            result["errors"] = [{"file": Path(path).name, "error": message}
+                                for entry, (path, _, message) in extracted if not entry]
+        if result["relinked"] or result["removed"] or result["added"]:
+            indexer.save_to_json()
+    if result["relinked"] or result["removed"] or result["added"]:
+        logger.info("인덱스 경로 정리: 경로 갱신 %s개, 삭제 %s개, 추가 %s개",
+                    result["relinked"], result["removed"], result["added"])
+    return result
+
+
+def relink_files(indexer):
+    """시작할 때 실행: 틀린 경로만 찬양 폴더의 같은 이름 파일로 갱신 (IntegrityReport)
+
+    찬양 폴더가 없으면(다른 PC의 인덱스만 쓰는 경우 등) 아무것도 바꾸지 않는다.
+    """
+    if not indexer.praise_folder.is_dir():
+        return None
+    report = check_integrity(indexer)
+    if report.relinked:
+        repair(indexer, report)
+    if report.missing:
+        logger.warning("파일이 없는 찬양 %s개 (praise_cli.py check로 확인)", len(report.missing))
+    return report
@@ -4,18 +4,39 @@
 JSON 기반 찬양 검색 GUI (CustomTkinter)
 """
 
+import time
+
+# 시작 시간 측정 기준점 (무거운 모듈 import 이전)
+_STARTUP_T0 = time.perf_counter()
+
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import messagebox, filedialog
 import json
 from pathlib import Path
 import threading
-import time
 import sys
 import os
 
-from json_indexer import JSONPraiseIndexer
-from json_ppt_generator_fixed import JSONPPTGeneratorFixed as JSONPPTGenerator
+# python-pptx를 끌어오는 PPT 생성기는 백그라운드 로드 시점에 지연 import
+from json_indexer import JSONPraiseIndexer, StaleCursorError
+from search_hits import slide_lines, text_span
+from tracing import configure_from_env, get_logger
+
+logger = get_logger(__name__)
+
+# 시작 시간 예산 (초): 창 표시까지 / 데이터 로드 완료까지
+STARTUP_WINDOW_BUDGET = 1.0
+STARTUP_READY_BUDGET = 3.0
+
+# 검색 결과 한 페이지 크기 (스크롤 시 다음 페이지를 이어서 로드)
+RESULTS_PAGE_SIZE = 30
+
+# 검색창 아래 제목 자동완성 목록 최대 개수
+SUGGESTION_LIMIT = 8
+
+# 선택한 찬양 아래에 표시하는 관련 찬양 수
+RELATED_LIMIT = 8
 
 class JSONPraiseGUI:
     """JSON 기반 찬양 검색 GUI"""
@@ -58,8 +79,23 @@ class JSONPraiseGUI:
         
         # 검색 타이머
         self.search_timer = None
+        # 가사 미리보기 타이머 / 현재 미리보기 중인 (찬양 ID, 검색 조건)
+        self.preview_timer = None
+        self.preview_key = None
+        # 검색 페이지네이션 상태 (다음 페이지 커서, 현재 검색 조건)
+        self.search_cursor = None
+        self.search_query = None
+        self.loading_more = False
+        self.load_more_button = None
+        # 제목 자동완성 목록에 표시 중인 (찬양 ID, 제목)
+        self.suggestions = []
+        # 인덱스/템플릿 로드 완료 여부 (로드 전에는 검색 비활성화)
+        self.data_ready = False
+        # 찬양 폴더 감시 (로드 후 시작)
+        self.folder_watcher = None
         
         self.setup_ui()
+        self.root.after_idle(self._report_window_time)
         self.load_data()
     
     def create_tooltip(self, widget, text):
@@ -110,6 +146,16 @@ class JSONPraiseGUI:
         self.search_entry.pack(side="left", padx=(0, 10), pady=10)
         self.search_entry.bind('<KeyRelease>', self.on_search_change)
         self.search_entry.bind('<Return>', self.on_search_enter)
+        self.search_entry.bind('<Down>', self.focus_suggestions)
+        self.search_entry.bind('<Escape>', lambda e: self.hide_suggestions())
+        
+        # 제목 자동완성 목록 (검색창 바로 아래에 겹쳐 표시)
+        self.suggest_listbox = tk.Listbox(self.root, height=SUGGESTION_LIMIT, font=("맑은 고딕", 12),
+                                          activestyle="none", bg="#2b2b2b", fg="white",
+                                          selectbackground="#1f6aa5", highlightthickness=0, bd=1)
+        self.suggest_listbox.bind('<ButtonRelease-1>', self.apply_suggestion)
+        self.suggest_listbox.bind('<Return>', self.apply_suggestion)
+        self.suggest_listbox.bind('<Escape>', lambda e: self.hide_suggestions(focus_entry=True))
         
         # 검색 타입
         search_type_label = ctk.CTkLabel(search_frame, text="검색 타입:", font=ctk.CTkFont(size=13))
@@ -121,6 +167,12 @@ class JSONPraiseGUI:
                                            font=ctk.CTkFont(size=13))
         search_type_menu.pack(side="left", padx=(0, 10), pady=10)
         
+        # 가사가 거의 같은 곡(다른 파일 이름의 사본)은 하나만 표시
+        self.collapse_var = tk.BooleanVar(value=False)
+        collapse_checkbox = ctk.CTkCheckBox(search_frame, text="같은 곡 하나만", variable=self.collapse_var,
+                                            command=self.perform_search, font=ctk.CTkFont(size=13))
+        collapse_checkbox.pack(side="left", padx=(0, 10), pady=10)
+        
         # 파일 추가 버튼
         self.add_file_button = ctk.CTkButton(search_frame, text="파일 추가", command=self.add_pptx_file,
                                            width=80, height=30, font=ctk.CTkFont(size=13, weight="bold"),
@@ -132,6 +184,11 @@ class JSONPraiseGUI:
                                          width=70, height=30, font=ctk.CTkFont(size=13, weight="bold"))
         self.index_button.pack(side="right", padx=(0, 10), pady=10)
         
+        # 콘티 붙여넣기 버튼 (여러 곡을 한 번에 선택 목록에 추가)
+        self.setlist_button = ctk.CTkButton(search_frame, text="콘티 붙여넣기", command=self.open_setlist_dialog,
+                                           width=100, height=30, font=ctk.CTkFont(size=13, weight="bold"))
+        self.setlist_button.pack(side="right", padx=(0, 10), pady=10)
+        
         # 메인 콘텐츠 프레임
         content_frame = ctk.CTkFrame(main_frame)
         content_frame.pack(fill="both", expand=True)
@@ -148,6 +205,19 @@ class JSONPraiseGUI:
         # 검색 결과 리스트
         self.results_frame = ctk.CTkScrollableFrame(left_frame, height=300)
         self.results_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        self._bind_results_scroll()
+        
+        # 가사 미리보기 (마우스를 올리거나 클릭한 찬양의 전체 슬라이드)
+        self.preview_title_var = tk.StringVar(value="가사 미리보기")
+        preview_title = ctk.CTkLabel(left_frame, textvariable=self.preview_title_var,
+                                     font=ctk.CTkFont(size=14, weight="bold"), anchor="w")
+        preview_title.pack(fill="x", padx=10)
+        
+        self.preview_text = ctk.CTkTextbox(left_frame, height=180, font=ctk.CTkFont(size=12),
+                                           wrap="word", state="disabled")
+        self.preview_text.pack(fill="x", padx=10, pady=(0, 10))
+        # 검색어 일치 부분 강조
+        self.preview_text.tag_config("highlight", background="#8a6d00", foreground="white")
         
         # 오른쪽 프레임 (선택된 찬양)
         right_frame = ctk.CTkFrame(content_frame)
@@ -162,6 +232,15 @@ class JSONPraiseGUI:
         self.selected_frame = ctk.CTkScrollableFrame(right_frame, height=300)
         self.selected_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
         
+        # 관련 찬양 (마지막으로 선택한 곡과 가사가 비슷한 곡, 저장할 때 계산한 표에서 바로 찾음)
+        self.related_title_var = tk.StringVar(value="관련 찬양")
+        related_title = ctk.CTkLabel(right_frame, textvariable=self.related_title_var,
+                                     font=ctk.CTkFont(size=14, weight="bold"), anchor="w")
+        related_title.pack(fill="x", padx=10)
+        
+        self.related_frame = ctk.CTkScrollableFrame(right_frame, height=120)
+        self.related_frame.pack(fill="x", padx=10, pady=(0, 10))
+        
         # 선택된 찬양 버튼들
         button_frame = ctk.CTkFrame(right_frame)
         button_frame.pack(fill="x", padx=10, pady=(0, 10))
@@ -203,19 +282,123 @@ class JSONPraiseGUI:
                                          font=ctk.CTkFont(size=14))
         self.progress_label.pack(side="left", padx=(10, 0), pady=10)
     
+    def _bind_results_scroll(self):
+        """검색 결과 스크롤이 끝에 닿으면 다음 페이지 로드"""
+        canvas = getattr(self.results_frame, "_parent_canvas", None)
+        scrollbar = getattr(self.results_frame, "_scrollbar", None)
+        if canvas is None or scrollbar is None:
+            return
+        
+        def on_yscroll(first, last):
+            scrollbar.set(first, last)
+            if float(last) >= 0.98 and self.search_cursor is not None and not self.loading_more:
+                self.loading_more = True
+                self.root.after_idle(self.load_more_results)
+        
+        canvas.configure(yscrollcommand=on_yscroll)
+    
+    def _report_window_time(self):
+        """창 표시까지 걸린 시간 측정 및 예산 확인"""
+        elapsed = time.perf_counter() - _STARTUP_T0
+        if elapsed > STARTUP_WINDOW_BUDGET:
+            logger.warning("창 표시 %.2f초 (예산 %.1f초 초과)", elapsed, STARTUP_WINDOW_BUDGET)
+        else:
+            logger.info("창 표시 %.2f초 (예산 %.1f초)", elapsed, STARTUP_WINDOW_BUDGET)
+    
+    def create_generator(self):
+        """PPT 생성기 생성 (python-pptx는 이 시점에 처음 import)"""
+        from json_ppt_generator_fixed import JSONPPTGeneratorFixed as JSONPPTGenerator
+        return JSONPPTGenerator(
+            json_file=self.json_path,
+            template_file=self.template_path,
+            indexer=self.indexer
+        )
+    
+    def set_loading_state(self, loading):
+        """로딩 중에는 인덱싱/생성 버튼 비활성화
+        
+        검색창은 그대로 두어 로딩 중에도 입력할 수 있게 하고, 입력한 검색어는
+        로드가 끝나면 바로 검색한다 (perform_search는 로드 전에는 아무것도 하지 않음).
+        """
+        state = "disabled" if loading else "normal"
+        self.index_button.configure(state=state)
+        self.setlist_button.configure(state=state)
+        self.add_file_button.configure(state=state)
+        self.ppt_button.configure(state=state)
+    
     def load_data(self):
-        """데이터 로드"""
-        try:
-            if self.indexer.load_from_json():
-                self.generator = JSONPPTGenerator(
-                    json_file=self.json_path,
-                    template_file=self.template_path
-                )
-                self.progress_var.set(f"로드됨: {len(self.indexer.praise_data)}개 찬양")
-            else:
-                self.progress_var.set("JSON 파일이 없습니다. 인덱싱을 실행하세요.")
-        except Exception as e:
-            messagebox.showerror("오류", f"데이터 로드 실패: {e}")
+        """데이터 로드 (인덱스와 템플릿을 백그라운드에서 로드)"""
+        self.data_ready = False
+        self.set_loading_state(True)
+        self.progress_var.set("로딩 중...")
+        
+        def load_thread():
+            loaded = False
+            error = None
+            try:
+                loaded = self.indexer.load_from_json()
+                if loaded:
+                    # 옮겨졌거나 예전 형식인 파일 경로를 찬양 폴더 한 번 훑기로 정리
+                    from integrity import relink_files
+                    relink_files(self.indexer)
+                    # 자동완성 인덱스도 미리 만들어 첫 입력부터 바로 제안
+                    self.indexer.get_typeahead()
+                    self.generator = self.create_generator()
+            except Exception as e:
+                error = e
+            self.root.after(0, lambda: self._on_data_loaded(loaded, error))
+        
+        threading.Thread(target=load_thread, daemon=True).start()
+    
+    def _on_data_loaded(self, loaded, error):
+        """백그라운드 로드 완료 처리 (Tk 스레드)"""
+        elapsed = time.perf_counter() - _STARTUP_T0
+        self.data_ready = True
+        self.set_loading_state(False)
+        
+        if error is not None:
+            self.progress_var.set("데이터 로드 실패")
+            messagebox.showerror("오류", f"데이터 로드 실패: {error}")
+            return
+        
+        if loaded:
+            self.progress_var.set(f"로드됨: {len(self.indexer.praise_data)}개 찬양 ({elapsed:.1f}초)")
+            self.start_folder_watcher()
+        else:
+            self.progress_var.set("JSON 파일이 없습니다. 인덱싱을 실행하세요.")
+        
+        if elapsed > STARTUP_READY_BUDGET:
+            logger.warning("데이터 로드 완료 %.2f초 (예산 %.1f초 초과)", elapsed, STARTUP_READY_BUDGET)
+        else:
+            logger.info("데이터 로드 완료 %.2f초 (예산 %.1f초)", elapsed, STARTUP_READY_BUDGET)
+        
+        # 로딩 중 입력된 검색어가 있으면 바로 검색
+        if self.search_var.get().strip():
+            self.perform_search()
+    
+    def start_folder_watcher(self):
+        """찬양 폴더에 넣거나 고친 파일을 인덱싱 버튼 없이 반영"""
+        if self.folder_watcher is None:
+            from folder_watcher import FolderWatcher
+
+            self.folder_watcher = FolderWatcher(
+                self.indexer,
+                on_change=lambda result: self.root.after(0, lambda: self._on_folder_changed(result)),
+            )
+        self.folder_watcher.start()
+    
+    def _on_folder_changed(self, result):
+        """폴더 변경 반영 완료 처리 (Tk 스레드)"""
+        summary = (f"폴더 변경 반영: 추가 {len(result['added'])}개, 변경 {len(result['changed'])}개, "
+                   f"삭제 {len(result['removed'])}개")
+        if result["failed"]:
+            # 실패 이유는 첫 파일만 표시 (나머지는 로그)
+            name, reason = result["failed"][0]
+            summary += f", 실패 {len(result['failed'])}개 ({name}: {reason})"
+        self.progress_var.set(f"{summary} (전체 {len(self.indexer.praise_data)}개 찬양)")
+        # 현재 검색어로 결과만 갱신 (선택 목록은 건드리지 않음)
+        if self.search_var.get().strip():
+            self.perform_search()
     
     def reindex_data(self):
         """데이터 재인덱싱"""
@@ -224,13 +407,13 @@ class JSONPraiseGUI:
                 self.progress_var.set("인덱싱 중...")
                 self.root.update()
                 
-                success = self.indexer.index_praise_files()
+                # 곡마다 바로 기록하는 스트리밍 인덱싱 (중단되면 다음에 이어서 진행)
+                # 끝날 때 새 스냅샷으로 바뀌므로 그동안 검색은 이전 인덱스로 계속 가능
+                success = self.indexer.index_praise_files_jsonl()
                 
                 if success:
-                    self.generator = JSONPPTGenerator(
-                        json_file=self.json_path,
-                        template_file=self.template_path
-                    )
+                    self.generator = self.create_generator()
+                    self.root.after(0, self.refresh_selected)
                     self.progress_var.set(f"인덱싱 완료: {len(self.indexer.praise_data)}개 찬양")
                     messagebox.showinfo("완료", "인덱싱이 완료되었습니다.")
                 else:
@@ -242,11 +425,30 @@ class JSONPraiseGUI:
         
         threading.Thread(target=index_thread, daemon=True).start()
     
+    def refresh_selected(self):
+        """다시 인덱싱한 뒤 선택 목록을 새 인덱스의 찬양으로 교체 (없어진 곡은 뺌, Tk 스레드)"""
+        refreshed = []
+        for praise in self.selected_praises:
+            current = self.indexer.find_selected(praise)
+            if current is not None:
+                refreshed.append(current)
+        if len(refreshed) != len(self.selected_praises):
+            self.selected_indices = set()
+        self.selected_praises = refreshed
+        self.update_selected_display()
+        if self.search_var.get().strip():
+            self.perform_search()
+    
     def on_search_change(self, event):
         """검색어 변경 시"""
+        if event.keysym in ("Return", "Down", "Up", "Escape"):
+            return
         if self.search_timer:
             self.root.after_cancel(self.search_timer)
         
+        # 자동완성은 정렬 배열 조회라 디바운싱 없이 바로 갱신
+        self.update_suggestions()
+        
         # 디바운싱 시간을 100ms로 단축 (매우 빠른 반응성)
         self.search_timer = self.root.after(100, self.perform_search)
     
@@ -255,13 +457,71 @@ class JSONPraiseGUI:
         if self.search_timer:
             self.root.after_cancel(self.search_timer)
         
+        self.hide_suggestions()
+        self.perform_search()
+    
+    def update_suggestions(self):
+        """검색어로 시작하는 제목을 검색창 아래에 표시 (초성 입력 지원)"""
+        query = self.search_var.get().strip()
+        if not self.data_ready or not query:
+            self.hide_suggestions()
+            return
+        
+        self.suggestions = self.indexer.suggest_titles(query, SUGGESTION_LIMIT)
+        if not self.suggestions:
+            self.hide_suggestions()
+            return
+        
+        self.suggest_listbox.delete(0, "end")
+        for _, title in self.suggestions:
+            self.suggest_listbox.insert("end", title)
+        self.suggest_listbox.configure(height=len(self.suggestions))
+        self.suggest_listbox.place(in_=self.search_entry, x=0, rely=1.0, relwidth=1.0)
+        self.suggest_listbox.lift()
+    
+    def hide_suggestions(self, focus_entry=False):
+        """자동완성 목록 숨기기"""
+        self.suggestions = []
+        self.suggest_listbox.place_forget()
+        if focus_entry:
+            self.search_entry.focus_set()
+    
+    def focus_suggestions(self, event):
+        """아래 화살표로 자동완성 목록 선택 시작"""
+        if not self.suggestions:
+            return
+        self.suggest_listbox.focus_set()
+        self.suggest_listbox.selection_clear(0, "end")
+        self.suggest_listbox.selection_set(0)
+        self.suggest_listbox.activate(0)
+        return "break"
+    
+    def apply_suggestion(self, event):
+        """선택한 자동완성 제목으로 검색"""
+        selection = self.suggest_listbox.curselection()
+        if not selection or selection[0] >= len(self.suggestions):
+            return
+        _, title = self.suggestions[selection[0]]
+        self.search_var.set(title)
+        self.hide_suggestions(focus_entry=True)
+        self.search_entry.icursor("end")
+        if self.search_timer:
+            self.root.after_cancel(self.search_timer)
+            self.search_timer = None
         self.perform_search()
     
     def perform_search(self):
         """검색 수행"""
+        # 인덱스 로드 전에는 검색하지 않음 (로드 완료 시 자동 검색)
+        if not self.data_ready:
+            return
+        
         query = self.search_var.get().strip()
         search_type = self.search_type_var.get()
         
+        self.search_cursor = None
+        self.search_query = None
+        
         if not query:
             self.search_results = []
             self.update_results_display()
@@ -278,17 +538,67 @@ class JSONPraiseGUI:
             type_map = {"제목": "title", "가사": "lyrics", "전체": "both"}
             search_type = type_map.get(search_type, "both")
             
-            # 검색 결과 제한 (성능 개선)
-            self.search_results = self.indexer.search_praises(query, search_type)[:30]  # 최대 30개로 제한
+            # 첫 페이지만 계산하고 나머지는 스크롤 시 이어서 로드
+            collapse = self.collapse_var.get()
+            self.search_query = (query, search_type, collapse)
+            self.search_results, self.search_cursor = self.indexer.search_page(
+                query, search_type, page_size=RESULTS_PAGE_SIZE, collapse=collapse
+            )
             self.update_results_display()
         except Exception as e:
             messagebox.showerror("오류", f"검색 실패: {e}")
     
+    def load_more_results(self):
+        """다음 검색 결과 페이지를 이어서 표시"""
+        try:
+            if self.search_cursor is None or self.search_query is None:
+                return
+            
+            query, search_type, collapse = self.search_query
+            try:
+                page, self.search_cursor = self.indexer.search_page(
+                    query, search_type, cursor=self.search_cursor, page_size=RESULTS_PAGE_SIZE, collapse=collapse
+                )
+            except StaleCursorError:
+                # 첫 페이지 이후 인덱스가 바뀜 (인덱싱/폴더 변경 반영) → 바뀐 순위로 처음부터 다시 표시
+                self.perform_search()
+                return
+            
+            start = len(self.search_results)
+            self.search_results.extend(page)
+            self._clear_load_more_button()
+            for i, praise in enumerate(page, start):
+                self.create_result_item(praise, i)
+            self._show_load_more_button()
+        except Exception as e:
+            messagebox.showerror("오류", f"검색 실패: {e}")
+        finally:
+            self.loading_more = False
+    
+    def _show_load_more_button(self):
+        """다음 페이지가 있으면 결과 맨 아래에 '더 보기' 버튼 표시"""
+        if self.search_cursor is None:
+            return
+        self.load_more_button = ctk.CTkButton(self.results_frame, text="더 보기",
+                                              command=self.load_more_results,
+                                              height=28, font=ctk.CTkFont(size=12))
+        self.load_more_button.pack(fill="x", padx=3, pady=(3, 8))
+    
+    def _clear_load_more_button(self):
+        """'더 보기' 버튼 제거"""
+        if self.load_more_button is not None:
+            try:
+                self.load_more_button.destroy()
+            except Exception:
+                pass
+            self.load_more_button = None
+    
     def update_results_display(self):
         """검색 결과 표시 업데이트"""
         # 기존 위젯 제거
         for widget in self.results_frame.winfo_children():
             widget.destroy()
+        self.load_more_button = None
         
         if not self.search_results:
             no_results_label = ctk.CTkLabel(self.results_frame, text="검색 결과가 없습니다.", 
@@ -299,6 +609,7 @@ class JSONPraiseGUI:
         # 새 결과 추가
         for i, praise in enumerate(self.search_results):
             self.create_result_item(praise, i)
+        self._show_load_more_button()
     
     def create_result_item(self, praise, index):
         """검색 결과 아이템 생성"""
@@ -313,11 +624,21 @@ class JSONPraiseGUI:
         title_label.pack(fill="x", padx=10, pady=(8, 3))
         
         # 슬라이드 수
-        slides_count = len(praise.get('slides_text', []))
+        slides_count = praise.get('slide_count', len(praise.get('slides_text', [])))
         slides_label = ctk.CTkLabel(item_frame, text=f"슬라이드: {slides_count}개", 
                                   font=ctk.CTkFont(size=12), text_color="gray")
         slides_label.pack(anchor="w", padx=10, pady=(0, 3))
         
+        # 가사에서 검색어가 나온 슬라이드 (인덱스의 줄 경계로 계산)
+        matching_slides = self.get_matching_slides(praise)
+        if matching_slides:
+            numbers = ", ".join(str(i + 1) for i in matching_slides[:5])
+            if len(matching_slides) > 5:
+                numbers += " ..."
+            match_label = ctk.CTkLabel(item_frame, text=f"일치 슬라이드: {numbers}",
+                                       font=ctk.CTkFont(size=12), text_color="orange")
+            match_label.pack(anchor="w", padx=10, pady=(0, 3))
+        
         # 가사 미리보기
         lyrics_preview = self.get_lyrics_preview(praise)
         if lyrics_preview:
@@ -330,9 +651,82 @@ class JSONPraiseGUI:
         select_button = ctk.CTkButton(item_frame, text="선택", command=lambda: self.add_to_selected(praise),
                                     width=60, height=25, font=ctk.CTkFont(size=12))
         select_button.pack(anchor="e", padx=10, pady=(0, 8))
+        
+        # 마우스를 올리거나 클릭하면 가사 미리보기
+        for widget in [item_frame] + list(item_frame.winfo_children()):
+            widget.bind("<Enter>", lambda e: self.schedule_preview(praise), add="+")
+            widget.bind("<ButtonPress-1>", lambda e: self.show_preview(praise), add="+")
+    
+    def schedule_preview(self, praise):
+        """마우스 이동 중 불필요한 로드를 막기 위해 미리보기를 잠시 지연"""
+        if self.preview_timer:
+            self.root.after_cancel(self.preview_timer)
+        self.preview_timer = self.root.after(80, lambda: self.show_preview(praise))
+    
+    def get_matching_slides(self, praise):
+        """현재 가사 검색어가 나온 슬라이드 순서 목록 (제목 검색이면 빈 목록)"""
+        if not self.search_query or self.search_query[1] == "title":
+            return []
+        try:
+            return self.indexer.get_matching_slides(praise, self.search_query[0])
+        except Exception:
+            return []
+    
+    def show_preview(self, praise):
+        """가사 미리보기 패널에 찬양의 모든 슬라이드 표시 (상세는 필요할 때 로드)
+        
+        가사 검색 중이면 일치 부분을 강조하고 첫 일치 슬라이드로 스크롤한다.
+        """
+        self.preview_timer = None
+        preview_key = (praise['id'], self.search_query)
+        if self.preview_key == preview_key:
+            return
+        self.preview_key = preview_key
+        
+        hits = []
+        if self.search_query and self.search_query[1] != "title":
+            try:
+                hits = self.indexer.find_hits(praise, self.search_query[0])
+            except Exception:
+                hits = []
+        
+        slides_text = self.indexer.get_praise_detail(praise['id']) or []
+        lines = []
+        # (슬라이드 순서, 줄 순서) → (미리보기 텍스트의 행 번호, 줄 원문)
+        line_rows = {}
+        for slide_index, slide in enumerate(slides_text):
+            lines.append(f"[슬라이드 {slide.get('slide_number', '?')}]")
+            for line_index, line in enumerate(slide_lines(slide)):
+                lines.append(line)
+                line_rows[(slide_index, line_index)] = (len(lines), line)
+            lines.append("")
+        
+        self.preview_title_var.set(f"가사 미리보기 - {praise['title']} ({len(slides_text)}개 슬라이드)")
+        self.preview_text.configure(state="normal")
+        self.preview_text.delete("1.0", "end")
+        self.preview_text.insert("1.0", "\n".join(lines).rstrip() or "가사 정보가 없습니다.")
+        
+        first_hit = None
+        for hit in hits:
+            row_line = line_rows.get((hit['slide_index'], hit['line_index']))
+            if row_line is None:
+                continue
+            row, line = row_line
+            start, end = text_span(line, hit['start'], hit['end'])
+            self.preview_text.tag_add("highlight", f"{row}.{start}", f"{row}.{end}")
+            if first_hit is None:
+                first_hit = (row, hit['line_index'])
+        if first_hit is not None:
+            # 첫 일치 슬라이드의 머리글과 일치 줄이 보이도록 스크롤
+            row, line_index = first_hit
+            self.preview_text.see(f"{max(row - line_index - 1, 1)}.0")
+            self.preview_text.see(f"{row}.0")
+        self.preview_text.configure(state="disabled")
     
     def get_lyrics_preview(self, praise):
         """가사 미리보기 생성"""
+        if praise.get('preview') is not None:
+            return praise['preview']
         try:
             slides_text = praise.get('slides_text', [])
             if slides_text and len(slides_text) > 0:
@@ -350,6 +744,8 @@ class JSONPraiseGUI:
     
     def add_to_selected(self, praise):
         """선택된 찬양에 추가"""
+        self.show_related(praise)
+        
         # 중복 확인
         for selected in self.selected_praises:
             if selected['id'] == praise['id']:
@@ -358,6 +754,40 @@ class JSONPraiseGUI:
         self.selected_praises.append(praise)
         self.update_selected_display()
     
+    def show_related(self, praise):
+        """선택한 찬양과 가사가 비슷한 찬양 표시 (유사도 계산 없이 이웃 표에서 찾기만 함)"""
+        for widget in self.related_frame.winfo_children():
+            widget.destroy()
+        self.related_title_var.set(f"관련 찬양 - {praise['title']}")
+        
+        related = self.indexer.related_songs(praise['id'], RELATED_LIMIT)
+        if not related:
+            # 저장 직후에는 관련 찬양 표를 백그라운드에서 계산 중일 수 있음
+            building = not self.indexer.wait_related(0)
+            no_related_label = ctk.CTkLabel(self.related_frame,
+                                            text="관련 찬양을 계산하는 중입니다." if building else "관련 찬양이 없습니다.",
+                                            font=ctk.CTkFont(size=12))
+            no_related_label.pack(pady=5)
+            return
+        
+        for related_praise, score in related:
+            item_frame = ctk.CTkFrame(self.related_frame)
+            item_frame.pack(fill="x", padx=3, pady=2)
+            
+            # 추가하면 그 곡의 관련 찬양으로 이어서 표시
+            add_button = ctk.CTkButton(item_frame, text="추가", width=44, height=22, font=ctk.CTkFont(size=12),
+                                       command=lambda p=related_praise: self.add_to_selected(p))
+            add_button.pack(side="right", padx=5, pady=2)
+            
+            title_label = ctk.CTkLabel(item_frame, text=f"{related_praise['title']} (유사도 {score:.2f})",
+                                       font=ctk.CTkFont(size=12), anchor="w")
+            title_label.pack(side="left", fill="x", expand=True, padx=(8, 0))
+            
+            # 마우스를 올리거나 클릭하면 가사 미리보기
+            for widget in (item_frame, title_label):
+                widget.bind("<Enter>", lambda e, p=related_praise: self.schedule_preview(p), add="+")
+                widget.bind("<ButtonPress-1>", lambda e, p=related_praise: self.show_preview(p), add="+")
+    
     def update_selected_display(self):
         """선택된 찬양 표시 업데이트"""
         # 기존 위젯 제거
@@ -525,7 +955,7 @@ class JSONPraiseGUI:
             self.drop_indicator.place(x=10, y=drop_y - scroll_y, relwidth=0.95)
             
         except Exception as e:
-            print(f"[DEBUG] 드롭 표시선 업데이트 실패: {e}")
+            logger.debug("드롭 표시선 업데이트 실패: %s", e)
     
     def _clear_drop_indicator(self):
         """드롭 위치 표시선 제거"""
@@ -632,6 +1062,76 @@ class JSONPraiseGUI:
         self.select_all_button.configure(text="전체 선택")
         self.update_selected_display()
     
+    def open_setlist_dialog(self):
+        """콘티 붙여넣기 창 (줄마다 제목 또는 가사 일부)"""
+        dialog = ctk.CTkToplevel(self.root)
+        dialog.title("콘티 붙여넣기")
+        dialog.geometry("640x560")
+        dialog.transient(self.root)
+        
+        ctk.CTkLabel(dialog, text="콘티를 붙여넣으세요 (한 줄에 한 곡, 번호/키 표시는 자동 제거)",
+                     font=ctk.CTkFont(size=13)).pack(anchor="w", padx=10, pady=(10, 5))
+        input_text = ctk.CTkTextbox(dialog, height=150, font=ctk.CTkFont(size=13))
+        input_text.pack(fill="x", padx=10)
+        try:
+            input_text.insert("1.0", self.root.clipboard_get())
+        except tk.TclError:
+            pass
+        
+        results_frame = ctk.CTkScrollableFrame(dialog, height=250)
+        # 줄마다 (찾은 결과, 선택 메뉴 변수, 메뉴 값 → 찬양 ID)
+        rows = []
+        
+        def resolve():
+            for widget in results_frame.winfo_children():
+                widget.destroy()
+            rows.clear()
+            try:
+                resolved = self.indexer.resolve_setlist(input_text.get("1.0", "end"))
+            except Exception as e:
+                messagebox.showerror("오류", f"콘티 찾기 실패: {e}", parent=dialog)
+                return
+            
+            for n, result in enumerate(resolved, 1):
+                row = ctk.CTkFrame(results_frame)
+                row.pack(fill="x", padx=3, pady=2)
+                color = None if result['resolved'] else "orange"
+                note = "" if result['resolved'] else "  (확인 필요)"
+                ctk.CTkLabel(row, text=f"{n}. {result['query']}{note}", anchor="w", width=220,
+                             font=ctk.CTkFont(size=12), text_color=color).pack(side="left", padx=5)
+                
+                choices = {f"{title} ({score:.0f}점, ID {praise_id})": praise_id
+                           for praise_id, title, score in result['matches']}
+                values = list(choices) + ["(건너뛰기)"]
+                var = tk.StringVar(value=values[0])
+                ctk.CTkOptionMenu(row, variable=var, values=values, width=300,
+                                  font=ctk.CTkFont(size=12)).pack(side="right", padx=5, pady=3)
+                rows.append((var, choices))
+        
+        def add_all():
+            added = 0
+            for var, choices in rows:
+                praise_id = choices.get(var.get())
+                if praise_id is None:
+                    continue
+                praise = self.indexer.find_praise(praise_id)
+                if praise is not None and all(p['id'] != praise_id for p in self.selected_praises):
+                    self.selected_praises.append(praise)
+                    added += 1
+            self.update_selected_display()
+            self.progress_var.set(f"콘티에서 {added}곡 추가됨")
+            dialog.destroy()
+        
+        button_row = ctk.CTkFrame(dialog)
+        button_row.pack(fill="x", padx=10, pady=5)
+        ctk.CTkButton(button_row, text="찾기", command=resolve, width=80).pack(side="left", padx=5, pady=5)
+        ctk.CTkButton(button_row, text="선택 목록에 추가", command=add_all, width=120,
+                      fg_color="green", hover_color="darkgreen").pack(side="right", padx=5, pady=5)
+        results_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        
+        if input_text.get("1.0", "end").strip():
+            resolve()
+    
     def generate_ppt(self):
         """PPT 생성"""
         if not self.selected_praises:
@@ -697,46 +1197,21 @@ class JSONPraiseGUI:
             if not result:
                 return
             
-            # 파일 경로 확인 (여러 경로 시도)
-            file_path_str = praise['file_path']
-            print(f"[DEBUG] 원본 경로: {file_path_str}")
-            
-            # 경로 수정
-            if file_path_str.startswith("praise_indexer\\"):
-                file_path_str = file_path_str.replace("praise_indexer\\", "")
-            elif file_path_str.startswith("praise_indexer/"):
-                file_path_str = file_path_str.replace("praise_indexer/", "")
-            
-            print(f"[DEBUG] 수정된 경로: {file_path_str}")
-            
-            # 여러 경로 시도
-            possible_paths = [
-                Path(file_path_str),  # 상대 경로
-                Path.cwd() / file_path_str,  # 현재 디렉토리 기준
-                Path("praise_indexer") / file_path_str,  # praise_indexer 디렉토리 기준
-            ]
-            
-            file_path = None
-            for path in possible_paths:
-                print(f"[DEBUG] 시도 중: {path}")
-                if path.exists():
-                    file_path = path
-                    print(f"[DEBUG] 파일 발견: {path}")
-                    break
+            # 파일 경로 (시작할 때 경로를 정리하므로 찬양 폴더 기준으로 한 번만 확인)
+            file_path = self.indexer.resolve_file_path(praise)
+            logger.debug("삭제할 파일: %s", file_path)
             
-            if not file_path:
+            if not file_path.exists():
                 # 파일이 존재하지 않는 경우, JSON에서만 제거
                 messagebox.showwarning("경고", 
                                      f"실제 파일이 존재하지 않습니다.\n"
-                                     f"시도한 경로들:\n" + 
-                                     "\n".join([str(p) for p in possible_paths]) +
-                                     f"\n\nJSON에서만 데이터를 제거합니다.")
+                                     f"경로: {file_path}\n\n"
+                                     f"JSON에서만 데이터를 제거합니다.")
                 
-                # JSON에서 해당 항목 제거
-                self.indexer.remove_praise_by_id(praise['id'])
-                
-                # JSON 파일 저장
-                self.indexer.save_to_json()
+                # JSON에서 해당 항목 제거 후 저장
+                with self.indexer.batch():
+                    self.indexer.remove_praise_by_id(praise['id'])
+                    self.indexer.save_to_json()
                 
                 # UI에서 해당 항목만 제거 (선택 목록과 검색 결과 유지)
                 try:
@@ -762,14 +1237,14 @@ class JSONPraiseGUI:
             for attempt in range(max_retries):
                 try:
                     file_path.unlink()
-                    print(f"[OK] 파일 삭제됨: {file_path}")
+                    logger.info("파일 삭제됨: %s", file_path)
                     break
                 except PermissionError as e:
                     if attempt < max_retries - 1:
-                        print(f"[WARNING] 파일 삭제 실패 (시도 {attempt + 1}/{max_retries}): {e}")
+                        logger.warning("파일 삭제 실패 (시도 %s/%s): %s", attempt + 1, max_retries, e)
                         time.sleep(1)  # 1초 대기 후 재시도
                     else:
-                        print(f"[ERROR] 파일 삭제 최종 실패: {file_path}")
+                        logger.error("파일 삭제 최종 실패: %s", file_path)
                         messagebox.showwarning("경고", 
                                              f"파일을 삭제할 수 없습니다:\n{file_path}\n\n"
                                              f"파일이 다른 프로그램에서 사용 중일 수 있습니다.\n"
@@ -777,15 +1252,14 @@ class JSONPraiseGUI:
                         # JSON에서만 제거하고 계속 진행
                         break
                 except Exception as e:
-                    print(f"[ERROR] 파일 삭제 실패: {e}")
+                    logger.error("파일 삭제 실패: %s", e)
                     messagebox.showwarning("경고", f"파일 삭제 실패: {e}\nJSON에서만 데이터를 제거합니다.")
                     break
             
-            # JSON에서 해당 항목 제거
-            self.indexer.remove_praise_by_id(praise['id'])
-            
-            # JSON 파일 저장
-            self.indexer.save_to_json()
+            # JSON에서 해당 항목 제거 후 저장
+            with self.indexer.batch():
+                self.indexer.remove_praise_by_id(praise['id'])
+                self.indexer.save_to_json()
             
             # UI에서 해당 항목만 제거 (선택 목록과 검색 결과 유지)
             try:
@@ -805,17 +1279,15 @@ class JSONPraiseGUI:
             
         except Exception as e:
             messagebox.showerror("오류", f"파일 삭제 실패: {e}")
-            print(f"[ERROR] 파일 삭제 실패: {e}")
+            logger.error("파일 삭제 실패: %s", e)
     
     def add_pptx_file(self):
-        """새 PPTX 파일 추가 (복사 없이 직접 인덱싱)"""
+        """새 PPTX 파일 추가 (복사 없이 직접 인덱싱, 백그라운드 병렬 처리)
+        
+        추출은 작업 스레드에서 병렬로 진행하고 저장은 한 번만 한다.
+        현재 검색어/검색 결과/선택 목록은 그대로 유지된다.
+        """
         try:
-            # 현재 UI 상태 백업 (선택 목록 + 검색 상태)
-            backup_selected = list(self.selected_praises)
-            backup_indices = set(self.selected_indices)
-            backup_query = self.search_var.get()
-            backup_search_type = self.search_type_var.get()
-
             # 파일 선택 대화상자
             file_paths = filedialog.askopenfilenames(
                 title="추가할 PPTX 파일 선택",
@@ -825,45 +1297,65 @@ class JSONPraiseGUI:
             if not file_paths:
                 return
             
-            self.progress_var.set("새 파일 인덱싱 중...")
-            self.root.update()
-
-            added_count = 0
-            for file_path in file_paths:
-                ok = self.indexer.add_single_file(file_path)
-                if ok:
-                    added_count += 1
-            
-            # JSON 파일 저장
-            self.indexer.save_to_json()
-            
-            # 인덱서 최신 데이터 반영 (필요 시)
-            self.indexer.load_from_json()
+            self.add_file_button.configure(state="disabled")
+            self.progress_var.set(f"새 파일 인덱싱 중... (0/{len(file_paths)})")
+            counts = {"ok": 0, "fail": 0}
             
-            # 검색 상태 복원 및 재검색 (결과 유지)
-            try:
-                if backup_query:
-                    self.search_var.set(backup_query)
-                    self.search_type_var.set(backup_search_type)
-                    self.perform_search()
-                else:
-                    # 검색어가 없던 경우에도 결과 영역 유지
-                    self.update_results_display()
-            except Exception:
-                self.update_results_display()
+            def on_progress(done, total, file_path, ok, message):
+                # 작업 스레드에서 호출됨 → Tk 스레드로 전달
+                def update():
+                    counts["ok" if ok else "fail"] += 1
+                    mark = "OK" if ok else "실패"
+                    self.progress_var.set(
+                        f"새 파일 인덱싱 중... ({done}/{total}) "
+                        f"[{mark}] {Path(file_path).name} - 성공 {counts['ok']}, 실패 {counts['fail']}"
+                    )
+                self.root.after(0, update)
             
-            # 선택 목록 복원
-            self.selected_praises = backup_selected
-            self.selected_indices = backup_indices
-            self.update_selected_display()
+            def add_thread():
+                try:
+                    # 추출은 잠금 밖에서 하고, 모든 추출이 끝난 뒤 추가와 저장을 스냅샷 하나로 게시
+                    # (그동안 삭제 같은 다른 변경도 기다리지 않음)
+                    results = self.indexer.add_files(file_paths, progress_callback=on_progress, save=True)
+                    self.root.after(0, lambda: self._on_files_added(results))
+                except Exception as e:
+                    self.root.after(0, lambda: self._on_files_added(None, e))
             
-            self.progress_var.set("파일 추가 완료")
-            messagebox.showinfo("완료", f"{added_count}개 파일이 추가되었습니다.")
+            threading.Thread(target=add_thread, daemon=True).start()
             
         except Exception as e:
+            self.add_file_button.configure(state="normal")
             self.progress_var.set("파일 추가 실패")
             messagebox.showerror("오류", f"파일 추가 실패: {e}")
-            print(f"[ERROR] 파일 추가 실패: {e}")
+            logger.error("파일 추가 실패: %s", e)
+    
+    def _on_files_added(self, results, error=None):
+        """파일 추가 작업 완료 처리 (Tk 스레드)"""
+        self.add_file_button.configure(state="normal")
+        
+        if error is not None:
+            self.progress_var.set("파일 추가 실패")
+            messagebox.showerror("오류", f"파일 추가 실패: {error}")
+            logger.error("파일 추가 실패: %s", error)
+            return
+        
+        # 현재 검색어로 결과만 갱신 (선택 목록은 건드리지 않음)
+        if self.search_var.get().strip():
+            self.perform_search()
+        
+        added = [r for r in results if r[1]]
+        failed = [r for r in results if not r[1]]
+        self.progress_var.set(f"파일 추가 완료: 성공 {len(added)}개, 실패 {len(failed)}개")
+        
+        message = f"{len(added)}개 파일이 추가되었습니다."
+        if failed:
+            failed_lines = "\n".join(f"- {Path(path).name}: {reason}" for path, _, reason in failed[:10])
+            if len(failed) > 10:
+                failed_lines += f"\n... 외 {len(failed) - 10}개"
+            message += f"\n\n실패 {len(failed)}개:\n{failed_lines}"
+            messagebox.showwarning("완료", message)
+        else:
+            messagebox.showinfo("완료", message)
     
     def refresh_data(self):
         """데이터 새로고침"""
@@ -879,10 +1371,10 @@ class JSONPraiseGUI:
             self.selected_praises = []
             self.update_selected_display()
             
-            print("[OK] 데이터 새로고침 완료")
+            logger.info("데이터 새로고침 완료")
             
         except Exception as e:
-            print(f"[ERROR] 데이터 새로고침 실패: {e}")
+            logger.error("데이터 새로고침 실패: %s", e)
     
     def run(self):
         """GUI 실행"""
@@ -890,6 +1382,8 @@ class JSONPraiseGUI:
 
 def main():
     """메인 함수"""
+    # PRAISE_LOG_LEVEL / PRAISE_TRACE 환경 변수로 로그/추적 켜기 (기본: 꺼짐)
+    configure_from_env()
     app = JSONPraiseGUI()
     app.run()
 
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+헤더/상세 세그먼트로 분리된 찬양 인덱스 저장소
+
+- 헤더 세그먼트 (praise_index.header.json): 검색에 필요한 작은 정보만 담아 시작 시 전부 로드
+  (id, 제목, 파일 정보, 정규화된 검색 키, 미리보기, 슬라이드 수, 상세 위치,
+  두벌식 키 입력 형태, 검색 위치를 슬라이드/줄로 바꾸는 줄 경계 배열, 가사 MinHash 서명,
+  증분 인덱싱에서 바뀐 파일을 찾는 원본 파일의 수정 시각(mtime_ns)/크기)
+- 상세 세그먼트 (praise_index.detail.jsonl): 찬양별 슬라이드 텍스트를 한 줄씩 기록
+  헤더의 detail_offset/detail_length(바이트)로 필요한 찬양만 바로 읽음
+"""
+
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+from keystroke import to_qwerty
+from near_duplicates import minhash_signature
+from search_hits import line_offsets
+
+# 헤더 세그먼트 형식 버전 (필드를 바꿀 때마다 올림, 예전 버전은 로드할 때 세그먼트를 다시 써서 변환)
+# 1: 기본 필드 / 2: line_ends, slide_ends / 3: title_qwerty, lyrics_qwerty / 4: minhash
+# 5: mtime_ns, size (예전 헤더에서 변환한 곡은 None이므로 다음 증분 인덱싱 때 다시 추출)
+HEADER_VERSION = 5
+# 헤더 파일 맨 앞의 버전 표시 (write가 항상 이 형식으로 시작)
+_VERSION_PREFIX = re.compile(rb'\{"version": (\d+)')
+
+# 윈도우에서 다른 스레드가 잠깐 열어 둔 파일을 교체할 때 재시도 횟수/간격 (초)
+REPLACE_RETRIES = 5
+REPLACE_RETRY_DELAY = 0.05
+
+# 헤더에 남기는 필드 (나머지 가사/슬라이드 텍스트는 상세 세그먼트로)
+HEADER_FIELDS = (
+    "id", "filename", "title", "file_path",
+    "title_normalized", "lyrics_normalized",
+    "title_qwerty", "lyrics_qwerty",
+    "preview", "slide_count", "mtime_ns", "size",
+)
+
+
+def make_preview(slides_text, max_length=100):
+    """첫 슬라이드의 첫 두 줄로 가사 미리보기 생성"""
+    if not slides_text:
+        return ""
+    lines = slides_text[0].get('text_lines') or []
+    if not lines:
+        return ""
+    preview = lines[0]
+    if len(lines) > 1 and lines[1]:
+        preview += f" ... {lines[1]}"
+    return preview[:max_length] + "..." if len(preview) > max_length else preview
+
+
+class SplitIndexStore:
+    """헤더/상세 세그먼트 인덱스 파일 입출력"""
+
+    def __init__(self, output_json):
+        self.json_path = Path(output_json)
+        self.header_path = self.json_path.with_suffix(".header.json")
+        self.detail_path = self.json_path.with_suffix(".detail.jsonl")
+
+    def exists(self):
+        """헤더/상세 세그먼트가 모두 있는지 확인"""
+        return self.header_path.exists() and self.detail_path.exists()
+
+    def is_fresh(self):
+        """세그먼트가 (있다면) 기존 전체 JSON보다 최신인지 확인"""
+        if not self.exists():
+            return False
+        if not self.json_path.exists():
+            return True
+        return self.header_path.stat().st_mtime >= self.json_path.stat().st_mtime
+
+    def read_version(self):
+        """헤더 세그먼트의 형식 버전 (파일 앞부분만 읽음, 알 수 없으면 None)"""
+        with open(self.header_path, 'rb') as f:
+            match = _VERSION_PREFIX.match(f.read(32))
+        return int(match.group(1)) if match else None
+
+    def read_header(self):
+        """헤더 세그먼트 전체 로드 (형식 버전, 헤더 목록)
+
+        예전 버전 헤더도 읽으며 (없는 필드는 None), 이 프로그램보다 새 버전이면 ValueError.
+        """
+        with open(self.header_path, 'r', encoding='utf-8') as f:
+            header = json.load(f)
+        version = header.get("version")
+        if not isinstance(version, int) or not 1 <= version <= HEADER_VERSION:
+            raise ValueError(f"지원하지 않는 헤더 버전: {version}")
+        return version, header["songs"]
+
+    def open_detail(self):
+        """여러 곡을 연속으로 읽을 때 재사용할 상세 세그먼트 파일 열기"""
+        return open(self.detail_path, 'rb')
+
+    def read_detail(self, praise_id, offset, length, f=None):
+        """상세 세그먼트에서 찬양 하나의 slides_text 읽기 (위치가 맞지 않으면 None)"""
+        if f is None:
+            with self.open_detail() as f:
+                f.seek(offset)
+                raw = f.read(length)
+        else:
+            f.seek(offset)
+            raw = f.read(length)
+        return self.decode_detail(praise_id, raw)
+
+    def decode_detail(self, praise_id, raw):
+        """상세 세그먼트의 한 줄(bytes)을 slides_text로 (다른 찬양의 줄이면 None)"""
+        try:
+            detail = json.loads(raw.decode('utf-8'))
+        except ValueError:
+            return None
+        if detail.get("id") != praise_id:
+            return None
+        return self.expand_slides(detail["slides"])
+
+    def iter_details(self):
+        """상세 세그먼트를 처음부터 순서대로 읽기 (id, slides_text)"""
+        with open(self.detail_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    detail = json.loads(line)
+                    yield detail["id"], self.expand_slides(detail["slides"])
+
+    @staticmethod
+    def expand_slides(slides):
+        """저장된 슬라이드(줄 목록)를 기존 slides_text 형식으로 복원"""
+        return [
+            {
+                "slide_number": slide["slide_number"],
+                "text": "\n".join(slide["text_lines"]),
+                "text_lines": slide["text_lines"],
+            }
+            for slide in slides
+        ]
+
+    def write(self, records, detail_loader, keep_headers=True):
+        """찬양 목록을 헤더/상세 세그먼트로 저장하고 새 헤더 목록 반환
+
+        detail_loader(record)는 레코드의 slides_text를 돌려준다.
+        records는 한 번만 순회하며 상세와 헤더를 한 곡씩 기록하므로
+        전체 가사를 메모리에 올리지 않는다. keep_headers=False이면 헤더도
+        모아 두지 않고 저장한 곡 수만 반환한다.
+        임시 파일에 쓴 뒤 교체하여 쓰는 도중에도 기존 파일은 온전하다.
+        """
+        detail_tmp = self.detail_path.with_name(self.detail_path.name + ".tmp")
+        header_tmp = self.header_path.with_name(self.header_path.name + ".tmp")
+
+        headers = []
+        count = 0
+        offset = 0
+        with open(detail_tmp, 'wb') as detail_file, open(header_tmp, 'w', encoding='utf-8') as header_file:
+            header_file.write(f'{{"version": {HEADER_VERSION}, "songs": [')
+            for record in records:
+                slides_text = detail_loader(record) or []
+                slides = [
+                    {"slide_number": slide["slide_number"], "text_lines": slide["text_lines"]}
+                    for slide in slides_text
+                ]
+                line = json.dumps({"id": record["id"], "slides": slides}, ensure_ascii=False)
+                data = (line + "\n").encode('utf-8')
+                detail_file.write(data)
+
+                header = {field: record.get(field) for field in HEADER_FIELDS}
+                header["preview"] = record.get("preview") or make_preview(slides_text)
+                for field, source in (("title_qwerty", "title_normalized"), ("lyrics_qwerty", "lyrics_normalized")):
+                    if header[field] is None:
+                        header[field] = to_qwerty(header[source] or "")
+                header["slide_count"] = len(slides_text)
+                header["line_ends"], header["slide_ends"] = line_offsets(slides_text)
+                minhash = record.get("minhash")
+                if minhash is None:
+                    minhash = minhash_signature(header["lyrics_normalized"] or "")
+                header["minhash"] = list(minhash)
+                header["detail_offset"] = offset
+                header["detail_length"] = len(data) - 1
+                header_file.write(", " if count else "")
+                header_file.write(json.dumps(header, ensure_ascii=False))
+                if keep_headers:
+                    headers.append(header)
+                count += 1
+                offset += len(data)
+            header_file.write("]}")
+
+        _replace(detail_tmp, self.detail_path)
+        _replace(header_tmp, self.header_path)
+        return headers if keep_headers else count
+
+
+def _replace(source, target):
+    """os.replace (윈도우에서 읽는 중인 파일이면 잠시 뒤 다시 시도)"""
+    for attempt in range(REPLACE_RETRIES):
+        try:
+            os.replace(source, target)
+            return
+        except PermissionError:
+            if attempt == REPLACE_RETRIES - 1:
+                raise
+            time.sleep(REPLACE_RETRY_DELAY)
@@ -7,16 +7,48 @@ JSON 기반 찬양 인덱싱 시스템
 import json
 import os
 import sys
+import threading
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from pathlib import Path
-from pptx import Presentation
-from pptx.util import Inches, Pt
-from pptx.enum.text import PP_ALIGN
 import re
 
+from compact_store import SlidesView, SongRecord, StringPool
+from binary_index import BinaryPraiseIndex, binary_index_paths, latest_binary_index_path, write_binary_index
+from json_index_store import HEADER_VERSION, SplitIndexStore
+from index_snapshot import IndexSnapshot
+from search_hits import find_hits, line_offsets
+from query_parser import evaluate, is_boolean_query, parse_query, positive_terms
+from setlist_resolver import SetlistResolver, parse_setlist
+from keystroke import KEYSTROKE_SCORES, is_keystroke_query, to_qwerty
+from near_duplicates import DUPLICATE_THRESHOLD, DuplicateIndex, minhash_signature, signature_similarity
+from related_songs import RelatedTable, build_related_table, content_digests
+from jsonl_index import JsonlIndexWriter, iter_jsonl_index
+from folder_watcher import StatCache
+from tracing import get_logger, span
+
+logger = get_logger(__name__)
+
+# 파일은 열었지만 가사가 있는 슬라이드가 없을 때의 실패 이유
+NO_LYRICS = "가사가 있는 슬라이드가 없습니다"
+
+
+def extraction_error(error):
+    """추출 실패 예외를 파일별 결과에 보여 줄 이유 문자열로 (예: "BadZipFile: File is not a zip file")"""
+    message = str(error)
+    return f"{type(error).__name__}: {message}" if message else type(error).__name__
+
+
+class StaleCursorError(ValueError):
+    """검색 커서를 만든 뒤 인덱스가 바뀌어 이어서 검색할 수 없음 (처음부터 다시 검색)"""
+
+
 class JSONPraiseIndexer:
     """JSON 기반 찬양 인덱싱 클래스"""
     
-    def __init__(self, praise_folder="Praise_PPT", output_json="praise_index.json", remove_duplicate_lines=False):
+    def __init__(self, praise_folder="Praise_PPT", output_json="praise_index.json", remove_duplicate_lines=False,
+                 detail_cache_size=64, search_cache_size=32):
         # 리소스 경로 헬퍼: 실행파일과 같은 폴더의 파일을 찾음
         def resource_path(relative: str) -> Path:
             if getattr(sys, 'frozen', False):
@@ -27,11 +59,116 @@ class JSONPraiseIndexer:
                 base_path = Path(__file__).parent
             return (base_path / relative).resolve()
 
+        # 찬양 폴더 (인덱스의 file_path는 이 폴더 기준 상대 경로)
         self.praise_folder = Path(praise_folder)
         self.output_json = resource_path(output_json)
-        self.praise_data = []
+        # 헤더(검색용)/상세(슬라이드 텍스트) 세그먼트 저장소
+        self.store = SplitIndexStore(self.output_json)
+        # mmap 바이너리 인덱스 파일 (저장할 때마다 .alt.bin과 번갈아 씀)
+        self.binary_path = self.output_json.with_suffix(".bin")
+        # 관련 찬양 이웃 표 파일 / 로드한 표 (찬양 ID로 찾으므로 스냅샷이 바뀌어도 그대로 사용)
+        self.related_path = self.output_json.with_suffix(".related.bin")
+        self.related = None
+        # 표를 바꿀 때마다 증가 (응답 캐시 키용)
+        self.related_version = 0
+        # 관련 찬양 표를 다시 계산하는 백그라운드 스레드 / 다음에 계산할 스냅샷 / 쉬는 중 표시
+        self._related_lock = threading.Lock()
+        self._related_thread = None
+        self._related_pending = None
+        self._related_idle = threading.Event()
+        self._related_idle.set()
+        # 스트리밍 인덱싱용 JSON Lines 파일
+        self.jsonl_path = self.output_json.with_suffix(".jsonl")
         # 슬라이드 내 동일 라인의 중복 제거 여부 (기본: 보존)
         self.remove_duplicate_lines = remove_duplicate_lines
+        # 스냅샷마다 두는 찬양 상세 LRU / (정규화된 검색어, 검색 타입) → 점수 LRU 크기
+        self.detail_cache_size = detail_cache_size
+        self.search_cache_size = search_cache_size
+        # 현재 인덱스 스냅샷 (읽는 쪽은 이 참조를 한 번 잡아 끝까지 사용)
+        self.snapshot = IndexSnapshot((), 0)
+        # 인덱스를 바꾸는 작업끼리의 잠금 / 게시 전의 다음 스냅샷 초안 (레코드 목록, 자동완성)
+        self.write_lock = threading.RLock()
+        self._draft = None
+        self._batch_depth = 0
+        # 지금까지 부여한 가장 큰 ID (이번 실행에서 지운 찬양의 ID는 다른 곡에 다시 쓰지 않음,
+        # 저장된 인덱스의 가장 큰 ID보다 큰 ID는 다음 실행에서 다시 쓰일 수 있음)
+        self._last_id = 0
+    
+    @property
+    def praise_data(self):
+        """현재 스냅샷의 찬양 목록 (튜플 또는 mmap 바이너리 인덱스, 읽기 전용)"""
+        return self.snapshot.praise_data
+    
+    @property
+    def index_version(self):
+        """인덱스 버전 (스냅샷을 게시할 때마다 증가)"""
+        return self.snapshot.version
+    
+    @property
+    def search_cache(self):
+        """현재 스냅샷의 검색 점수 캐시"""
+        return self.snapshot.search_cache
+    
+    def publish(self, praise_data, typeahead=None):
+        """새 스냅샷을 만들어 참조를 바꿔 게시
+        
+        이전 스냅샷을 잡고 있는 검색/생성은 그 스냅샷으로 끝까지 진행되고,
+        이전 스냅샷의 mmap/상세 파일은 마지막 사용자가 놓으면 해제된다.
+        """
+        with self.write_lock:
+            snapshot = IndexSnapshot(praise_data, self.snapshot.version + 1, typeahead,
+                                     self.store.detail_path, self.search_cache_size, self.detail_cache_size)
+            self._last_id = max(self._last_id, max(snapshot.ids(), default=0))
+            self.snapshot = snapshot
+            return snapshot
+    
+    @contextmanager
+    def batch(self):
+        """여러 변경(추가/삭제/저장)을 모아 스냅샷 하나로 게시
+        
+        묶음 안의 변경은 묶음이 끝날 때까지 읽는 쪽에 보이지 않는다.
+        """
+        with self.write_lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._commit_draft()
+    
+    def _edit(self):
+        """다음 스냅샷 초안 (레코드 목록, 자동완성 복사본), write_lock 안에서 호출"""
+        if self._draft is None:
+            snapshot = self.snapshot
+            typeahead = snapshot.typeahead.copy() if snapshot.typeahead is not None else None
+            self._draft = (snapshot.records(), typeahead)
+        return self._draft
+    
+    def _edited(self):
+        """초안 변경 끝 (묶음 밖이면 바로 게시)"""
+        if self._batch_depth == 0:
+            self._commit_draft()
+    
+    def _commit_draft(self):
+        if self._draft is not None:
+            records, typeahead = self._draft
+            self._draft = None
+            self.publish(records, typeahead)
+    
+    def _next_id(self, records):
+        return max(max((praise['id'] for praise in records), default=0), self._last_id) + 1
+    
+    def _stable_ids(self):
+        """다시 인덱싱할 때 쓸 (파일명 → 기존 ID, 새 파일에 줄 첫 ID)
+        
+        인덱스에 있던 파일은 전체 인덱싱 뒤에도 같은 ID를 쓰므로, 선택 목록처럼
+        ID를 들고 있는 쪽이 다른 곡을 가리키지 않는다.
+        """
+        known = {}
+        for praise_id, _, filename in self.snapshot.file_paths():
+            known.setdefault(filename, praise_id)
+        return known, max(self._last_id, max(known.values(), default=0)) + 1
     
     def extract_slide_text(self, slide):
         """슬라이드에서 텍스트 추출 (슬라이드별, 줄별)"""
@@ -75,25 +212,27 @@ class JSONPraiseIndexer:
         return slide_text
     
     def extract_lyrics_from_pptx(self, file_path):
-        """PPTX 파일에서 가사 추출"""
-        try:
-            prs = Presentation(str(file_path))
-            slides_data = []
-            
-            for i, slide in enumerate(prs.slides):
-                slide_text = self.extract_slide_text(slide)
-                if slide_text:  # 빈 슬라이드 제외
-                    slides_data.append({
-                        "slide_number": i + 1,
-                        "text": "\n".join(slide_text),
-                        "text_lines": slide_text
-                    })
-            
-            return slides_data
-            
-        except Exception as e:
-            print(f"[ERROR] {file_path} 처리 실패: {e}")
-            return []
+        """PPTX 파일에서 가사 추출
+        
+        파일을 열 수 없으면(깨진 zip, 권한 없음, 아직 쓰는 중인 파일 등) 예외를 그대로
+        올리므로, 호출하는 쪽이 파일별 실패 이유를 알릴 수 있다.
+        """
+        # python-pptx는 무거우므로 실제 추출 시점에 지연 로드
+        from pptx import Presentation
+        
+        prs = Presentation(str(file_path))
+        slides_data = []
+        
+        for i, slide in enumerate(prs.slides):
+            slide_text = self.extract_slide_text(slide)
+            if slide_text:  # 빈 슬라이드 제외
+                slides_data.append({
+                    "slide_number": i + 1,
+                    "text": "\n".join(slide_text),
+                    "text_lines": slide_text
+                })
+        
+        return slides_data
     
     def normalize_text(self, text):
         """검색용 텍스트 정규화"""
@@ -106,211 +245,991 @@ class JSONPraiseIndexer:
     
     def index_praise_files(self):
         """찬양 파일들을 JSON으로 인덱싱"""
-        print("=" * 60)
-        print("JSON 기반 찬양 인덱싱 시작")
-        print("=" * 60)
+        logger.info("JSON 기반 찬양 인덱싱 시작")
         
         if not self.praise_folder.exists():
-            print(f"[ERROR] 찬양 폴더를 찾을 수 없습니다: {self.praise_folder}")
+            logger.error("찬양 폴더를 찾을 수 없습니다: %s", self.praise_folder)
             return False
         
         # PPTX 파일들 찾기
         pptx_files = list(self.praise_folder.glob("*.pptx"))
-        print(f"발견된 PPTX 파일: {len(pptx_files)}개")
+        logger.info("발견된 PPTX 파일: %s개", len(pptx_files))
         
-        for i, file_path in enumerate(pptx_files, 1):
-            print(f"\n[{i}/{len(pptx_files)}] 처리 중: {file_path.name}")
-            
-            # 파일명에서 제목 추출
-            title = file_path.stem
-            
-            # 가사 추출
-            slides_data = self.extract_lyrics_from_pptx(file_path)
-            
-            if slides_data:
-                # 전체 가사 텍스트 생성
-                all_lyrics = []
-                for slide in slides_data:
-                    all_lyrics.extend(slide['text_lines'])
-                full_lyrics = "\n".join(all_lyrics)
+        # 새 목록은 따로 만들어 저장할 때 한 번에 게시 (그동안 검색은 이전 인덱스로)
+        records = []
+        # 이번 인덱싱의 가사 줄 공유 풀 (저장 후 레코드가 헤더만 남으면 함께 해제)
+        pool = StringPool()
+        known_ids, next_id = self._stable_ids()
+        with span("index_files", files=len(pptx_files)):
+            for i, file_path in enumerate(pptx_files, 1):
+                # 인덱스에 있던 파일은 기존 ID, 새 파일은 새 ID
+                praise_id = known_ids.get(file_path.name)
+                if praise_id is None:
+                    praise_id, next_id = next_id, next_id + 1
                 
-                # 찬양 데이터 생성
-                praise_entry = {
-                    "id": i,
-                    "filename": file_path.name,
-                    "title": title,
-                    "file_path": str(file_path),
-                    "lyrics": full_lyrics,
-                    "slides_text": slides_data,
-                    "title_normalized": self.normalize_text(title),
-                    "lyrics_normalized": self.normalize_text(full_lyrics)
-                }
+                # 찬양 데이터 생성 (가사 추출)
+                try:
+                    praise_entry = self.build_praise_entry(file_path, praise_id, pool)
+                except Exception as e:
+                    logger.warning("[%s/%s] %s: 추출 실패 (%s)", i, len(pptx_files), file_path.name,
+                                   extraction_error(e))
+                    continue
                 
-                self.praise_data.append(praise_entry)
-                print(f"  [OK] 성공: {len(slides_data)}개 슬라이드")
-            else:
-                print(f"  [FAIL] 실패: 가사 추출 불가")
+                if praise_entry:
+                    records.append(praise_entry)
+                    logger.debug("[%s/%s] %s: %s개 슬라이드", i, len(pptx_files), file_path.name,
+                                 len(praise_entry['slides_text']))
+                else:
+                    logger.warning("[%s/%s] %s: %s", i, len(pptx_files), file_path.name, NO_LYRICS)
         
-        # JSON 파일로 저장
-        self.save_to_json()
+        # 헤더/상세 세그먼트로 저장 (기존 곡은 이전 순서대로, 새 곡은 뒤에)
+        records.sort(key=lambda praise: praise['id'])
+        with self.write_lock:
+            self._draft = (records, None)
+            self.save_to_json()
         
-        print(f"\n" + "=" * 60)
-        print(f"[OK] 인덱싱 완료: {len(self.praise_data)}개 찬양")
-        print(f"[INFO] JSON 파일: {self.output_json}")
-        print("=" * 60)
+        logger.info("인덱싱 완료: %s개 찬양 (인덱스 파일: %s)", len(self.praise_data), self.store.header_path)
         
         return True
     
-    def save_to_json(self):
-        """JSON 파일로 저장"""
+    def index_praise_files_jsonl(self, resume=True):
+        """찬양 파일들을 JSON Lines(praise_index.jsonl)로 스트리밍 인덱싱
+        
+        곡을 추출할 때마다 한 줄씩 바로 기록하므로 추출 중 메모리 사용량이
+        찬양 수와 무관하다. 중단된 인덱싱은 마지막으로 기록된 곡 다음부터
+        이어서 진행하되, 그 사이 지워졌거나 수정 시각이 바뀐 파일의 줄은 버리고
+        다시 추출한다. 완료 후 JSON Lines를 한 곡씩 읽어 헤더/상세
+        세그먼트로 변환하고 인덱스를 다시 로드한다. JSON Lines는 이어 하기
+        위한 작업 파일이므로 변환이 끝나면 지운다 (중단되면 남겨 둠).
+        """
+        logger.info("JSON Lines 스트리밍 인덱싱 시작")
+        
+        if not self.praise_folder.exists():
+            logger.error("찬양 폴더를 찾을 수 없습니다: %s", self.praise_folder)
+            return False
+        
+        def is_current(record):
+            # 기록한 뒤 지워졌거나 바뀐 파일이면 False (수정 시각/크기가 없는 예전 줄도 다시 추출)
+            try:
+                stat = (self.praise_folder / record['filename']).stat()
+            except OSError:
+                return False
+            return (stat.st_mtime_ns, stat.st_size) == (record.get('mtime_ns'), record.get('size'))
+        
+        writer = JsonlIndexWriter(self.jsonl_path, resume=resume, is_current=is_current)
         try:
-            with open(self.output_json, 'w', encoding='utf-8') as f:
-                json.dump(self.praise_data, f, ensure_ascii=False, indent=2)
-            print(f"[OK] JSON 저장 완료: {self.output_json}")
-        except Exception as e:
-            print(f"[ERROR] JSON 저장 실패: {e}")
+            if writer.resumed or writer.dropped:
+                logger.info("이전 인덱싱 이어서 진행: %s개 기록됨 (지워졌거나 바뀐 파일 %s개 제외)",
+                            writer.count, writer.dropped)
+            
+            pptx_files = sorted(self.praise_folder.glob("*.pptx"))
+            remaining = [p for p in pptx_files if p.name not in writer.done_files]
+            logger.info("발견된 PPTX 파일: %s개 (남은 파일: %s개)", len(pptx_files), len(remaining))
+            
+            known_ids, next_id = self._stable_ids()
+            next_id = max(next_id, writer.last_id + 1)
+            for i, file_path in enumerate(remaining, 1):
+                praise_id = known_ids.get(file_path.name)
+                if praise_id is None:
+                    praise_id, next_id = next_id, next_id + 1
+                try:
+                    praise_entry = self.build_praise_entry(file_path, praise_id)
+                except Exception as e:
+                    logger.warning("[%s/%s] %s: 추출 실패 (%s)", i, len(remaining), file_path.name,
+                                   extraction_error(e))
+                    continue
+                if praise_entry:
+                    writer.write(praise_entry)
+                    logger.debug("[%s/%s] %s: %s개 슬라이드", i, len(remaining), file_path.name,
+                                 len(praise_entry['slides_text']))
+                else:
+                    logger.warning("[%s/%s] %s: %s", i, len(remaining), file_path.name, NO_LYRICS)
+            
+            writer.complete()
+        finally:
+            writer.close()
+        
+        # JSON Lines → 헤더/상세 세그먼트 (한 곡씩 변환)
+        with self.write_lock:
+            self._draft = None
+            count = self.store.write(
+                iter_jsonl_index(self.jsonl_path),
+                lambda praise: praise['slides_text'],
+                keep_headers=False
+            )
+            self.load_from_json()
+        # 세그먼트에 모두 들어갔으므로 같은 내용의 전체 사본을 남겨 두지 않음
+        self.jsonl_path.unlink(missing_ok=True)
+        
+        logger.info("인덱싱 완료: %s개 찬양 (인덱스 파일: %s)", count, self.store.header_path)
+        
+        return True
     
     def load_from_json(self):
-        """JSON 파일에서 로드"""
+        """인덱스 로드
+        
+        헤더 세그먼트만 읽으므로 가사/슬라이드 텍스트는 메모리에 올리지 않는다.
+        세그먼트가 없거나 예전 전체 JSON(praise_index.json)이 더 최신이면
+        전체 JSON을 읽어 세그먼트로 변환한다.
+        """
         try:
-            if self.output_json.exists():
-                with open(self.output_json, 'r', encoding='utf-8') as f:
-                    self.praise_data = json.load(f)
-                print(f"[OK] JSON 로드 완료: {len(self.praise_data)}개 찬양")
-                return True
-            else:
-                print(f"[WARNING] JSON 파일이 없습니다: {self.output_json}")
-                return False
+            with self.write_lock:
+                self._draft = None
+                if self.store.is_fresh():
+                    # 헤더 형식이 예전 버전이면 바이너리 인덱스도 예전 헤더로 만든 것이므로 쓰지 않음
+                    current = self.store.read_version() == HEADER_VERSION
+                    binary = self.open_binary_index() if current else None
+                    if binary is not None:
+                        # 바이너리 인덱스는 파싱 없이 mmap으로 바로 사용
+                        self.publish(binary)
+                    else:
+                        with span("read_header"):
+                            version, headers = self.store.read_header()
+                            records = [SongRecord.from_dict(h) for h in headers]
+                        if version < HEADER_VERSION:
+                            # 예전 형식 헤더 → 세그먼트를 다시 써서 빠진 필드 추가
+                            logger.info("인덱스 헤더 형식 변환: 버전 %s → %s", version, HEADER_VERSION)
+                            self._draft = (records, None)
+                            self.save_to_json()
+                        else:
+                            self.publish(records)
+                            # 다음 실행부터는 바이너리 인덱스를 바로 열도록 생성
+                            try:
+                                self.write_binary(records)
+                            except OSError as e:
+                                logger.warning("바이너리 인덱스 생성 실패: %s", e)
+                    self.load_related()
+                    logger.info("인덱스 로드 완료: %s개 찬양", len(self.praise_data))
+                    return True
+                elif self.output_json.exists():
+                    with open(self.output_json, 'r', encoding='utf-8') as f:
+                        pool = StringPool()
+                        records = [SongRecord.from_dict(d, pool) for d in json.load(f)]
+                    logger.info("JSON 로드 완료: %s개 찬양", len(records))
+                    # 다음 실행부터는 헤더만 읽도록 세그먼트 생성
+                    self._draft = (records, None)
+                    self.save_to_json()
+                    return True
+                else:
+                    logger.warning("JSON 파일이 없습니다: %s", self.output_json)
+                    return False
         except Exception as e:
-            print(f"[ERROR] JSON 로드 실패: {e}")
+            logger.error("JSON 로드 실패: %s", e)
             return False
     
-    def search_praises(self, query, search_type="title"):
-        """찬양 검색"""
-        if not self.praise_data:
+    def open_binary_index(self):
+        """헤더 세그먼트보다 최신인 바이너리 인덱스가 있으면 mmap으로 열기 (없으면 None)"""
+        try:
+            path = latest_binary_index_path(self.binary_path, self.store.header_path.stat().st_mtime)
+            if path is None:
+                return None
+            with span("open_binary_index"):
+                return BinaryPraiseIndex(path)
+        except Exception as e:
+            logger.warning("바이너리 인덱스 열기 실패: %s", e)
+            return None
+    
+    def write_binary(self, headers):
+        """바이너리 인덱스를 마지막에 쓴 파일이 아닌 쪽 파일에 작성
+        
+        마지막에 쓴 파일은 최근 스냅샷이 매핑하고 있을 수 있으므로 건드리지 않고,
+        새 파일을 쓴 뒤 이전 파일을 지운다. 윈도우에서 아직 매핑 중이라 지우지
+        못하면 남겨 두고 다음 저장 때 덮어쓴다 (로드할 때는 마지막에 쓴 파일을 연다).
+        """
+        primary, alternate = binary_index_paths(self.binary_path)
+        latest = latest_binary_index_path(self.binary_path)
+        target, other = (alternate, primary) if latest == primary else (primary, alternate)
+        write_binary_index(headers, target)
+        try:
+            other.unlink()
+        except OSError:
+            pass
+        return target
+    
+    def close_binary_index(self):
+        """mmap 바이너리 인덱스 대신 파이썬 레코드 목록 스냅샷으로 전환
+        
+        mmap은 이전 스냅샷을 잡고 있던 검색/생성이 모두 끝나면 해제된다.
+        """
+        with self.write_lock:
+            snapshot = self.snapshot
+            if snapshot.is_binary:
+                self.publish(snapshot.records(), snapshot.typeahead)
+    
+    # 검색 타입별 점수 단계 (높은 점수부터 순서대로 결과를 생성)
+    # 40/20점은 영문 자판 상태로 입력한 검색어가 키 입력 형태에만 일치한 경우
+    SEARCH_SCORE_TIERS = {
+        "title": (100, 80, 40),
+        "lyrics": (100, 80, 40),
+        "both": (100, 50, 40, 20),
+    }
+    
+    def score_praise(self, praise, query, query_normalized, search_type="title"):
+        """찬양 하나의 검색 점수 계산 (0이면 불일치)"""
+        score = 0
+        
+        if search_type == "title":
+            if query_normalized in praise['title_normalized']:
+                score = 100
+            elif query in praise['title']:
+                score = 80
+        elif search_type == "lyrics":
+            if query_normalized in praise['lyrics_normalized']:
+                score = 100
+            elif query in praise.get('lyrics', ''):
+                score = 80
+        elif search_type == "both":
+            if query_normalized in praise['title_normalized']:
+                score += 50
+            if query_normalized in praise['lyrics_normalized']:
+                score += 50
+        
+        if not score and is_keystroke_query(query_normalized):
+            for field, points in KEYSTROKE_SCORES.get(search_type, ()):
+                if query_normalized in (praise.get(field) or ''):
+                    score += points
+        
+        return score
+    
+    def iter_search_praises(self, query, search_type="title", cursor=None, collapse=False):
+        """점수순으로 검색 결과를 하나씩 생성하는 지연 스트림
+        
+        (next_cursor, praise)를 차례로 돌려준다. next_cursor를 다시 넘기면
+        그 결과 바로 다음부터 이어서 검색한다. 점수 단계별로 데이터를
+        순회하므로 필요한 만큼만 소비하면 나머지는 계산하지 않는다.
+        검색하는 동안에는 시작할 때의 스냅샷만 쓴다.
+        커서는 (스냅샷 버전, 점수 단계, 레코드 위치)이며, 그 사이 새 스냅샷이
+        게시되었으면 순위가 달라져 곡을 건너뛰거나 반복하므로 StaleCursorError를 낸다.
+        collapse이면 거의 같은 곡 묶음마다 점수가 가장 높은 곡 하나만 돌려준다.
+        """
+        snapshot = self.snapshot
+        if not snapshot.praise_data:
             if not self.load_from_json():
-                return []
+                return
+            snapshot = self.snapshot
         
-        results = []
+        if cursor and cursor[0] != snapshot.version:
+            raise StaleCursorError(f"인덱스가 바뀌었습니다 (커서 버전 {cursor[0]}, 현재 {snapshot.version})")
         query_normalized = self.normalize_text(query)
+        tiers = self.SEARCH_SCORE_TIERS.get(search_type, ())
+        _, tier_index, position = cursor if cursor else (None, 0, 0)
+        
+        # 바이너리 인덱스는 mmap 위의 포스팅 리스트로, 메모리 목록은 이어 붙인
+        # 버퍼 검색으로 점수를 한 번에 계산하고 결과 레코드만 꺼낸다.
+        # (원문에 검색어가 있으면 정규화된 텍스트에도 있으므로 80점 단계는
+        # 정규화 일치(100점)에 포함된다)
+        data = snapshot.praise_data
+        if is_boolean_query(query):
+            scores = self.get_boolean_scores(parse_query(query), search_type, snapshot)
+        else:
+            scores = self.get_match_scores(query_normalized, search_type, snapshot)
+        if collapse:
+            scores = snapshot.get_duplicates().collapse(scores)
+        matched = sorted(scores)
+        while tier_index < len(tiers):
+            tier_score = tiers[tier_index]
+            for k in range(bisect_left(matched, position), len(matched)):
+                index = matched[k]
+                if scores[index] == tier_score:
+                    yield (snapshot.version, tier_index, index + 1), data[index]
+            tier_index += 1
+            position = 0
+    
+    def get_match_scores(self, query_normalized, search_type="title", snapshot=None):
+        """검색어의 점수 (레코드 번호 → 점수), 스냅샷의 검색 캐시 사용
+        
+        캐시에 없더라도 이 검색어를 포함하는 더 짧은 검색어의 결과가 있으면
+        (예: "하나님" 다음 "하나님의") 그 후보만 다시 확인한다.
+        """
+        if snapshot is None:
+            snapshot = self.snapshot
+        key = (query_normalized, search_type)
+        scores = snapshot.cache_get(snapshot.search_cache, key)
+        if scores is not None:
+            return scores
+        
+        # 가장 긴 (검색어가 포함하는) 이전 검색어의 결과를 후보로 사용
+        candidates = None
+        base_query = None
+        for cached_query, cached_scores in snapshot.cached_searches(search_type):
+            if (base_query is None or len(cached_query) > len(base_query)) and cached_query in query_normalized:
+                candidates = cached_scores
+                base_query = cached_query
+        
+        data = snapshot.praise_data
+        engine = snapshot.search_engine()
+        # 후보를 하나씩 확인하는 비용은 후보 수에 비례하므로, 후보가 많으면
+        # (짧은 검색어) 포스팅 리스트/버퍼 전체 검색이 더 빠르다
+        if candidates is not None and len(candidates) * 10 > len(data):
+            candidates = None
+        with span("match_scores", query=query_normalized, search_type=search_type,
+                  candidates=None if candidates is None else len(candidates)):
+            if candidates is None:
+                scores = engine.match_scores(query_normalized, search_type)
+            else:
+                candidates = sorted(candidates)
+                scores = engine.match_scores(query_normalized, search_type, candidates)
+        
+        if is_keystroke_query(query_normalized):
+            # 영문 자판 상태로 입력한 한글: 키 입력 형태에만 일치하는 찬양은 낮은 점수로 추가
+            # 이전 검색어가 키 입력 형태를 확인하지 않은 검색어면(예: "w" 다음 "wn") 그 결과에
+            # 키 입력 형태로만 일치하는 찬양이 없으므로 후보로 좁히지 않고 전체에서 찾는다
+            keystroke_candidates = candidates if base_query and is_keystroke_query(base_query) else None
+            keystroke_scores = {}
+            for field, points in KEYSTROKE_SCORES.get(search_type, ()):
+                for i in engine.matching_indices(field, query_normalized, keystroke_candidates):
+                    if i not in scores:
+                        keystroke_scores[i] = keystroke_scores.get(i, 0) + points
+            if keystroke_scores:
+                scores = {**scores, **keystroke_scores}
+        
+        snapshot.cache_put(snapshot.search_cache, key, scores, snapshot.search_cache_size)
+        return scores
+    
+    def find_hits(self, praise, query, limit=None):
+        """찬양 가사에서 검색어가 나오는 위치 (슬라이드/줄 단위)
+        
+        인덱스의 줄 경계 배열(line_ends/slide_ends)로 정규화된 가사의 일치
+        위치를 바꾸므로 가사 원문을 읽지 않는다. 줄 경계가 없는 예전 인덱스나
+        저장 전 찬양만 상세를 읽어 계산한다.
+        반환값 형식은 search_hits.find_hits 참고.
+        """
+        line_ends = praise.get('line_ends')
+        slide_ends = praise.get('slide_ends')
+        if not line_ends or not slide_ends:
+            line_ends, slide_ends = line_offsets(self.get_praise_detail(praise['id']))
+        
+        if not is_boolean_query(query):
+            return find_hits(praise['lyrics_normalized'], line_ends, slide_ends,
+                             self.normalize_text(query), limit)
+        
+        # 검색식이면 제외 조건이 아닌 단어들의 위치를 모두 모아 순서대로
+        hits = []
+        for term in positive_terms(parse_query(query)):
+            hits.extend(find_hits(praise['lyrics_normalized'], line_ends, slide_ends, term))
+        hits.sort(key=lambda hit: (hit['slide_index'], hit['line_index'], hit['start']))
+        return hits[:limit] if limit is not None else hits
+    
+    def get_matching_slides(self, praise, query):
+        """검색어가 가사에 나오는 슬라이드 순서 목록 (slides_text 기준 0부터)"""
+        return sorted({hit['slide_index'] for hit in self.find_hits(praise, query)})
+    
+    def get_typeahead(self, snapshot=None):
+        """제목 자동완성 인덱스 (스냅샷에 없으면 생성)"""
+        return (self.snapshot if snapshot is None else snapshot).get_typeahead()
+    
+    def suggest_titles(self, prefix, limit=10):
+        """제목 자동완성 (찬양 ID, 제목) 목록, 초성 입력(예: "ㅈㄴㅇ")도 지원"""
+        snapshot = self.snapshot
+        if not snapshot.praise_data or is_boolean_query(prefix):
+            return []
+        return snapshot.get_typeahead().suggest(self.normalize_text(prefix), limit)
+    
+    def get_boolean_scores(self, node, search_type="title", snapshot=None):
+        """검색식(query_parser 트리)의 점수 (레코드 번호 → 점수), 검색 캐시 사용
         
-        for praise in self.praise_data:
-            score = 0
+        단어마다 인덱스에서 일치 레코드 집합을 한 번씩만 구하고(바이너리는
+        포스팅 리스트, 메모리 목록은 버퍼 검색) 검색식은 집합 연산으로 계산한다.
+        전체 검색에서는 제목+가사 어디든 식을 만족하면 50점, 제목과 가사가
+        각각 식을 만족하면 100점이다.
+        """
+        if node is None:
+            return {}
+        if snapshot is None:
+            snapshot = self.snapshot
+        key = (node, search_type)
+        scores = snapshot.cache_get(snapshot.search_cache, key)
+        if scores is not None:
+            return scores
+        
+        data = snapshot.praise_data
+        engine = snapshot.search_engine()
+        term_sets = {}
+        
+        def match_field(field):
+            def match_term(term):
+                if (field, term) not in term_sets:
+                    term_sets[(field, term)] = set(engine.matching_indices(field, term))
+                return term_sets[(field, term)]
+            return match_term
+        
+        match_title = match_field("title_normalized")
+        match_lyrics = match_field("lyrics_normalized")
+        if search_type == "title":
+            scores = dict.fromkeys(evaluate(node, match_title, len(data)), 100)
+        elif search_type == "lyrics":
+            scores = dict.fromkeys(evaluate(node, match_lyrics, len(data)), 100)
+        elif search_type == "both":
+            title_matches = evaluate(node, match_title, len(data))
+            lyrics_matches = evaluate(node, match_lyrics, len(data))
+            either = evaluate(node, lambda term: match_title(term) | match_lyrics(term), len(data))
+            scores = {
+                i: 100 if i in title_matches and i in lyrics_matches else 50
+                for i in either
+            }
+        else:
+            scores = {}
+        
+        snapshot.cache_put(snapshot.search_cache, key, scores, snapshot.search_cache_size)
+        return scores
+    
+    def resolve_setlist(self, text, limit=3, snapshot=None):
+        """붙여넣은 콘티(줄마다 제목 또는 가사 일부)를 한 번에 찾기
+        
+        줄 순서대로 {"query", "matches": [(찬양 ID, 제목, 점수), ...], "resolved"}
+        목록을 반환한다. resolved가 False이면 후보가 애매하거나 없는 줄이다.
+        """
+        if snapshot is None:
+            snapshot = self.snapshot
+        if not snapshot.praise_data:
+            if not self.load_from_json():
+                return []
+            snapshot = self.snapshot
+        
+        resolver = snapshot.setlist_resolver
+        if resolver is None:
+            ids = snapshot.ids()
             
-            if search_type == "title":
-                if query_normalized in praise['title_normalized']:
-                    score = 100
-                elif query in praise['title']:
-                    score = 80
-            elif search_type == "lyrics":
-                if query_normalized in praise['lyrics_normalized']:
-                    score = 100
-                elif query in praise['lyrics']:
-                    score = 80
-            elif search_type == "both":
-                if query_normalized in praise['title_normalized']:
-                    score += 50
-                if query_normalized in praise['lyrics_normalized']:
-                    score += 50
+            def lyrics_search(query_normalized):
+                return [ids[i] for i in sorted(self.get_match_scores(query_normalized, "lyrics", snapshot))]
             
-            if score > 0:
-                results.append({
-                    'praise': praise,
-                    'score': score
-                })
+            titles = {praise_id: entry[:2] for praise_id, entry in snapshot.get_typeahead().titles.items()}
+            resolver = snapshot.setlist_resolver = SetlistResolver(titles, lyrics_search)
         
-        # 점수순 정렬
-        results.sort(key=lambda x: x['score'], reverse=True)
-        return [r['praise'] for r in results]
+        entries = text if isinstance(text, (list, tuple)) else parse_setlist(text)
+        return resolver.resolve(entries, limit)
+    
+    def search_page(self, query, search_type="title", cursor=None, page_size=30, collapse=False):
+        """검색 결과 한 페이지 조회
+        
+        (결과 목록, 다음 커서)를 반환한다. 더 이상 결과가 없으면 다음 커서는 None.
+        커서를 만든 뒤 인덱스가 바뀌었으면 StaleCursorError.
+        """
+        results = []
+        next_cursor = None
+        for item_cursor, praise in self.iter_search_praises(query, search_type, cursor, collapse):
+            if len(results) == page_size:
+                # 다음 페이지가 있음을 확인만 하고 중단
+                return results, next_cursor
+            results.append(praise)
+            next_cursor = item_cursor
+        return results, None
+    
+    def search_praises(self, query, search_type="title", collapse=False):
+        """찬양 검색 (점수순 전체 결과)"""
+        return [praise for _, praise in self.iter_search_praises(query, search_type, collapse=collapse)]
+    
+    def build_related(self, snapshot=None, songs=None):
+        """스냅샷의 가사로 관련 찬양 이웃 표를 만들어 저장 (거의 같은 사본끼리는 제외)"""
+        if snapshot is None:
+            snapshot = self.snapshot
+        if songs is None:
+            songs = snapshot.lyrics()
+        with span("build_related", songs=len(snapshot)):
+            related = build_related_table(songs, snapshot.get_duplicates().cluster_of)
+        self._write_related(related)
+        self.related = related
+        self.related_version += 1
+        return related
+    
+    def _write_related(self, related):
+        try:
+            related.write(self.related_path)
+        except OSError as e:
+            logger.warning("관련 찬양 표 저장 실패: %s", e)
+    
+    def update_related(self, snapshot):
+        """관련 찬양 표 갱신 (모든 곡의 ID와 가사가 표와 같으면 다시 계산하지 않음)
+        
+        저장/로드 후에는 schedule_related로 백그라운드에서 호출된다. 경로 정리처럼 file_path만 바뀐 저장에서는 표를 그대로 쓴다. 다시 인덱싱하면
+        같은 ID의 파일 내용이 바뀌었을 수 있으므로 ID가 아니라 가사 digest로 비교한다.
+        """
+        songs = snapshot.lyrics()
+        related = self.related
+        if related is None or not related.matches(content_digests(songs)):
+            return self.build_related(snapshot, songs)
+        if not self.related_path.exists():
+            self._write_related(related)
+        return related
+    
+    def load_related(self):
+        """저장된 관련 찬양 표를 로드하고, 곡 ID/가사가 인덱스와 다르면 백그라운드에서 새로 생성
+        
+        새 표가 준비될 때까지는 읽은 표(없으면 빈 결과)를 그대로 쓴다.
+        """
+        try:
+            if self.related_path.exists():
+                self.related = RelatedTable.read(self.related_path)
+                self.related_version += 1
+        except (OSError, ValueError) as e:
+            logger.warning("관련 찬양 표 로드 실패: %s", e)
+            self.related = None
+        self.schedule_related(self.snapshot)
+        return self.related
+    
+    def schedule_related(self, snapshot):
+        """관련 찬양 표를 백그라운드 스레드에서 갱신
+        
+        표 계산은 찬양 수에 따라 수 초 이상 걸리므로 저장(write_lock) 안에서 하지 않는다.
+        계산 중에 다시 저장하면 끝난 뒤 가장 최근 스냅샷으로 한 번만 더 계산한다.
+        """
+        with self._related_lock:
+            self._related_pending = snapshot
+            self._related_idle.clear()
+            if self._related_thread is None:
+                self._related_thread = threading.Thread(target=self._related_worker, name="related-builder",
+                                                        daemon=True)
+                self._related_thread.start()
+    
+    def _related_worker(self):
+        while True:
+            with self._related_lock:
+                snapshot, self._related_pending = self._related_pending, None
+                if snapshot is None:
+                    self._related_thread = None
+                    self._related_idle.set()
+                    return
+            try:
+                self.update_related(snapshot)
+            except Exception:
+                logger.exception("관련 찬양 표 갱신 실패")
+    
+    def wait_related(self, timeout=None):
+        """백그라운드 관련 찬양 표 갱신이 끝날 때까지 대기 (끝났으면 True)"""
+        return self._related_idle.wait(timeout)
+    
+    def related_songs(self, praise_id, limit=None, snapshot=None):
+        """가사가 비슷한 찬양 [(찬양, 유사도), ...], 유사도 높은 순
+        
+        저장 후 백그라운드에서 미리 계산한 이웃 표에서 찾기만 한다. 그 뒤에 지운 곡은
+        빼고, 새로 추가한 곡은 표 계산이 끝난 뒤부터 나온다.
+        """
+        if snapshot is None:
+            snapshot = self.snapshot
+        related = self.related
+        if related is None:
+            return []
+        results = []
+        for related_id, score in related.related(praise_id):
+            praise = snapshot.find(related_id)
+            if praise is not None:
+                results.append((praise, score))
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+    
+    def find_duplicates(self, threshold=DUPLICATE_THRESHOLD, snapshot=None):
+        """거의 같은 곡 묶음 목록
+        
+        묶음마다 [(찬양, 첫 곡과의 유사도), ...]이며 묶음 안은 인덱스 순서다.
+        기본 기준이면 스냅샷에 만들어 둔 묶음을 그대로 쓴다.
+        """
+        if snapshot is None:
+            snapshot = self.snapshot
+        if threshold == DUPLICATE_THRESHOLD:
+            duplicates = snapshot.get_duplicates()
+        else:
+            duplicates = DuplicateIndex(snapshot.signatures(), threshold)
+        data = snapshot.praise_data
+        signatures = duplicates.signatures
+        return [
+            [(data[i], signature_similarity(signatures[members[0]], signatures[i])) for i in members]
+            for members in duplicates.clusters
+        ]
+    
+    def get_praise_detail(self, praise_id, snapshot=None):
+        """찬양 상세(슬라이드별 텍스트) 조회 (스냅샷의 LRU 캐시 사용)
+        
+        반환값은 slides_text 목록이며, 찬양이 없으면 None.
+        """
+        if snapshot is None:
+            snapshot = self.snapshot
+        slides_text = snapshot.cache_get(snapshot.detail_cache, praise_id)
+        if slides_text is not None:
+            return slides_text
+        
+        slides_text = self.load_praise_detail(praise_id, snapshot=snapshot)
+        if slides_text is None:
+            return None
+        if not isinstance(slides_text, SlidesView):
+            # 세그먼트에서 읽은 상세도 곡마다 따로 둔 풀로 압축해서 캐시 (캐시에서 밀려나면 풀도 해제)
+            holder = SongRecord(StringPool(), id=praise_id)
+            holder.set_slides(slides_text)
+            slides_text = holder['slides_text']
+        
+        snapshot.cache_put(snapshot.detail_cache, praise_id, slides_text, snapshot.detail_cache_size)
+        return slides_text
+    
+    def find_praise(self, praise_id, snapshot=None):
+        """ID로 찬양(헤더) 찾기"""
+        return (self.snapshot if snapshot is None else snapshot).find(praise_id)
+    
+    def find_selected(self, praise_info, snapshot=None):
+        """선택 목록 등에 담아 둔 찬양(dict)을 스냅샷에서 다시 찾기 (없으면 None)
+        
+        ID로 찾은 곡의 제목/파일명이 같을 때만 그 곡을 쓰고, 다르면(담은 뒤 지우고
+        다른 곡이 추가된 경우 등) 파일명, 제목 순으로 찾는다.
+        """
+        if snapshot is None:
+            snapshot = self.snapshot
+        title = praise_info.get('title')
+        filename = praise_info.get('filename')
+        if praise_info.get('id') is not None:
+            praise = snapshot.find(praise_info['id'])
+            if (praise is not None and (title is None or praise['title'] == title)
+                    and (filename is None or praise['filename'] == filename)):
+                return praise
+        if filename is not None:
+            praise = snapshot.find_by_field('filename', filename)
+            if praise is not None:
+                return praise
+        if title is not None:
+            return snapshot.find_by_field('title', title)
+        return None
+    
+    def load_praise_detail(self, praise_id, f=None, snapshot=None):
+        """찬양 상세(슬라이드별 텍스트) 로드 (캐시 없이)
+        
+        아직 저장되지 않은 찬양은 메모리의 데이터를, 나머지는 상세 세그먼트에서
+        해당 위치만 읽는다.
+        """
+        if snapshot is None:
+            snapshot = self.snapshot
+        praise = snapshot.find(praise_id)
+        if praise is None:
+            return None
+        return self._read_praise_detail(praise, f, snapshot)
+    
+    def _read_praise_detail(self, praise, f=None, snapshot=None):
+        """찬양 레코드의 slides_text 로드 (메모리 또는 상세 세그먼트)
+        
+        f를 주지 않으면 스냅샷이 고정해 둔 상세 세그먼트에서 읽는다. 고정하지
+        못한 환경(윈도우)에서 그 사이 세그먼트가 교체되었으면 최신 스냅샷의 같은
+        파일 위치로 다시 읽는다.
+        """
+        if 'slides_text' in praise:
+            return praise['slides_text']
+        if 'detail_offset' not in praise:
+            return []
+        if f is None and snapshot is not None and snapshot.detail_file is not None:
+            return snapshot.read_detail(self.store, praise)
+        slides_text = self.store.read_detail(praise['id'], praise['detail_offset'], praise['detail_length'], f)
+        if slides_text is None and f is None:
+            current = self.snapshot.find(praise['id'])
+            if (current is not None and current['filename'] == praise['filename']
+                    and current.get('detail_offset') != praise['detail_offset']):
+                return self._read_praise_detail(current)
+        return slides_text
     
     def remove_praise_by_id(self, praise_id):
-        """ID로 찬양 데이터 제거"""
+        """ID로 찬양 데이터 제거 (묶음 밖이면 바로 새 스냅샷 게시)"""
         try:
-            self.praise_data = [praise for praise in self.praise_data if praise['id'] != praise_id]
-            print(f"[OK] 찬양 데이터 제거됨: ID {praise_id}")
+            with self.write_lock:
+                records, typeahead = self._edit()
+                records[:] = [praise for praise in records if praise['id'] != praise_id]
+                if typeahead is not None:
+                    typeahead.remove(praise_id)
+                self._edited()
+            logger.info("찬양 데이터 제거됨: ID %s", praise_id)
             return True
         except Exception as e:
-            print(f"[ERROR] 찬양 데이터 제거 실패: {e}")
+            logger.error("찬양 데이터 제거 실패: %s", e)
             return False
     
+    def build_praise_entry(self, file_path, praise_id, pool=None):
+        """PPTX 파일 하나에서 찬양 데이터 생성 (가사가 없으면 None)
+        
+        pool은 같은 줄을 함께 저장할 가사 줄 풀이다 (없으면 이 곡만의 풀).
+        파일을 읽지 못하면 예외를 그대로 올린다 (extract_lyrics_from_pptx 참고).
+        """
+        file_path = Path(file_path)
+        
+        # 파일명에서 제목 추출
+        title = file_path.stem
+        
+        # 추출 전 수정 시각/크기 (추출 중에 바뀌면 다음 증분 인덱싱에서 다시 추출)
+        stat = file_path.stat()
+        
+        # 슬라이드 데이터 추출
+        with span("extract_file", file=file_path.name):
+            slides_data = self.extract_lyrics_from_pptx(file_path)
+        if not slides_data:
+            return None
+        
+        # 가사 텍스트 생성
+        lyrics_lines = []
+        for slide in slides_data:
+            lyrics_lines.extend(slide['text_lines'])
+        lyrics = "\n".join(lyrics_lines)
+        
+        # 가사 줄은 공유 풀에 한 번만 저장하는 압축 레코드로 생성
+        record = SongRecord(
+            pool if pool is not None else StringPool(),
+            id=praise_id,
+            filename=file_path.name,
+            title=title,
+            file_path=self.library_path(file_path),
+            title_normalized=self.normalize_text(title),
+            lyrics_normalized=self.normalize_text(lyrics),
+            # 한/영 전환을 잊고 입력한 검색어용 두벌식 키 입력 형태
+            title_qwerty=to_qwerty(self.normalize_text(title)),
+            lyrics_qwerty=to_qwerty(self.normalize_text(lyrics)),
+            # 거의 같은 곡 찾기용 가사 MinHash 서명
+            minhash=minhash_signature(self.normalize_text(lyrics)),
+            # 증분 인덱싱에서 바뀐 파일을 찾는 기준
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size
+        )
+        record.set_slides(slides_data)
+        return record
+    
+    def file_changes(self, snapshot=None):
+        """찬양 폴더와 인덱스 비교: (새 파일 목록, 변경된 찬양 ID와 파일, 없어진 찬양 ID 목록)
+        
+        파일 이름으로 짝짓고, 곡마다 인덱싱할 때 기록한 (수정 시각, 크기)와 지금 파일이
+        다르면 변경으로 본다 (다른 곡을 저장해도 앞선 변경이 가려지지 않음).
+        폴더는 scandir로 한 번만 훑는다.
+        """
+        if snapshot is None:
+            snapshot = self.snapshot
+        files = StatCache(self.praise_folder).snapshot()
+        indexed = {}
+        for praise_id, filename, stat in snapshot.file_stats():
+            indexed.setdefault(filename, (praise_id, stat))
+        
+        added, changed = [], []
+        for name in sorted(files):
+            file_path = self.praise_folder / name
+            if name not in indexed:
+                added.append(file_path)
+            elif files[name] != indexed[name][1]:
+                changed.append((indexed[name][0], file_path))
+        removed = [praise_id for filename, (praise_id, _) in indexed.items() if filename not in files]
+        return added, changed, removed
+    
+    def library_path(self, file_path):
+        """인덱스에 저장할 파일 경로 (찬양 폴더 안이면 폴더 기준 상대 경로, 밖이면 절대 경로)"""
+        path = Path(file_path).resolve()
+        try:
+            return path.relative_to(self.praise_folder.resolve()).as_posix()
+        except ValueError:
+            return str(path)
+    
+    def resolve_file_path(self, praise):
+        """찬양 레코드의 실제 파일 경로 (file_path를 찬양 폴더 기준으로 해석)"""
+        return self.praise_folder / praise['file_path']
+    
+    def set_file_paths(self, paths):
+        """찬양 ID → 새 file_path 반영 (묶음 밖이면 바로 새 스냅샷 게시)
+        
+        게시된 레코드는 바꾸지 않고 경로만 다른 복사본으로 교체한다.
+        """
+        with self.write_lock:
+            records, _ = self._edit()
+            for i, praise in enumerate(records):
+                new_path = paths.get(praise['id'])
+                if new_path is not None and new_path != praise['file_path']:
+                    records[i] = praise.copy(file_path=new_path)
+            self._edited()
+    
     def add_single_file(self, file_path):
         """단일 파일 추가"""
         try:
             file_path = Path(file_path)
             if not file_path.exists():
-                print(f"[ERROR] 파일이 존재하지 않습니다: {file_path}")
+                logger.error("파일이 존재하지 않습니다: %s", file_path)
                 return False
             
-            # 기존 데이터에서 최대 ID 찾기
-            max_id = max([praise['id'] for praise in self.praise_data], default=0)
-            new_id = max_id + 1
-            
-            # 파일명에서 제목 추출
-            title = file_path.stem
-            
-            # 슬라이드 데이터 추출
-            slides_data = self.extract_lyrics_from_pptx(file_path)
-            if not slides_data:
-                print(f"[WARNING] 슬라이드 데이터가 없습니다: {file_path}")
+            # 추출은 잠금 밖에서 (그동안 다른 변경/검색은 그대로 진행)
+            new_praise = self.build_praise_entry(file_path, None)
+            if not new_praise:
+                logger.warning("슬라이드 데이터가 없습니다: %s", file_path)
                 return False
             
-            # 가사 텍스트 생성
-            lyrics_lines = []
-            for slide in slides_data:
-                lyrics_lines.extend(slide['text_lines'])
-            lyrics = "\n".join(lyrics_lines)
-            
-            # 새 찬양 데이터 생성
-            new_praise = {
-                "id": new_id,
-                "filename": file_path.name,
-                "title": title,
-                "file_path": str(file_path),
-                "lyrics": lyrics,
-                "slides_text": slides_data,
-                "title_normalized": self.normalize_text(title),
-                "lyrics_normalized": self.normalize_text(lyrics)
-            }
-            
-            # 데이터에 추가
-            self.praise_data.append(new_praise)
-            print(f"[OK] 새 파일 추가됨: {title} (ID: {new_id})")
+            self.add_entries([new_praise])
+            logger.info("새 파일 추가됨: %s (ID: %s)", new_praise['title'], new_praise['id'])
             return True
             
         except Exception as e:
-            print(f"[ERROR] 파일 추가 실패: {e}")
+            logger.error("파일 추가 실패: %s", e)
             return False
     
+    def add_entries(self, entries):
+        """추출해 둔 찬양 데이터에 순서대로 다음 ID를 부여해 추가 (묶음 밖이면 바로 새 스냅샷 게시)"""
+        with self.write_lock:
+            records, typeahead = self._edit()
+            next_id = self._next_id(records)
+            for entry in entries:
+                entry['id'] = next_id
+                next_id += 1
+            records.extend(entries)
+            if typeahead is not None:
+                for entry in entries:
+                    typeahead.add(entry['id'], entry['title'], entry['title_normalized'])
+            self._edited()
+    
+    def replace_entries(self, entries):
+        """찬양 ID → 다시 추출한 찬양 데이터로 기존 레코드를 제자리에서 교체 (묶음 밖이면 바로 새 스냅샷 게시)
+        
+        바뀐 파일을 다시 인덱싱해도 ID와 순서가 그대로이므로, 선택 목록/검색 커서/관련
+        찬양 표처럼 ID를 들고 있는 쪽이 같은 곡을 계속 가리킨다. 인덱스에 없는 ID는 건너뛴다.
+        반환값은 교체한 곡 수.
+        """
+        with self.write_lock:
+            records, typeahead = self._edit()
+            replaced = 0
+            for i, praise in enumerate(records):
+                entry = entries.get(praise['id'])
+                if entry is None:
+                    continue
+                entry['id'] = praise['id']
+                records[i] = entry
+                if typeahead is not None:
+                    typeahead.remove(praise['id'])
+                    typeahead.add(entry['id'], entry['title'], entry['title_normalized'])
+                replaced += 1
+            self._edited()
+            return replaced
+    
+    def extract_files(self, file_paths, max_workers=None, progress_callback=None):
+        """여러 파일을 병렬로 추출 (인덱스는 바꾸지 않으므로 잠금 없이 호출)
+        
+        progress_callback(done, total, file_path, ok, message)는 파일 하나가
+        끝날 때마다 작업 스레드에서 호출된다. 반환값은 입력 순서대로의
+        (찬양 데이터 또는 None, (file_path, ok, message)) 목록이다.
+        """
+        file_paths = [Path(p) for p in file_paths]
+        total = len(file_paths)
+        extracted = [None] * total
+        # 이번 추출의 가사 줄 공유 풀 (저장 후 레코드가 헤더만 남으면 함께 해제)
+        pool = StringPool()
+        
+        def extract(index):
+            file_path = file_paths[index]
+            if not file_path.exists():
+                return index, None, "파일이 존재하지 않습니다"
+            try:
+                entry = self.build_praise_entry(file_path, None, pool)
+            except Exception as e:
+                return index, None, extraction_error(e)
+            if not entry:
+                return index, None, NO_LYRICS
+            return index, entry, f"{len(entry['slides_text'])}개 슬라이드"
+        
+        # 압축 해제/XML 파싱은 GIL을 놓으므로 스레드로 병렬 추출
+        done = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for future in as_completed([executor.submit(extract, i) for i in range(total)]):
+                index, entry, message = future.result()
+                extracted[index] = (entry, (str(file_paths[index]), entry is not None, message))
+                done += 1
+                if progress_callback:
+                    progress_callback(done, total, str(file_paths[index]), entry is not None, message)
+        return extracted
+    
+    def add_files(self, file_paths, max_workers=None, progress_callback=None, save=False):
+        """여러 파일을 병렬로 추출한 뒤 한 번에 추가 (save이면 같은 스냅샷으로 저장까지)
+        
+        추출은 잠금 밖에서 하고 추가/저장할 때만 write_lock을 잡으므로, 추출하는
+        동안 다른 변경(삭제 등)이 기다리지 않는다. progress_callback은
+        extract_files와 같고, 반환값은 입력 순서대로의 (file_path, ok, message) 목록이다.
+        """
+        extracted = self.extract_files(file_paths, max_workers, progress_callback)
+        
+        # 입력 순서대로 ID를 부여하고 한 번에 반영
+        new_entries = [entry for entry, _ in extracted if entry]
+        with self.batch():
+            self.add_entries(new_entries)
+            if save:
+                self.save_to_json()
+        
+        logger.info("파일 추가 완료: 성공 %s개, 실패 %s개", len(new_entries), len(extracted) - len(new_entries))
+        return [result for _, result in extracted]
+    
     def save_to_json(self):
-        """JSON 파일에 저장"""
+        """인덱스(게시 전 초안이 있으면 초안)를 헤더/상세 세그먼트로 저장하고 새 스냅샷 게시
+        
+        저장 후 메모리에는 헤더만 남긴다 (상세는 필요할 때 세그먼트에서 로드).
+        파일은 임시 파일에 쓴 뒤 교체하므로 저장 중에도 이전 스냅샷으로 읽을 수 있다.
+        """
         try:
-            with open(self.output_json, 'w', encoding='utf-8') as f:
-                json.dump(self.praise_data, f, ensure_ascii=False, indent=2)
-            print(f"[OK] JSON 파일 저장됨: {self.output_json}")
+            with self.write_lock:
+                if self._draft is not None:
+                    records, typeahead = self._draft
+                else:
+                    records, typeahead = self.snapshot.praise_data, self.snapshot.typeahead
+                detail_file = self.store.open_detail() if self.store.detail_path.exists() else None
+                try:
+                    with span("write_segments", songs=len(records)):
+                        headers = self.store.write(
+                            records,
+                            lambda praise: self._read_praise_detail(praise, detail_file)
+                        )
+                finally:
+                    if detail_file:
+                        detail_file.close()
+                
+                praise_data = None
+                try:
+                    with span("write_binary_index"):
+                        self.write_binary(headers)
+                    praise_data = self.open_binary_index()
+                except OSError as e:
+                    # 윈도우에서 더 이전 스냅샷이 아직 그 파일을 매핑 중이면 교체할 수 없음
+                    # → 이번에는 레코드 목록으로 (바이너리 인덱스는 다음 저장/로드 때 다시 생성)
+                    logger.warning("바이너리 인덱스 교체 실패: %s", e)
+                if praise_data is None:
+                    praise_data = [SongRecord.from_dict(h) for h in headers]
+                # ID와 제목은 그대로이므로 자동완성은 이어서 사용
+                self._draft = None
+                snapshot = self.publish(praise_data, typeahead)
+                self.schedule_related(snapshot)
+            logger.info("인덱스 저장됨: %s", self.store.header_path)
             return True
         except Exception as e:
-            print(f"[ERROR] JSON 파일 저장 실패: {e}")
+            logger.error("인덱스 저장 실패: %s", e)
             return False
-
-def main():
-    """메인 함수"""
-    indexer = JSONPraiseIndexer()
     
-    # 인덱싱 실행
-    success = indexer.index_praise_files()
-    
-    if success:
-        print("\n인덱싱이 완료되었습니다!")
-        
-        # 테스트 검색
-        print("\n테스트 검색:")
-        test_results = indexer.search_praises("하나님", "title")
-        print(f"제목에 '하나님'이 포함된 찬양: {len(test_results)}개")
-        
-        for praise in test_results[:3]:  # 상위 3개만 출력
-            print(f"  - {praise['title']} ({len(praise['slides_text'])}개 슬라이드)")
-    else:
-        print("인덱싱에 실패했습니다.")
+    def export_to_json(self, output_path=None):
+        """기존 형식(가사/슬라이드 포함 전체)의 JSON으로 내보내기"""
+        output_path = Path(output_path) if output_path else self.output_json
+        try:
+            detail_file = self.store.open_detail() if self.store.detail_path.exists() else None
+            try:
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    f.write("[")
+                    for i, praise in enumerate(self.praise_data):
+                        slides_text = [dict(slide) for slide in self._read_praise_detail(praise, detail_file) or []]
+                        lines = []
+                        for slide in slides_text:
+                            lines.extend(slide['text_lines'])
+                        record = {
+                            "id": praise['id'],
+                            "filename": praise['filename'],
+                            "title": praise['title'],
+                            "file_path": praise['file_path'],
+                            "lyrics": "\n".join(lines),
+                            "slides_text": slides_text,
+                            "title_normalized": praise['title_normalized'],
+                            "lyrics_normalized": praise['lyrics_normalized']
+                        }
+                        f.write(",\n" if i else "\n")
+                        f.write(json.dumps(record, ensure_ascii=False, indent=2))
+                    f.write("\n]")
+            finally:
+                if detail_file:
+                    detail_file.close()
+            logger.info("JSON 내보내기 완료: %s", output_path)
+            return True
+        except Exception as e:
+            logger.error("JSON 내보내기 실패: %s", e)
+            return False
+
+def main(argv=None):
+    """명령줄 실행 (praise_cli와 같음, 인자가 없으면 전체 인덱싱)"""
+    from praise_cli import main as cli_main
+    argv = sys.argv[1:] if argv is None else argv
+    return cli_main(argv or ["-v", "index"])
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -8,6 +8,7 @@ temp.pptx의 모든 스타일을 정확히 복제
 import json
 import os
 import sys
+from collections.abc import Mapping
 from pathlib import Path
 from pptx import Presentation
 from pptx.util import Inches, Pt
@@ -19,8 +20,12 @@ from pptx.enum.dml import MSO_FILL
 from pptx.oxml.xmlchemy import OxmlElement
 import re
 
+from tracing import configure_from_env, get_logger, span
+
+logger = get_logger(__name__)
+
 class JSONPPTGeneratorFixed:
-    def __init__(self, json_file="praise_index.json", template_file="temp.pptx"):
+    def __init__(self, json_file="praise_index.json", template_file="temp.pptx", indexer=None):
         # 리소스 경로 헬퍼: 실행파일과 같은 폴더의 파일을 찾음
         def resource_path(relative: str) -> Path:
             if getattr(sys, 'frozen', False):
@@ -34,15 +39,18 @@ class JSONPPTGeneratorFixed:
         self.json_file = str(resource_path(json_file))
         self.template_file = str(resource_path(template_file))
         self.template_styles = {}
+        # 찬양 상세를 읽을 인덱서 (없으면 생성할 때마다 json_file 인덱스를 열어 필요한 곡만 로드)
+        self.indexer = indexer
         
         # 템플릿 스타일 추출
-        self.extract_template_style()
+        with span("template_load", template=self.template_file):
+            self.extract_template_style()
     
     def extract_template_style(self):
         """temp.pptx에서 모든 스타일 추출"""
         try:
             if not os.path.exists(self.template_file):
-                print(f"[WARNING] 템플릿 파일이 없습니다: {self.template_file}")
+                logger.warning("템플릿 파일이 없습니다: %s", self.template_file)
                 return
             
             template_prs = Presentation(self.template_file)
@@ -63,20 +71,19 @@ class JSONPPTGeneratorFixed:
             # 텍스트 스타일
             self.template_styles['text_styles'] = self.extract_text_styles(slide)
             
-            print(f"[OK] 템플릿 스타일 추출 완료")
-            print(f"  - 슬라이드 크기: {self.template_styles['slide_size']['width']} x {self.template_styles['slide_size']['height']}")
-            print(f"  - 배경 타입: {self.template_styles['background']['type']}")
-            print(f"  - 모양 수: {len(self.template_styles['shapes'])}")
-            print(f"  - 텍스트 스타일 수: {len(self.template_styles['text_styles'])}")
+            logger.info("템플릿 스타일 추출 완료 (슬라이드 크기: %s x %s, 배경 타입: %s, 모양 수: %s, 텍스트 스타일 수: %s)",
+                        self.template_styles['slide_size']['width'], self.template_styles['slide_size']['height'],
+                        self.template_styles['background']['type'], len(self.template_styles['shapes']),
+                        len(self.template_styles['text_styles']))
             
         except Exception as e:
-            print(f"[ERROR] 템플릿 스타일 추출 실패: {e}")
+            logger.error("템플릿 스타일 추출 실패: %s", e)
             self.template_styles = {}
     
     def extract_background(self, slide):
         """배경 스타일 추출 (이미지, 비디오, 그라디언트 지원)"""
         try:
-            print(f"[DEBUG] 배경 추출 시작")
+            logger.debug("배경 추출 시작")
             
             # 비디오 배경 확인
             video_bg = self.extract_video_background(slide)
@@ -91,25 +98,25 @@ class JSONPPTGeneratorFixed:
             # 일반 배경 확인
             if slide.background and slide.background.fill:
                 fill = slide.background.fill
-                print(f"[DEBUG] 배경 fill 타입: {getattr(fill, 'type', 'unknown')}")
+                logger.debug("배경 fill 타입: %s", getattr(fill, 'type', 'unknown'))
                 
                 # 단색 배경
                 if hasattr(fill, 'type') and fill.type == 1:  # SOLID
                     try:
                         if hasattr(fill, 'fore_color') and hasattr(fill.fore_color, 'rgb'):
                             color = str(fill.fore_color.rgb)
-                            print(f"[DEBUG] 단색 배경 발견: {color}")
+                            logger.debug("단색 배경 발견: %s", color)
                             return {'type': 'solid', 'color': color}
                         elif hasattr(fill, 'fore_color') and hasattr(fill.fore_color, 'theme_color'):
                             theme_color = str(fill.fore_color.theme_color)
-                            print(f"[DEBUG] 테마 색상 배경 발견: {theme_color}")
+                            logger.debug("테마 색상 배경 발견: %s", theme_color)
                             return {'type': 'theme', 'color': theme_color}
                     except Exception as e:
-                        print(f"[DEBUG] 색상 추출 실패: {e}")
+                        logger.debug("색상 추출 실패: %s", e)
                 
                 # 그라디언트 배경
                 elif hasattr(fill, 'type') and fill.type == 3:  # GRADIENT
-                    print(f"[DEBUG] 그라디언트 배경 발견")
+                    logger.debug("그라디언트 배경 발견")
                     return {
                         'type': 'gradient',
                         'gradient_type': 'linear',
@@ -120,11 +127,11 @@ class JSONPPTGeneratorFixed:
                         ]
                     }
             
-            print(f"[DEBUG] 기본 검은색 배경 사용")
+            logger.debug("기본 검은색 배경 사용")
             return {'type': 'solid', 'color': '000000'}
             
         except Exception as e:
-            print(f"[WARNING] 배경 스타일 추출 실패: {e}")
+            logger.warning("배경 스타일 추출 실패: %s", e)
             return {'type': 'solid', 'color': '000000'}
     
     def extract_video_background(self, slide):
@@ -160,20 +167,20 @@ class JSONPPTGeneratorFixed:
             
             return None
         except Exception as e:
-            print(f"[WARNING] 비디오 배경 추출 실패: {e}")
+            logger.warning("비디오 배경 추출 실패: %s", e)
             return None
     
     def extract_image_background(self, slide):
         """이미지 배경 추출"""
         try:
-            print(f"[DEBUG] 이미지 배경 추출 시작")
+            logger.debug("이미지 배경 추출 시작")
             
             # 슬라이드의 모든 모양에서 이미지 찾기
             for shape in slide.shapes:
                 if hasattr(shape, 'image') and shape.image:
                     try:
                         image_path = getattr(shape.image, 'filename', None)
-                        print(f"[DEBUG] 이미지 모양 발견: {image_path}")
+                        logger.debug("이미지 모양 발견: %s", image_path)
                         return {
                             'type': 'image',
                             'image_path': image_path,
@@ -183,14 +190,14 @@ class JSONPPTGeneratorFixed:
                             'height': shape.height
                         }
                     except Exception as e:
-                        print(f"[DEBUG] 이미지 정보 추출 실패: {e}")
+                        logger.debug("이미지 정보 추출 실패: %s", e)
             
             # 슬라이드 배경에서 이미지 찾기
             if hasattr(slide, 'background') and slide.background:
                 try:
                     fill = slide.background.fill
                     if hasattr(fill, 'type') and fill.type == 2:  # PICTURE
-                        print(f"[DEBUG] 배경 이미지 발견")
+                        logger.debug("배경 이미지 발견")
                         return {
                             'type': 'image',
                             'image_path': 'embedded_image',
@@ -200,13 +207,13 @@ class JSONPPTGeneratorFixed:
                             'height': slide.slide_height
                         }
                 except Exception as e:
-                    print(f"[DEBUG] 배경 이미지 추출 실패: {e}")
+                    logger.debug("배경 이미지 추출 실패: %s", e)
             
-            print(f"[DEBUG] 이미지 배경을 찾을 수 없음")
+            logger.debug("이미지 배경을 찾을 수 없음")
             return None
             
         except Exception as e:
-            print(f"[WARNING] 이미지 배경 추출 실패: {e}")
+            logger.warning("이미지 배경 추출 실패: %s", e)
             return None
     
     def extract_all_shapes(self, slide):
@@ -279,7 +286,7 @@ class JSONPPTGeneratorFixed:
                 
                 shapes.append(shape_info)
         except Exception as e:
-            print(f"[WARNING] 모양 추출 실패: {e}")
+            logger.warning("모양 추출 실패: %s", e)
         
         return shapes
     
@@ -336,7 +343,7 @@ class JSONPPTGeneratorFixed:
                                 }
                                 text_styles.append(style)
         except Exception as e:
-            print(f"[WARNING] 텍스트 스타일 추출 실패: {e}")
+            logger.warning("텍스트 스타일 추출 실패: %s", e)
         
         return text_styles
     
@@ -344,15 +351,16 @@ class JSONPPTGeneratorFixed:
         """선택된 찬양들로 PPT 생성"""
         try:
             if not self.template_styles:
-                print("[ERROR] 템플릿 스타일이 없습니다")
+                logger.error("템플릿 스타일이 없습니다")
                 return False
             
-            # JSON 데이터 로드
-            with open(self.json_file, 'r', encoding='utf-8') as f:
-                praise_data = json.load(f)
+            # 선택된 찬양의 상세(슬라이드 텍스트) 로드
+            with span("resolve_songs", songs=len(selected_praises)):
+                praise_details = self.load_praise_details(selected_praises)
             
             # 새 프레젠테이션 생성: 템플릿을 기반으로 생성하여 테마/배경을 그대로 사용
-            prs = Presentation(self.template_file)
+            with span("template_open"):
+                prs = Presentation(self.template_file)
             
             # 템플릿의 기존 슬라이드들을 모두 제거 (템플릿 내용이 포함되지 않도록)
             while len(prs.slides) > 0:
@@ -360,59 +368,53 @@ class JSONPPTGeneratorFixed:
                 prs.part.drop_rel(slide_id)
                 del prs.slides._sldIdLst[0]
             
-            print(f"[DEBUG] 템플릿 슬라이드 제거 완료, 새 슬라이드 생성 시작")
+            logger.debug("템플릿 슬라이드 제거 완료, 새 슬라이드 생성 시작")
             
             # 슬라이드 크기는 템플릿에 이미 반영되어 있으므로 별도 설정 불필요
             
             # 각 찬양에 대해 슬라이드 생성
-            for praise_info in selected_praises:
-                praise_title = praise_info['title']
-                
-                # JSON에서 해당 찬양 찾기
-                praise_data_item = None
-                for item in praise_data:
-                    if item.get('title') == praise_title:
-                        praise_data_item = item
-                        break
-                
-                if not praise_data_item:
-                    print(f"[WARNING] 찬양 데이터를 찾을 수 없습니다: {praise_title}")
-                    continue
-                
-                # 각 찬양마다 맨 앞에 빈 슬라이드 추가 (구분용)
-                self.create_separator_slide(prs)
-                
-                # 슬라이드별로 생성
-                slides_text = praise_data_item.get('slides_text', [])
-                if isinstance(slides_text, str):
-                    try:
-                        slides_text = json.loads(slides_text)
-                    except:
-                        slides_text = []
-                
-                if not slides_text:
-                    # slides_text가 없으면 전체 가사로 1개 슬라이드 생성
-                    lyrics = praise_data_item.get('lyrics', '')
-                    if lyrics:
-                        # 제어문자/특수마커 정리 후 사용
-                        lyrics_clean = self._sanitize_text(lyrics)
-                        # 가사만 사용 (제목 추가하지 않음)
-                        lyrics_lines = [line for line in lyrics_clean.split('\n')]
-                        self.create_slide_with_style(prs, praise_title, lyrics_lines)
-                else:
-                    # 각 슬라이드별로 생성
-                    for i, slide_text in enumerate(slides_text):
-                        if isinstance(slide_text, dict) and 'text' in slide_text:
-                            text_content = slide_text['text']
-                        elif isinstance(slide_text, str):
-                            text_content = slide_text
-                        else:
-                            continue
-                        
-                        if text_content.strip():
-                            # 모든 슬라이드에 가사만 표시 (제목 추가하지 않음)
-                            text_clean = self._sanitize_text(text_content)
-                            self.create_slide_with_style(prs, praise_title, [line for line in text_clean.split('\n')])
+            with span("build_slides", songs=len(selected_praises)):
+                for praise_info, praise_data_item in zip(selected_praises, praise_details):
+                    praise_title = praise_info['title']
+                    
+                    if not praise_data_item:
+                        logger.warning("찬양 데이터를 찾을 수 없습니다: %s", praise_title)
+                        continue
+                    
+                    # 각 찬양마다 맨 앞에 빈 슬라이드 추가 (구분용)
+                    self.create_separator_slide(prs)
+                    
+                    # 슬라이드별로 생성
+                    slides_text = praise_data_item.get('slides_text', [])
+                    if isinstance(slides_text, str):
+                        try:
+                            slides_text = json.loads(slides_text)
+                        except:
+                            slides_text = []
+                    
+                    if not slides_text:
+                        # slides_text가 없으면 전체 가사로 1개 슬라이드 생성
+                        lyrics = praise_data_item.get('lyrics', '')
+                        if lyrics:
+                            # 제어문자/특수마커 정리 후 사용
+                            lyrics_clean = self._sanitize_text(lyrics)
+                            # 가사만 사용 (제목 추가하지 않음)
+                            lyrics_lines = [line for line in lyrics_clean.split('\n')]
+                            self.create_slide_with_style(prs, praise_title, lyrics_lines)
+                    else:
+                        # 각 슬라이드별로 생성
+                        for i, slide_text in enumerate(slides_text):
+                            if isinstance(slide_text, Mapping) and 'text' in slide_text:
+                                text_content = slide_text['text']
+                            elif isinstance(slide_text, str):
+                                text_content = slide_text
+                            else:
+                                continue
+                            
+                            if text_content.strip():
+                                # 모든 슬라이드에 가사만 표시 (제목 추가하지 않음)
+                                text_clean = self._sanitize_text(text_content)
+                                self.create_slide_with_style(prs, praise_title, [line for line in text_clean.split('\n')])
             
             # PPT 저장 (재시도 로직 포함)
             import time
@@ -420,15 +422,16 @@ class JSONPPTGeneratorFixed:
             
             for attempt in range(max_retries):
                 try:
-                    prs.save(output_file)
-                    print(f"[OK] PPT 생성 완료: {output_file}")
+                    with span("save", file=output_file):
+                        prs.save(output_file)
+                    logger.info("PPT 생성 완료: %s", output_file)
                     return True
                 except PermissionError as e:
                     if attempt < max_retries - 1:
-                        print(f"[WARNING] 파일 저장 실패 (시도 {attempt + 1}/{max_retries}): {e}")
+                        logger.warning("파일 저장 실패 (시도 %s/%s): %s", attempt + 1, max_retries, e)
                         time.sleep(1)  # 1초 대기 후 재시도
                     else:
-                        print(f"[ERROR] 파일 저장 최종 실패: {e}")
+                        logger.error("파일 저장 최종 실패: %s", e)
                         # 대체 파일명으로 시도
                         import os
                         base_name = os.path.splitext(output_file)[0]
@@ -437,21 +440,46 @@ class JSONPPTGeneratorFixed:
                         alternative_file = f"{base_name}_{timestamp}{extension}"
                         try:
                             prs.save(alternative_file)
-                            print(f"[OK] 대체 파일로 저장 완료: {alternative_file}")
+                            logger.info("대체 파일로 저장 완료: %s", alternative_file)
                             return True
                         except Exception as alt_e:
-                            print(f"[ERROR] 대체 파일 저장도 실패: {alt_e}")
+                            logger.error("대체 파일 저장도 실패: %s", alt_e)
                             return False
                 except Exception as e:
-                    print(f"[ERROR] PPT 저장 실패: {e}")
+                    logger.error("PPT 저장 실패: %s", e)
                     return False
             
         except Exception as e:
-            print(f"[ERROR] PPT 생성 실패: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("PPT 생성 실패: %s", e)
             return False
 
+    def load_praise_details(self, selected_praises):
+        """선택된 찬양들의 상세 데이터(slides_text) 로드
+        
+        ID(제목/파일명이 다르면 파일명, 제목)로 필요한 곡의 상세만 읽는다.
+        인덱서 없이 만든 생성기는 json_file 인덱스를 인덱서로 열어 읽으므로, 헤더보다
+        오래된 바이너리 인덱스나 예전 형식 헤더를 그대로 쓰지 않는다.
+        찾지 못한 찬양은 None.
+        """
+        indexer = self.indexer
+        if indexer is None:
+            from json_indexer import JSONPraiseIndexer
+            
+            indexer = JSONPraiseIndexer(output_json=self.json_file)
+            if not indexer.load_from_json():
+                logger.error("인덱스를 불러올 수 없습니다: %s", self.json_file)
+                return [None] * len(selected_praises)
+        
+        # 생성 도중 인덱싱/저장이 있어도 시작할 때의 스냅샷에서 읽음
+        snapshot = indexer.snapshot
+        details = []
+        for praise_info in selected_praises:
+            # 선택한 뒤 다시 인덱싱되었어도 다른 곡의 가사가 들어가지 않도록 제목/파일명 확인
+            praise = indexer.find_selected(praise_info, snapshot)
+            slides_text = indexer.get_praise_detail(praise['id'], snapshot) if praise else None
+            details.append({'slides_text': slides_text} if slides_text is not None else None)
+        return details
+    
     def _sanitize_text(self, text: str) -> str:
         """가사 텍스트에 섞인 특수 제어/마커를 제거·정규화한다.
 
@@ -487,10 +515,10 @@ class JSONPPTGeneratorFixed:
             slide = prs.slides.add_slide(slide_layout)
             
             # 템플릿 기반 배경을 그대로 사용 (별도 적용 불필요)
-            print(f"[DEBUG] 구분 슬라이드 생성 완료")
+            logger.debug("구분 슬라이드 생성 완료")
             
         except Exception as e:
-            print(f"[ERROR] 구분 슬라이드 생성 실패: {e}")
+            logger.error("구분 슬라이드 생성 실패: %s", e)
     
     def create_slide_with_style(self, prs, title, lyrics_list):
         """템플릿 스타일을 적용한 슬라이드 생성"""
@@ -508,37 +536,37 @@ class JSONPPTGeneratorFixed:
             self.add_lyrics_textbox(slide, lyrics_list)
             
         except Exception as e:
-            print(f"[ERROR] 슬라이드 생성 실패: {e}")
+            logger.error("슬라이드 생성 실패: %s", e)
     
     def apply_background(self, slide):
         """배경 스타일 적용 (이미지, 비디오, 그라디언트 지원)"""
         try:
             background_info = self.template_styles['background']
-            print(f"[DEBUG] 배경 적용 시작: {background_info}")
+            logger.debug("배경 적용 시작: %s", background_info)
             
             bg_type = background_info.get('type', 'solid')
             
             if bg_type == 'image':
-                print(f"[DEBUG] 이미지 배경 적용")
+                logger.debug("이미지 배경 적용")
                 success = self.apply_image_background(slide, background_info)
                 if not success:
-                    print(f"[DEBUG] 이미지 배경 적용 실패, 단색 배경으로 대체")
+                    logger.debug("이미지 배경 적용 실패, 단색 배경으로 대체")
                     self.apply_solid_background(slide)
             elif bg_type == 'video':
-                print(f"[DEBUG] 비디오 배경 적용")
+                logger.debug("비디오 배경 적용")
                 self.apply_video_background(slide)
             elif bg_type == 'gradient':
-                print(f"[DEBUG] 그라데이션 배경 적용")
+                logger.debug("그라데이션 배경 적용")
                 self.apply_gradient_background(slide, background_info)
             elif bg_type == 'theme':
-                print(f"[DEBUG] 테마 색상 배경 적용")
+                logger.debug("테마 색상 배경 적용")
                 self.apply_theme_background(slide, background_info)
             else:
-                print(f"[DEBUG] 단색 배경 적용")
+                logger.debug("단색 배경 적용")
                 self.apply_solid_background(slide, background_info)
                 
         except Exception as e:
-            print(f"[WARNING] 배경 적용 실패: {e}")
+            logger.warning("배경 적용 실패: %s", e)
             self.apply_solid_background(slide)
     
     def apply_video_background(self, slide):
@@ -554,18 +582,18 @@ class JSONPPTGeneratorFixed:
                         video_info['left'], video_info['top'],
                         video_info['width'], video_info['height']
                     )
-                    print(f"[OK] 비디오 배경 적용: {video_info['video_path']}")
+                    logger.info("비디오 배경 적용: %s", video_info['video_path'])
                 except Exception as e:
-                    print(f"[WARNING] 비디오 파일 로드 실패: {e}")
+                    logger.warning("비디오 파일 로드 실패: %s", e)
                     # 비디오 로드 실패 시 검은색 배경으로 대체
                     self.apply_solid_background(slide)
             else:
                 # 임베디드 비디오인 경우 (복사 불가)
-                print(f"[WARNING] 임베디드 비디오는 복사할 수 없습니다. 단색 배경으로 대체합니다.")
+                logger.warning("임베디드 비디오는 복사할 수 없습니다. 단색 배경으로 대체합니다.")
                 self.apply_solid_background(slide)
                 
         except Exception as e:
-            print(f"[WARNING] 비디오 배경 적용 실패: {e}")
+            logger.warning("비디오 배경 적용 실패: %s", e)
             self.apply_solid_background(slide)
     
     def apply_image_background(self, slide, background_info):
@@ -573,7 +601,7 @@ class JSONPPTGeneratorFixed:
         try:
             image_path = background_info.get('image_path')
             if not image_path or image_path == 'embedded_image':
-                print(f"[DEBUG] 임베디드 이미지는 복사할 수 없음")
+                logger.debug("임베디드 이미지는 복사할 수 없음")
                 return False
             
             # 외부 이미지 파일이 있는 경우
@@ -587,17 +615,17 @@ class JSONPPTGeneratorFixed:
                         background_info.get('width', slide.slide_width),
                         background_info.get('height', slide.slide_height)
                     )
-                    print(f"[OK] 이미지 배경 적용 성공: {image_path}")
+                    logger.info("이미지 배경 적용 성공: %s", image_path)
                     return True
                 except Exception as e:
-                    print(f"[WARNING] 이미지 파일 로드 실패: {e}")
+                    logger.warning("이미지 파일 로드 실패: %s", e)
                     return False
             else:
-                print(f"[WARNING] 이미지 파일을 찾을 수 없음: {image_path}")
+                logger.warning("이미지 파일을 찾을 수 없음: %s", image_path)
                 return False
                 
         except Exception as e:
-            print(f"[WARNING] 이미지 배경 적용 실패: {e}")
+            logger.warning("이미지 배경 적용 실패: %s", e)
             return False
     
     def apply_gradient_background(self, slide, background_info):
@@ -607,9 +635,9 @@ class JSONPPTGeneratorFixed:
             fill = background.fill
             fill.solid()  # 그라데이션은 복잡하므로 단색으로 대체
             fill.fore_color.rgb = RGBColor(0, 0, 0)  # 검은색
-            print(f"[DEBUG] 그라데이션을 단색으로 대체")
+            logger.debug("그라데이션을 단색으로 대체")
         except Exception as e:
-            print(f"[WARNING] 그라데이션 배경 적용 실패: {e}")
+            logger.warning("그라데이션 배경 적용 실패: %s", e)
     
     def apply_theme_background(self, slide, background_info):
         """테마 색상 배경 적용"""
@@ -619,9 +647,9 @@ class JSONPPTGeneratorFixed:
             fill.solid()
             # 테마 색상을 RGB로 변환 (기본값: 검은색)
             fill.fore_color.rgb = RGBColor(0, 0, 0)
-            print(f"[DEBUG] 테마 색상을 단색으로 대체")
+            logger.debug("테마 색상을 단색으로 대체")
         except Exception as e:
-            print(f"[WARNING] 테마 배경 적용 실패: {e}")
+            logger.warning("테마 배경 적용 실패: %s", e)
     
     def apply_solid_background(self, slide, background_info=None):
         """단색 배경 적용"""
@@ -640,16 +668,16 @@ class JSONPPTGeneratorFixed:
                     g = int(color[2:4], 16)
                     b = int(color[4:6], 16)
                     fill.fore_color.rgb = RGBColor(r, g, b)
-                    print(f"[DEBUG] 단색 배경 적용: RGB({r}, {g}, {b})")
+                    logger.debug("단색 배경 적용: RGB(%s, %s, %s)", r, g, b)
                 except Exception as e:
-                    print(f"[DEBUG] 색상 변환 실패, 검은색 사용: {e}")
+                    logger.debug("색상 변환 실패, 검은색 사용: %s", e)
                     fill.fore_color.rgb = RGBColor(0, 0, 0)
             else:
                 fill.fore_color.rgb = RGBColor(0, 0, 0)  # 검은색
-                print(f"[DEBUG] 기본 검은색 배경 적용")
+                logger.debug("기본 검은색 배경 적용")
                 
         except Exception as e:
-            print(f"[WARNING] 단색 배경 적용 실패: {e}")
+            logger.warning("단색 배경 적용 실패: %s", e)
     
     def add_decorative_elements(self, slide):
         """장식 요소 추가 (템플릿에서 동적 추출)"""
@@ -664,9 +692,9 @@ class JSONPPTGeneratorFixed:
                         # 커넥터 재생성
                         self.recreate_shape(slide, shape_info)
                     except Exception as e:
-                        print(f"[WARNING] 커넥터 재생성 실패: {e}")
+                        logger.warning("커넥터 재생성 실패: %s", e)
         except Exception as e:
-            print(f"[WARNING] 장식 요소 추가 실패: {e}")
+            logger.warning("장식 요소 추가 실패: %s", e)
     
     def recreate_shape(self, slide, shape_info):
         """모양 재생성"""
@@ -699,7 +727,7 @@ class JSONPPTGeneratorFixed:
                         connector.line.width = Pt(2)
                         
         except Exception as e:
-            print(f"[WARNING] 모양 재생성 실패: {e}")
+            logger.warning("모양 재생성 실패: %s", e)
     
     
     def apply_text_style(self, run, style):
@@ -708,12 +736,12 @@ class JSONPPTGeneratorFixed:
             # 폰트 이름
             if 'font_name' in style and style['font_name']:
                 run.font.name = style['font_name']
-                print(f"[DEBUG] 폰트 이름 적용: {style['font_name']}")
+                logger.debug("폰트 이름 적용: %s", style['font_name'])
             
             # 폰트 크기
             if 'font_size' in style and style['font_size']:
                 run.font.size = style['font_size']
-                print(f"[DEBUG] 폰트 크기 적용: {style['font_size']}")
+                logger.debug("폰트 크기 적용: %s", style['font_size'])
             
             # 폰트 스타일
             if 'bold' in style:
@@ -738,7 +766,7 @@ class JSONPPTGeneratorFixed:
                             g = int(rgb_values[1].strip())
                             b = int(rgb_values[2].strip())
                             run.font.color.rgb = RGBColor(r, g, b)
-                            print(f"[DEBUG] RGB 색상 적용: ({r}, {g}, {b})")
+                            logger.debug("RGB 색상 적용: (%s, %s, %s)", r, g, b)
                             return
                     
                     # HEX 색상 처리
@@ -747,19 +775,19 @@ class JSONPPTGeneratorFixed:
                         g = int(color[2:4], 16)
                         b = int(color[4:6], 16)
                         run.font.color.rgb = RGBColor(r, g, b)
-                        print(f"[DEBUG] HEX 색상 적용: RGB({r}, {g}, {b})")
+                        logger.debug("HEX 색상 적용: RGB(%s, %s, %s)", r, g, b)
                     else:
                         run.font.color.rgb = RGBColor(255, 255, 255)
-                        print(f"[DEBUG] 색상 형식 오류, 흰색 사용")
+                        logger.debug("색상 형식 오류, 흰색 사용")
                 except Exception as e:
-                    print(f"[DEBUG] 색상 적용 실패: {e}, 흰색 사용")
+                    logger.debug("색상 적용 실패: %s, 흰색 사용", e)
                     run.font.color.rgb = RGBColor(255, 255, 255)
             else:
                 run.font.color.rgb = RGBColor(255, 255, 255)
-                print(f"[DEBUG] 기본 흰색 적용")
+                logger.debug("기본 흰색 적용")
                 
         except Exception as e:
-            print(f"[WARNING] 텍스트 스타일 적용 실패: {e}")
+            logger.warning("텍스트 스타일 적용 실패: %s", e)
             try:
                 run.font.color.rgb = RGBColor(255, 255, 255)
             except:
@@ -769,12 +797,12 @@ class JSONPPTGeneratorFixed:
     def add_lyrics_textbox(self, slide, lyrics_list):
         """가사 텍스트 박스 추가 (개선된 버전)"""
         try:
-            print(f"[DEBUG] 가사 텍스트박스 추가 시작")
+            logger.debug("가사 텍스트박스 추가 시작")
             
             # 템플릿에서 가사 텍스트박스 스타일 찾기
             lyrics_style = self.find_lyrics_style()
             if lyrics_style:
-                print(f"[DEBUG] 템플릿 스타일 사용")
+                logger.debug("템플릿 스타일 사용")
                 # 템플릿 스타일 적용
                 textbox = slide.shapes.add_textbox(
                     lyrics_style['left'], lyrics_style['top'],
@@ -817,12 +845,12 @@ class JSONPPTGeneratorFixed:
                     text_frame.margin_top = tf.get('margin_top', 0)
                     text_frame.margin_bottom = tf.get('margin_bottom', 0)
             else:
-                print(f"[DEBUG] 기본 스타일 사용")
+                logger.debug("기본 스타일 사용")
                 # 기본 가사 텍스트박스
                 self.add_default_lyrics_textbox(slide, lyrics_list)
                 
         except Exception as e:
-            print(f"[ERROR] 가사 텍스트 박스 추가 실패: {e}")
+            logger.error("가사 텍스트 박스 추가 실패: %s", e)
     
     def find_lyrics_style(self):
         """템플릿에서 가사 텍스트박스 스타일 찾기"""
@@ -835,18 +863,18 @@ class JSONPPTGeneratorFixed:
                 if 'text' in shape_info and shape_info['text'].strip():
                     # 제목이 아닌 텍스트박스 (더 큰 크기)
                     if shape_info.get('width', 0) > 5000000:  # 5cm 이상
-                        print(f"[DEBUG] 가사 스타일 발견: {shape_info.get('width', 0)}")
+                        logger.debug("가사 스타일 발견: %s", shape_info.get('width', 0))
                         return shape_info
-            print(f"[DEBUG] 가사 스타일을 찾을 수 없음")
+            logger.debug("가사 스타일을 찾을 수 없음")
             return None
         except Exception as e:
-            print(f"[WARNING] 가사 스타일 찾기 실패: {e}")
+            logger.warning("가사 스타일 찾기 실패: %s", e)
             return None
     
     def add_default_lyrics_textbox(self, slide, lyrics_list):
         """기본 가사 텍스트박스 추가 (30cm x 16cm) - 개선된 버전"""
         try:
-            print(f"[DEBUG] 기본 가사 텍스트박스 생성 시작")
+            logger.debug("기본 가사 텍스트박스 생성 시작")
             
             # 슬라이드 크기 기준으로 중앙 배치
             slide_width = self.template_styles.get('slide_size', {}).get('width', 12192000)
@@ -858,7 +886,7 @@ class JSONPPTGeneratorFixed:
             left = (slide_width - width) // 2
             top = (slide_height - height) // 2
             
-            print(f"[DEBUG] 텍스트박스 크기: {width}x{height}, 위치: ({left}, {top})")
+            logger.debug("텍스트박스 크기: %sx%s, 위치: (%s, %s)", width, height, left, top)
             
             textbox = slide.shapes.add_textbox(left, top, width, height)
             text_frame = textbox.text_frame
@@ -892,14 +920,15 @@ class JSONPPTGeneratorFixed:
                     else:
                         p.alignment = PP_ALIGN.CENTER
                     
-                    print(f"[DEBUG] 가사 라인 추가: {lyrics[:20]}...")
+                    logger.debug("가사 라인 추가: %s...", lyrics[:20])
             
-            print(f"[DEBUG] 기본 가사 텍스트박스 생성 완료")
+            logger.debug("기본 가사 텍스트박스 생성 완료")
                 
         except Exception as e:
-            print(f"[ERROR] 기본 가사 텍스트 박스 추가 실패: {e}")
+            logger.error("기본 가사 텍스트 박스 추가 실패: %s", e)
 
 if __name__ == "__main__":
+    configure_from_env(default_level="INFO")
     # 테스트
     generator = JSONPPTGeneratorFixed(
         json_file="praise_index.json",
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON Lines 찬양 인덱스 (praise_index.jsonl)
+
+한 줄에 찬양 하나(기존 praise_index.json의 레코드와 같은 형식, 원본 파일의
+수정 시각 mtime_ns와 크기 size 포함)를 기록한다.
+인덱싱 중 곡을 추출할 때마다 바로 한 줄씩 쓰므로 메모리에 전체 목록을
+모아 둘 필요가 없고, 중간에 중단되면 마지막으로 온전히 기록된 줄부터
+이어서 인덱싱할 수 있다. 인덱싱이 끝나면 마지막 줄에 완료 표시를 남긴다.
+"""
+
+import json
+import os
+from pathlib import Path
+
+# 인덱싱 완료 표시 줄 (레코드가 아니므로 읽을 때 건너뜀)
+COMPLETE_MARKER = {"_complete": True}
+
+
+def iter_jsonl_index(path):
+    """JSON Lines 인덱스를 한 곡씩 읽기 (깨진 마지막 줄과 완료 표시는 건너뜀)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.endswith("\n"):
+                # 쓰다가 중단된 마지막 줄
+                return
+            try:
+                record = json.loads(line)
+            except ValueError:
+                return
+            if record.get("_complete"):
+                continue
+            yield record
+
+
+class JsonlIndexWriter:
+    """찬양을 한 줄씩 추가하는 JSON Lines 인덱스 작성기
+
+    resume=True이면 완료 표시가 없는(중단된) 기존 파일을 이어서 쓴다.
+    이미 기록된 파일명(done_files)과 마지막 ID(last_id)를 알려 주고,
+    깨진 마지막 줄은 잘라낸다. 완료된 파일이거나 resume=False이면 새로 쓴다.
+    is_current(레코드)가 False인 줄(중단 뒤에 지워졌거나 바뀐 파일)은 지우고
+    그 수를 dropped로 알려 주므로, 바뀐 파일은 다시 추출하게 된다.
+    """
+
+    def __init__(self, path, resume=True, is_current=None):
+        self.path = Path(path)
+        self.done_files = set()
+        self.last_id = 0
+        self.count = 0
+        self.dropped = 0
+
+        valid_end = self._scan_existing(is_current) if resume and self.path.exists() else None
+        if valid_end is None:
+            self._file = open(self.path, 'wb')
+        else:
+            self._file = open(self.path, 'r+b')
+            self._file.seek(valid_end)
+            self._file.truncate()
+
+    def _scan_existing(self, is_current):
+        """기존 파일에서 온전히 기록된 부분의 끝 위치 확인 (새로 써야 하면 None)"""
+        valid_end = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line.decode('utf-8'))
+                except ValueError:
+                    break
+                if record.get("_complete"):
+                    # 이전 인덱싱이 끝까지 완료됨 → 새로 시작
+                    self.done_files.clear()
+                    self.last_id = 0
+                    self.count = 0
+                    self.dropped = 0
+                    return None
+                valid_end += len(line)
+                if is_current is not None and not is_current(record):
+                    self.dropped += 1
+                    continue
+                self.done_files.add(record["filename"])
+                self.last_id = max(self.last_id, record["id"])
+                self.count += 1
+        if self.dropped:
+            return self._drop_stale(valid_end)
+        return valid_end
+
+    def _drop_stale(self, valid_end):
+        """done_files에 없는 줄을 뺀 파일로 교체 (한 줄씩 복사, 새 끝 위치 반환)"""
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(self.path, 'rb') as src, open(tmp_path, 'wb') as dst:
+            position = 0
+            for line in src:
+                if position >= valid_end:
+                    break
+                position += len(line)
+                if json.loads(line.decode('utf-8'))["filename"] in self.done_files:
+                    dst.write(line)
+            end = dst.tell()
+        os.replace(tmp_path, self.path)
+        return end
+
+    @property
+    def resumed(self):
+        """이어서 쓰는 중인지 여부"""
+        return self.count > 0
+
+    def write(self, record):
+        """찬양 하나 기록 (바로 디스크로 내보냄)"""
+        data = record.to_dict() if hasattr(record, "to_dict") else dict(record)
+        line = json.dumps(data, ensure_ascii=False) + "\n"
+        self._file.write(line.encode('utf-8'))
+        self._file.flush()
+        self.done_files.add(record["filename"])
+        self.last_id = max(self.last_id, record["id"])
+        self.count += 1
+
+    def complete(self):
+        """완료 표시를 남기고 닫기"""
+        self._file.write((json.dumps(COMPLETE_MARKER) + "\n").encode('utf-8'))
+        self.close()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
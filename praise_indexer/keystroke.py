@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+한글 → 두벌식 자판 키 입력 형태 변환
+
+한/영 전환을 잊고 영문 상태로 "하나님"을 치면 "gksksla"가 입력된다.
+인덱싱할 때 제목/가사의 키 입력 형태를 미리 만들어 두면 이런 검색어도
+변환 없이 그대로 부분 문자열 검색으로 찾을 수 있다.
+검색어는 소문자로 정규화되므로 Shift 키(ㄲ→R 등)도 소문자로 저장한다.
+"""
+
+_HANGUL_FIRST = 0xAC00
+_HANGUL_LAST = 0xD7A3
+
+# 초성 19자
+_CHOSUNG_KEYS = (
+    "r", "r", "s", "e", "e", "f", "a", "q", "q", "t",
+    "t", "d", "w", "w", "c", "z", "x", "v", "g",
+)
+# 중성 21자 (겹모음은 두 키)
+_JUNGSUNG_KEYS = (
+    "k", "o", "i", "o", "j", "p", "u", "p", "h", "hk",
+    "ho", "hl", "y", "n", "nj", "np", "nl", "b", "m", "ml", "l",
+)
+# 종성 28자 (0번은 받침 없음, 겹받침은 두 키)
+_JONGSUNG_KEYS = (
+    "", "r", "r", "rt", "s", "sw", "sg", "e", "f", "fr",
+    "fa", "fq", "ft", "fx", "fv", "fg", "a", "q", "qt", "t",
+    "t", "d", "w", "c", "z", "x", "v", "g",
+)
+# 호환용 자모 (ㄱ U+3131 ~ ㅣ U+3163)
+_COMPAT_JAMO_KEYS = (
+    "r", "r", "rt", "s", "sw", "sg", "e", "e", "f", "fr",
+    "fa", "fq", "ft", "fx", "fv", "fg", "a", "q", "q", "qt",
+    "t", "t", "d", "w", "w", "c", "z", "x", "v", "g",
+    "k", "o", "i", "o", "j", "p", "u", "p", "h", "hk",
+    "ho", "hl", "y", "n", "nj", "np", "nl", "b", "m", "ml", "l",
+)
+_COMPAT_JAMO_FIRST = 0x3131
+
+# 검색 타입별 키 입력 형태 필드와 점수 (정규화된 텍스트 일치보다 낮은 순위)
+KEYSTROKE_SCORES = {
+    "title": (("title_qwerty", 40),),
+    "lyrics": (("lyrics_qwerty", 40),),
+    "both": (("title_qwerty", 20), ("lyrics_qwerty", 20)),
+}
+
+
+def to_qwerty(text):
+    """한글을 두벌식 키 입력 형태로 (한글이 아닌 글자는 그대로)
+
+    한글이 하나도 없으면 정규화된 텍스트와 같으므로 빈 문자열을 돌려준다.
+    """
+    keys = []
+    has_hangul = False
+    for char in text:
+        code = ord(char)
+        if _HANGUL_FIRST <= code <= _HANGUL_LAST:
+            has_hangul = True
+            offset = code - _HANGUL_FIRST
+            keys.append(_CHOSUNG_KEYS[offset // 588])
+            keys.append(_JUNGSUNG_KEYS[(offset % 588) // 28])
+            keys.append(_JONGSUNG_KEYS[offset % 28])
+        elif 0 <= code - _COMPAT_JAMO_FIRST < len(_COMPAT_JAMO_KEYS):
+            has_hangul = True
+            keys.append(_COMPAT_JAMO_KEYS[code - _COMPAT_JAMO_FIRST])
+        else:
+            keys.append(char)
+    return "".join(keys) if has_hangul else ""
+
+
+def is_keystroke_query(query_normalized):
+    """영문 자판 상태로 입력한 한글일 수 있는 검색어인지 (영문자만)"""
+    return len(query_normalized) >= 2 and query_normalized.isascii() and query_normalized.isalpha()
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+인덱스/PPT 생성 메모리 사용량 보고
+
+tracemalloc을 켠 채로 실제 사용 순서대로 실행하며 단계마다 최대(peak)
+메모리와 단계가 끝난 뒤 남아 있는(retained) 메모리를 잰다.
+1. 인덱스 로드 (load_from_json)
+2. 대표 검색 (타입 × 검색어 길이, 자동완성, 일치 슬라이드)
+3. 템플릿 로드 (PPT 생성기 생성)
+4. PPT 생성 (저장 직전의 메모리도 따로 기록)
+
+할당 위치(traceback)로 메모리를 구성 요소별로 나눈다.
+- praise_data_records: 찬양 레코드 (compact_store / 인덱스 파일 읽기)
+- search_structures: 검색 버퍼, 자동완성, 콘티 찾기 등 검색용 구조
+- python_pptx: python-pptx / lxml 객체
+- other: 그 밖의 할당 (검색 결과 캐시 등)
+정규화된 문자열(검색용 정규화/키 입력 형태)과 템플릿 미디어는 객체 크기를
+직접 세어 따로 보고하고, mmap 바이너리 인덱스는 파이썬 힙 밖이므로 매핑된
+바이트 수로 보고한다.
+
+    python memory_profile.py                          # 기본 인덱스 (praise_index.json)
+    python memory_profile.py --sizes 100,1000,10000   # benchmark.py의 가짜 라이브러리
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+# 구성 요소 → 할당 위치 파일 (가장 안쪽 프레임부터 처음 일치하는 것)
+COMPONENT_FILES = (
+    ("python_pptx", (f"{os.sep}pptx{os.sep}", f"{os.sep}lxml{os.sep}")),
+    ("praise_data_records", ("compact_store.py", "json_index_store.py", "binary_index.py", "jsonl_index.py")),
+    ("search_structures", ("scan_index.py", "title_typeahead.py", "setlist_resolver.py",
+                           "query_parser.py", "search_hits.py", "keystroke.py")),
+)
+COMPONENTS = tuple(name for name, _ in COMPONENT_FILES) + ("other",)
+# 정규화된 문자열 필드
+NORMALIZED_FIELDS = ("title_normalized", "lyrics_normalized", "title_qwerty", "lyrics_qwerty")
+# 구성 요소 분류에 쓰는 traceback 깊이
+TRACE_FRAMES = 30
+DEFAULT_DECK_SONGS = 50
+SEARCH_QUERY_LENGTHS = (1, 2, 4)
+SEARCH_QUERIES_PER_CASE = 5
+
+
+def classify(traceback):
+    """할당 traceback → 구성 요소 이름"""
+    for frame in reversed(traceback):
+        filename = frame.filename
+        for component, patterns in COMPONENT_FILES:
+            if any(pattern in filename for pattern in patterns):
+                return component
+    return "other"
+
+
+def component_sizes(snapshot):
+    """스냅샷의 구성 요소별 바이트 수"""
+    sizes = dict.fromkeys(COMPONENTS, 0)
+    for stat in snapshot.statistics("traceback"):
+        sizes[classify(stat.traceback)] += stat.size
+    return sizes
+
+
+def _take_snapshot():
+    gc.collect()
+    return tracemalloc.take_snapshot()
+
+
+class PhaseProfiler:
+    """단계별 peak / retained 측정"""
+
+    def __init__(self):
+        self.phases = []
+        self.baseline = None
+
+    def start(self):
+        tracemalloc.start(TRACE_FRAMES)
+        self.baseline = component_sizes(_take_snapshot())
+
+    def stop(self):
+        tracemalloc.stop()
+
+    @contextmanager
+    def phase(self, name):
+        gc.collect()
+        before = component_sizes(_take_snapshot())
+        current_before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        entry = {"name": name}
+        yield entry
+        peak = tracemalloc.get_traced_memory()[1]
+        after = component_sizes(_take_snapshot())
+        entry["peak_bytes"] = peak - current_before
+        entry["retained_bytes"] = sum(after.values()) - sum(before.values())
+        entry["retained_by_component"] = {name: after[name] - before[name] for name in COMPONENTS}
+        self.phases.append(entry)
+
+    def live_by_component(self):
+        """시작 시점 대비 현재 살아 있는 메모리 (구성 요소별)"""
+        now = component_sizes(_take_snapshot())
+        return {name: now[name] - self.baseline[name] for name in COMPONENTS}
+
+
+@contextmanager
+def capture_before_save(callback):
+    """python-pptx 저장 직전에 callback() 호출 (슬라이드가 모두 만들어진 시점)"""
+    from pptx.presentation import Presentation
+
+    original = Presentation.save
+
+    def save(self, file):
+        callback()
+        return original(self, file)
+
+    Presentation.save = save
+    try:
+        yield
+    finally:
+        Presentation.save = original
+
+
+def normalized_string_bytes(indexer):
+    """정규화된 문자열이 차지하는 바이트 수 (힙, mmap)"""
+    data = indexer.praise_data
+    if hasattr(data, "section_sizes"):
+        sizes = data.section_sizes()
+        mapped = sum(sizes.get(f"{field}.blob", 0) + sizes.get(f"{field}.offsets", 0)
+                     for field in NORMALIZED_FIELDS)
+        return 0, mapped
+    seen = set()
+    total = 0
+    for record in data:
+        for field in NORMALIZED_FIELDS:
+            value = record.get(field)
+            if value is not None and id(value) not in seen:
+                seen.add(id(value))
+                total += sys.getsizeof(value)
+    return total, 0
+
+
+def template_media_bytes(template_file):
+    """템플릿 패키지 안 미디어(이미지/영상) 파트의 바이트 수
+
+    python-pptx는 파일을 열 때 모든 파트를 메모리에 읽으므로 생성할 때마다
+    이만큼이 더해진다.
+    """
+    from pptx import Presentation
+
+    prs = Presentation(str(template_file))
+    total = 0
+    for part in prs.part.package.iter_parts():
+        if str(part.partname).startswith("/ppt/media/"):
+            total += len(part.blob)
+    return total
+
+
+def representative_queries(indexer, seed=0):
+    """검색 단계에서 쓸 (검색어, 검색 타입) 목록"""
+    from benchmark import SEARCH_TYPES, sample_queries
+
+    queries = []
+    for search_type in SEARCH_TYPES:
+        for length in SEARCH_QUERY_LENGTHS:
+            for query in sample_queries(indexer, search_type, length, SEARCH_QUERIES_PER_CASE, seed):
+                queries.append((query, search_type))
+    return queries
+
+
+def profile_index(index_json, praise_folder=None, template_file=None, backend="binary",
+                  deck_songs=DEFAULT_DECK_SONGS, output_file=None, seed=0):
+    """인덱스 하나의 메모리 보고서 (dict)"""
+    from json_indexer import JSONPraiseIndexer
+    from json_ppt_generator_fixed import JSONPPTGeneratorFixed
+
+    index_json = Path(index_json)
+    if not index_json.is_absolute():
+        # 프로그램과 같은 규칙으로 상대 경로는 이 파일의 폴더 기준
+        index_json = Path(__file__).resolve().parent / index_json
+    template_file = Path(template_file) if template_file else index_json.with_name("temp.pptx")
+    output_file = Path(output_file) if output_file else index_json.with_name("memory_profile_deck.pptx")
+
+    profiler = PhaseProfiler()
+    profiler.start()
+    try:
+        with profiler.phase("load_index") as entry:
+            indexer = JSONPraiseIndexer(praise_folder or "Praise_PPT", str(index_json))
+            entry["ok"] = bool(indexer.load_from_json())
+            # 관련 찬양 표 확인/계산(백그라운드)도 로드 단계에 포함
+            indexer.wait_related()
+            if backend == "list":
+                # mmap 대신 파이썬 레코드 목록으로 전환
+                indexer.close_binary_index()
+        data = indexer.praise_data
+        songs = len(data)
+        backend_name = "binary" if hasattr(data, "section_sizes") else "list"
+
+        queries = representative_queries(indexer, seed) if songs else []
+        with profiler.phase("search") as entry:
+            results = 0
+            for query, search_type in queries:
+                found = indexer.search_praises(query, search_type)
+                results += len(found)
+                for praise in found[:3]:
+                    indexer.get_matching_slides(praise, query)
+                indexer.suggest_titles(query)
+            entry["queries"] = len(queries)
+            entry["results"] = results
+        found = None
+
+        with profiler.phase("template_load") as entry:
+            generator = JSONPPTGeneratorFixed(str(index_json), str(template_file), indexer=indexer)
+            entry["ok"] = bool(generator.template_styles)
+
+        at_save = {}
+        rng = random.Random(seed)
+        picks = rng.sample(range(songs), min(deck_songs, songs))
+        selected = [{"id": data[i]["id"], "title": data[i]["title"]} for i in picks]
+        with profiler.phase("generate_deck") as entry:
+            with capture_before_save(lambda: at_save.update(profiler.live_by_component())):
+                entry["ok"] = bool(generator.create_ppt_from_lyrics(selected, str(output_file)))
+            entry["songs"] = len(selected)
+            entry["live_before_save_by_component"] = at_save
+
+        live = profiler.live_by_component()
+    finally:
+        profiler.stop()
+
+    heap_strings, mapped_strings = normalized_string_bytes(indexer)
+    mapped_total = data.path.stat().st_size if backend_name == "binary" else 0
+    phases = {phase["name"]: phase for phase in profiler.phases}
+    report = {
+        "index": str(index_json),
+        "songs": songs,
+        "backend": backend_name,
+        "phases": profiler.phases,
+        "components": {
+            "praise_data_records": phases["load_index"]["retained_by_component"]["praise_data_records"],
+            "normalized_strings": heap_strings,
+            "normalized_strings_mapped": mapped_strings,
+            "binary_index_mapped": mapped_total,
+            "search_structures": live["search_structures"],
+            "python_pptx_at_save": at_save.get("python_pptx", 0),
+            "python_pptx_retained": live["python_pptx"],
+            "template_media": template_media_bytes(template_file) if template_file.exists() else 0,
+        },
+        "peak_bytes": max((phase["peak_bytes"] for phase in profiler.phases), default=0),
+        "retained_bytes": sum(live.values()),
+    }
+    indexer.close_binary_index()
+    return report
+
+
+def profile_synthetic(size, work_dir, backend="binary", deck_songs=DEFAULT_DECK_SONGS, seed=0):
+    """benchmark.py의 가짜 라이브러리로 인덱스를 만든 뒤 (측정 밖에서) 보고서 생성"""
+    from benchmark import generate_template, prepare_corpus
+    from json_indexer import JSONPraiseIndexer
+
+    work_dir = Path(work_dir)
+    folder = prepare_corpus(work_dir, size, seed)
+    index_dir = work_dir / f"memory_{size}"
+    index_dir.mkdir(parents=True, exist_ok=True)
+    index_json = index_dir / "praise_index.json"
+    if not (index_dir / "praise_index.header.json").exists():
+        indexer = JSONPraiseIndexer(str(folder), str(index_json))
+        indexer.index_praise_files()
+        indexer.wait_related()
+        indexer.close_binary_index()
+    template = generate_template(index_dir / "temp.pptx")
+    return profile_index(index_json, folder, template, backend, deck_songs, seed=seed)
+
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB"):
+        if abs(size) < 1024:
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GB"
+
+
+def print_report(report):
+    print(f"== {report['index']} ({report['songs']}곡, {report['backend']})")
+    for phase in report["phases"]:
+        print(f"  {phase['name']:14} peak {format_bytes(phase['peak_bytes']):>9}"
+              f"  retained {format_bytes(phase['retained_bytes']):>9}")
+    print("  구성 요소:")
+    for name, size in report["components"].items():
+        print(f"    {name:26} {format_bytes(size):>9}")
+    print(f"  최대 {format_bytes(report['peak_bytes'])}, 남은 메모리 {format_bytes(report['retained_bytes'])}")
+
+
+def _int_list(text):
+    return tuple(int(value) for value in text.split(",") if value.strip())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="인덱스/PPT 생성 메모리 사용량 보고")
+    parser.add_argument("--index", default="praise_index.json", help="인덱스 파일 (기본: praise_index.json)")
+    parser.add_argument("--folder", help="찬양 PPTX 폴더 (기본: Praise_PPT)")
+    parser.add_argument("--template", help="PPT 템플릿 (기본: 인덱스 옆의 temp.pptx)")
+    parser.add_argument("--sizes", type=_int_list,
+                        help="인덱스 대신 benchmark.py의 가짜 라이브러리 곡 수 (쉼표로 구분)")
+    parser.add_argument("--work-dir", default="benchmark_data", help="가짜 라이브러리 폴더")
+    parser.add_argument("--backend", choices=("binary", "list"), default="binary",
+                        help="검색 인덱스 형태 (binary: mmap, list: 파이썬 레코드 목록)")
+    parser.add_argument("--deck", type=int, default=DEFAULT_DECK_SONGS, help="생성할 PPT의 곡 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="결과 JSON 파일")
+    args = parser.parse_args()
+
+    if args.sizes:
+        reports = [profile_synthetic(size, args.work_dir, args.backend, args.deck, args.seed)
+                   for size in args.sizes]
+    else:
+        reports = [profile_index(args.index, args.folder, args.template, args.backend,
+                                 args.deck, seed=args.seed)]
+    for report in reports:
+        print_report(report)
+    if args.output:
+        Path(args.output).write_text(json.dumps(reports, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[OK] 결과 저장됨: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+거의 같은 찬양 찾기 (가사 MinHash + LSH)
+
+같은 곡이 다른 파일 이름으로 여러 벌 있는 경우("주님의 사랑_v2.pptx",
+"주님의사랑(키변경).pptx")를 찾는다. 인덱싱할 때 정규화된 가사의 글자
+SHINGLE_SIZE-gram 집합으로 MinHash 서명(NUM_PERMUTATIONS개 정수)을 만들어
+헤더에 저장해 두고, 찾을 때는 서명을 LSH_BANDS개 구간으로 나눠 한 구간이라도
+같은 곡끼리만 후보로 비교한다. 따라서 모든 쌍(O(n²))을 비교하지 않고, 후보
+중 서명 일치율(자카드 유사도 추정값)이 기준 이상인 곡을 한 묶음으로 합친다.
+
+자카드 유사도 s인 두 곡이 후보가 될 확률은 1 - (1 - s^LSH_ROWS)^LSH_BANDS
+(8x8: s=0.95이면 약 0.9998, s=0.9이면 약 0.99, s=0.8이면 약 0.77, s=0.5이면 약 0.03)이고,
+후보가 되지 않은 곡도 같은 묶음의 다른 곡을 거쳐 이어질 수 있다.
+"""
+
+import hashlib
+from array import array
+
+# 가사 조각(shingle) 길이 (정규화된 가사의 글자 수)
+SHINGLE_SIZE = 3
+# MinHash 서명 길이 = LSH 구간 수 x 구간당 값 수
+LSH_BANDS = 8
+LSH_ROWS = 8
+NUM_PERMUTATIONS = LSH_BANDS * LSH_ROWS
+# 같은 곡으로 보는 서명 일치율
+DUPLICATE_THRESHOLD = 0.8
+
+
+def shingles(text):
+    """정규화된 가사의 글자 SHINGLE_SIZE-gram 집합 (짧은 가사는 전체를 하나로)"""
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def minhash_signature(text):
+    """정규화된 가사의 MinHash 서명 (uint32 배열, 가사가 없으면 빈 배열)
+
+    조각마다 SHAKE-128 출력 하나를 NUM_PERMUTATIONS개의 32비트 해시로 나눠 쓰고
+    (해시 함수별로 따로 계산하지 않음), 해시 함수별 최솟값은 zip/min으로 한 번에 구한다.
+    인덱스 파일에 저장하므로 실행마다 같은 값이 나오는 해시를 쓴다.
+    """
+    items = shingles(text)
+    if not items:
+        return array("I")
+    size = NUM_PERMUTATIONS * 4
+    rows = [array("I", hashlib.shake_128(item.encode("utf-8")).digest(size)) for item in items]
+    return array("I", map(min, zip(*rows)))
+
+
+def signature_similarity(a, b):
+    """두 서명의 일치율 (자카드 유사도 추정값, 서명이 없으면 0)"""
+    if not a or len(a) != len(b):
+        return 0.0
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+class DuplicateIndex:
+    """서명 목록에서 찾은 거의 같은 곡 묶음
+
+    signatures[i]는 i번째 레코드의 서명(없으면 빈 배열/None)이다.
+    clusters는 두 곡 이상인 묶음의 레코드 번호 목록(오름차순)이며, 묶음은
+    유사한 쌍을 union-find로 이어 만든다 (A~B, B~C이면 A, B, C가 한 묶음).
+    """
+
+    def __init__(self, signatures, threshold=DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+        self.signatures = signatures
+        parent = list(range(len(signatures)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for band in range(LSH_BANDS):
+            buckets = {}
+            start = band * LSH_ROWS
+            for i, signature in enumerate(signatures):
+                if not signature or len(signature) != NUM_PERMUTATIONS:
+                    continue
+                key = tuple(signature[start:start + LSH_ROWS])
+                members = buckets.setdefault(key, [])
+                root = find(i)
+                for j in members:
+                    if find(j) == root:
+                        break
+                    if signature_similarity(signature, signatures[j]) >= threshold:
+                        parent[root] = find(j)
+                        break
+                members.append(i)
+
+        groups = {}
+        for i in range(len(signatures)):
+            groups.setdefault(find(i), []).append(i)
+        self.clusters = sorted((members for members in groups.values() if len(members) > 1),
+                               key=lambda members: members[0])
+        # 레코드 번호 → 묶음 번호 (묶음에 속한 레코드만)
+        self.cluster_of = {i: n for n, members in enumerate(self.clusters) for i in members}
+
+    def __len__(self):
+        return len(self.clusters)
+
+    def duplicate_count(self):
+        """묶음마다 하나만 남기면 줄어드는 레코드 수"""
+        return sum(len(members) - 1 for members in self.clusters)
+
+    def collapse(self, scores):
+        """검색 점수(레코드 번호 → 점수)에서 묶음마다 점수가 가장 높은 곡 하나만 남기기
+
+        점수가 같으면 앞의 레코드를 남기므로, 페이지를 나눠 보아도 결과가 일정하다.
+        """
+        cluster_of = self.cluster_of
+        if not cluster_of:
+            return scores
+        best = {}
+        for index, score in scores.items():
+            cluster = cluster_of.get(index)
+            if cluster is None:
+                continue
+            kept = best.get(cluster)
+            if kept is None or score > scores[kept] or (score == scores[kept] and index < kept):
+                best[cluster] = index
+        return {index: score for index, score in scores.items()
+                if index not in cluster_of or best[cluster_of[index]] == index}
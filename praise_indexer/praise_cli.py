@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+찬양 인덱서 명령줄 도구 (GUI/Tk 없이 실행)
+
+    python praise_cli.py index                      # 전체 인덱싱
+    python praise_cli.py index --incremental        # 추가/변경/삭제된 파일만 반영
+    python praise_cli.py search 은혜 --type both --json
+    python praise_cli.py search 은혜 --collapse         # 거의 같은 곡은 하나만
+    python praise_cli.py duplicates                 # 거의 같은 곡 묶음 보고
+    python praise_cli.py related 12                 # ID 12와 가사가 비슷한 찬양
+    python praise_cli.py check --repair             # 파일 경로 정리, 없는 파일 삭제, 빠진 파일 추가
+    python praise_cli.py generate --ids 12,7,31 -o 주일예배.pptx
+    python praise_cli.py generate --titles "주님의 사랑" "은혜" -o out.pptx
+    python praise_cli.py generate --setlist 콘티.txt -o out.pptx
+    python praise_cli.py watch                      # 폴더 변경을 계속 인덱스에 반영
+
+한 번 실행할 때 인덱스는 한 번만 로드한다. 공통 옵션(--index, --folder,
+--template, -v)은 하위 명령 앞에 준다. --index/--template를 생략하면 GUI와
+같은 파일(프로그램 폴더의 praise_index.json, temp.pptx)을 쓰고, 지정한 경로는
+현재 폴더 기준이다.
+종료 코드: 0 성공, 1 실패(인덱스 없음, 찾지 못한 곡 등), 2 잘못된 인자.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from folder_watcher import POLL_INTERVAL, FolderWatcher
+from integrity import check_integrity, repair
+from json_indexer import JSONPraiseIndexer
+from near_duplicates import DUPLICATE_THRESHOLD
+from tracing import configure_from_env, enable_logging, tracer
+
+DEFAULT_INDEX = "praise_index.json"
+DEFAULT_FOLDER = "Praise_PPT"
+DEFAULT_TEMPLATE = "temp.pptx"
+DEFAULT_OUTPUT = "merged_praises.pptx"
+SEARCH_TYPES = ("title", "lyrics", "both")
+
+
+def _cli_path(path):
+    """명령줄에서 지정한 경로는 현재 폴더 기준 절대 경로로"""
+    return str(Path(path).resolve())
+
+
+def _open_indexer(args):
+    # main이 끝나기 전에 백그라운드 관련 찬양 표 저장을 기다릴 수 있도록 보관
+    args.indexer = JSONPraiseIndexer(praise_folder=args.folder, output_json=args.index)
+    return args.indexer
+
+
+def _load(indexer):
+    if not indexer.load_from_json():
+        print(f"[ERROR] 인덱스를 불러올 수 없습니다: {indexer.output_json}", file=sys.stderr)
+        return False
+    return True
+
+
+def cmd_index(args):
+    indexer = _open_indexer(args)
+    if not args.incremental:
+        if args.jsonl:
+            ok = indexer.index_praise_files_jsonl(resume=not args.restart)
+        else:
+            ok = indexer.index_praise_files()
+        if ok:
+            print(f"[OK] 인덱싱 완료: {len(indexer.praise_data)}개 찬양")
+        return 0 if ok else 1
+
+    if not indexer.praise_folder.exists():
+        print(f"[ERROR] 찬양 폴더를 찾을 수 없습니다: {indexer.praise_folder}", file=sys.stderr)
+        return 1
+    if not indexer.load_from_json():
+        # 인덱스가 아직 없으면 전체 인덱싱
+        return 0 if indexer.index_praise_files() else 1
+
+    added, changed, removed = indexer.file_changes()
+    extracted = indexer.extract_files(added + [file_path for _, file_path in changed]) if added or changed else []
+    failed = [(path, message) for _, (path, ok, message) in extracted if not ok]
+    with indexer.batch():
+        for praise_id in removed:
+            indexer.remove_praise_by_id(praise_id)
+        indexer.add_entries([entry for entry, _ in extracted[:len(added)] if entry])
+        # 바뀐 파일은 기존 ID 그대로 교체 (추출에 실패하면 기존 레코드 유지)
+        indexer.replace_entries({praise_id: entry for (praise_id, _), (entry, _) in zip(changed, extracted[len(added):])
+                                 if entry})
+        if added or changed or removed:
+            if not indexer.save_to_json():
+                return 1
+
+    print(f"[OK] 추가 {len(added)}개, 변경 {len(changed)}개, 삭제 {len(removed)}개, "
+          f"실패 {len(failed)}개 (전체 {len(indexer.praise_data)}개 찬양)")
+    for path, message in failed:
+        print(f"[WARNING] {path}: {message}", file=sys.stderr)
+    return 0
+
+
+def search_results(indexer, query, search_type="title", limit=None, with_slides=False, offset=0, collapse=False):
+    """점수순 검색 결과 dict 목록 (rank, id, title, score, ...), 앞의 offset개는 건너뜀
+
+    collapse이면 거의 같은 곡 묶음마다 점수가 가장 높은 곡 하나만 남긴다.
+    """
+    tiers = indexer.SEARCH_SCORE_TIERS.get(search_type, ())
+    results = []
+    matches = indexer.iter_search_praises(query, search_type, collapse=collapse)
+    for rank, (cursor, praise) in enumerate(matches, 1):
+        if rank <= offset:
+            continue
+        if limit is not None and len(results) >= limit:
+            break
+        result = {
+            "rank": rank,
+            "id": praise['id'],
+            "title": praise['title'],
+            "score": tiers[cursor[1]],
+            "filename": praise['filename'],
+            "slide_count": praise.get('slide_count'),
+        }
+        if with_slides:
+            result["matching_slides"] = [i + 1 for i in indexer.get_matching_slides(praise, query)]
+        results.append(result)
+    return results
+
+
+def cmd_search(args):
+    indexer = _open_indexer(args)
+    if not _load(indexer):
+        return 1
+    results = search_results(indexer, args.query, args.type, args.limit, args.slides, collapse=args.collapse)
+    if args.json:
+        json.dump({"query": args.query, "type": args.type, "count": len(results), "results": results},
+                  sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+        return 0
+    for result in results:
+        line = f"{result['rank']:3}. {result['title']} (ID {result['id']}, {result['score']}점)"
+        if result.get("matching_slides"):
+            line += f" 일치 슬라이드: {', '.join(map(str, result['matching_slides']))}"
+        print(line)
+    if not results:
+        print("검색 결과가 없습니다.")
+    return 0
+
+
+def duplicate_clusters(indexer, threshold=DUPLICATE_THRESHOLD):
+    """거의 같은 곡 묶음 dict 목록 (묶음마다 곡 수와 곡별 id, title, filename, similarity)"""
+    return [
+        {
+            "count": len(cluster),
+            "songs": [
+                {"id": praise['id'], "title": praise['title'], "filename": praise['filename'],
+                 "similarity": round(similarity, 3)}
+                for praise, similarity in cluster
+            ],
+        }
+        for cluster in indexer.find_duplicates(threshold)
+    ]
+
+
+def cmd_duplicates(args):
+    indexer = _open_indexer(args)
+    if not _load(indexer):
+        return 1
+    clusters = duplicate_clusters(indexer, args.threshold)
+    extra = sum(cluster["count"] - 1 for cluster in clusters)
+    if args.json:
+        json.dump({"threshold": args.threshold, "count": len(clusters), "duplicates": extra, "clusters": clusters},
+                  sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+        return 0
+    for number, cluster in enumerate(clusters, 1):
+        print(f"{number:3}. {cluster['count']}곡")
+        for song in cluster["songs"]:
+            print(f"     - {song['title']} (ID {song['id']}, {song['filename']}, 유사도 {song['similarity']:.2f})")
+    if clusters:
+        print(f"[OK] 거의 같은 곡 묶음 {len(clusters)}개 (하나씩만 남기면 {extra}곡 줄어듦, "
+              f"전체 {len(indexer.praise_data)}개 찬양)")
+    else:
+        print("거의 같은 곡이 없습니다.")
+    return 0
+
+
+def related_results(indexer, praise_id, limit=None, snapshot=None):
+    """관련 찬양 dict 목록 (id, title, filename, similarity), 유사도 높은 순"""
+    return [
+        {"id": praise['id'], "title": praise['title'], "filename": praise['filename'],
+         "similarity": round(score, 3)}
+        for praise, score in indexer.related_songs(praise_id, limit, snapshot)
+    ]
+
+
+def cmd_related(args):
+    indexer = _open_indexer(args)
+    if not _load(indexer):
+        return 1
+    praise = indexer.find_praise(args.id)
+    if praise is None:
+        print(f"[ERROR] 찬양을 찾을 수 없습니다: ID {args.id}", file=sys.stderr)
+        return 1
+    # 표가 없거나 인덱스와 다르면 새로 만드는 중이므로 끝날 때까지 대기
+    indexer.wait_related()
+    results = related_results(indexer, args.id, args.limit)
+    if args.json:
+        json.dump({"id": args.id, "title": praise['title'], "related": results},
+                  sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+        return 0
+    print(f"{praise['title']} (ID {args.id})와 가사가 비슷한 찬양:")
+    for rank, result in enumerate(results, 1):
+        print(f"{rank:3}. {result['title']} (ID {result['id']}, 유사도 {result['similarity']:.2f})")
+    if not results:
+        print("관련 찬양이 없습니다.")
+    return 0
+
+
+def cmd_check(args):
+    indexer = _open_indexer(args)
+    if not _load(indexer):
+        return 1
+    if not indexer.praise_folder.is_dir():
+        print(f"[ERROR] 찬양 폴더를 찾을 수 없습니다: {indexer.praise_folder}", file=sys.stderr)
+        return 1
+    report = check_integrity(indexer)
+    result = repair(indexer, report, remove_missing=True, add_orphaned=True) if args.repair else None
+    if args.json:
+        payload = report.to_dict()
+        if result is not None:
+            payload["repaired"] = result
+        json.dump(payload, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+        return 0 if report.clean or args.repair else 1
+    for praise_id, old, new in report.relinked:
+        print(f"경로 갱신: ID {praise_id} {old} → {new}")
+    for praise_id, old in report.missing:
+        print(f"파일 없음: ID {praise_id} {old}")
+    for name in report.orphaned:
+        print(f"색인 안 됨: {name}")
+    summary = (f"정상 {report.ok}개, 경로 갱신 {len(report.relinked)}개, 파일 없음 {len(report.missing)}개, "
+               f"색인 안 됨 {len(report.orphaned)}개")
+    if result is not None:
+        print(f"[OK] {summary} → 경로 갱신 {result['relinked']}개, 삭제 {result['removed']}개, "
+              f"추가 {result['added']}개")
+        for error in result["errors"]:
+            print(f"[WARNING] {error['file']}: {error['error']}", file=sys.stderr)
+        return 0
+    if report.clean:
+        print(f"[OK] {summary}")
+        return 0
+    print(f"[WARNING] {summary} (--repair로 정리)")
+    return 1
+
+
+def resolve_selection(indexer, ids=None, titles=None, best=False):
+    """ID/제목 목록을 찬양으로 변환: (선택 목록, 찾지 못한 항목 목록)
+
+    제목은 콘티 일괄 찾기와 같은 방식(정확한 제목 → 유사한 제목 → 가사)으로
+    찾고, 확정되지 않은 제목은 best이면 가장 비슷한 곡을, 아니면 찾지 못한
+    것으로 처리한다.
+    """
+    # 검색 도중 인덱스가 바뀌어도 한 스냅샷 안에서 찾음
+    snapshot = indexer.snapshot
+    selected, missing = [], []
+    for praise_id in ids or ():
+        praise = indexer.find_praise(praise_id, snapshot)
+        if praise is None:
+            missing.append({"query": str(praise_id), "candidates": []})
+        else:
+            selected.append({"id": praise['id'], "title": praise['title']})
+    if titles:
+        for result in indexer.resolve_setlist(list(titles), snapshot=snapshot):
+            matches = result["matches"]
+            if matches and (result["resolved"] or best):
+                praise_id, title, _ = matches[0]
+                selected.append({"id": praise_id, "title": title})
+            else:
+                missing.append({
+                    "query": result["query"],
+                    "candidates": [{"id": m[0], "title": m[1], "score": m[2]} for m in matches],
+                })
+    return selected, missing
+
+
+def _read_setlist(path):
+    from setlist_resolver import parse_setlist
+
+    text = sys.stdin.read() if path == "-" else Path(path).read_text(encoding="utf-8")
+    return parse_setlist(text)
+
+
+def cmd_generate(args):
+    indexer = _open_indexer(args)
+    if not _load(indexer):
+        return 1
+    titles = list(args.titles or [])
+    if args.setlist:
+        titles += _read_setlist(args.setlist)
+    selected, missing = resolve_selection(indexer, args.ids, titles, args.best)
+
+    for item in missing:
+        candidates = ", ".join(f"{c['title']} (ID {c['id']})" for c in item["candidates"]) or "후보 없음"
+        print(f"[WARNING] 찾지 못함: {item['query']} → {candidates}", file=sys.stderr)
+    if missing and not args.skip_missing:
+        print("[ERROR] 찾지 못한 곡이 있어 생성하지 않습니다 (--best 또는 --skip-missing 사용)", file=sys.stderr)
+        ok = False
+    elif not selected:
+        print("[ERROR] 생성할 찬양이 없습니다", file=sys.stderr)
+        ok = False
+    else:
+        # python-pptx는 생성할 때만 import
+        from json_ppt_generator_fixed import JSONPPTGeneratorFixed
+
+        generator = JSONPPTGeneratorFixed(json_file=args.index, template_file=args.template, indexer=indexer)
+        ok = bool(generator.create_ppt_from_lyrics(selected, args.output))
+
+    if args.json:
+        json.dump({"ok": ok, "output": args.output if ok else None, "songs": selected, "missing": missing},
+                  sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    elif ok:
+        print(f"[OK] {args.output} ({len(selected)}곡)")
+    return 0 if ok else 1
+
+
+def cmd_watch(args):
+    indexer = _open_indexer(args)
+    if not indexer.praise_folder.is_dir():
+        print(f"[ERROR] 찬양 폴더를 찾을 수 없습니다: {indexer.praise_folder}", file=sys.stderr)
+        return 1
+    if not indexer.load_from_json() and not indexer.index_praise_files():
+        return 1
+
+    def on_change(result):
+        print(f"[OK] 추가 {len(result['added'])}개, 변경 {len(result['changed'])}개, "
+              f"삭제 {len(result['removed'])}개 (전체 {len(indexer.praise_data)}개 찬양)", flush=True)
+        for name, message in result["failed"]:
+            print(f"[WARNING] {name}: {message}", file=sys.stderr, flush=True)
+
+    watcher = FolderWatcher(indexer, on_change=on_change, poll_interval=args.interval,
+                            use_inotify=not args.poll)
+    watcher.start()
+    print(f"[OK] 찬양 폴더 감시 중: {indexer.praise_folder} (Ctrl+C로 종료)", flush=True)
+    try:
+        while not watcher.join(1.0):
+            pass
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop()
+    return 0
+
+
+def _id_list(text):
+    try:
+        return [int(value) for value in text.split(",") if value.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"ID 목록이 올바르지 않습니다: {text}")
+
+
+def _similarity(text):
+    try:
+        value = float(text)
+    except ValueError:
+        value = -1.0
+    if not 0.0 < value <= 1.0:
+        raise argparse.ArgumentTypeError(f"유사도는 0보다 크고 1 이하여야 합니다: {text}")
+    return value
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="praise_cli", description="찬양 인덱싱 / 검색 / PPT 생성")
+    parser.add_argument("--index", type=_cli_path, help=f"인덱스 파일 (기본: 프로그램 폴더의 {DEFAULT_INDEX})")
+    parser.add_argument("--folder", default=DEFAULT_FOLDER, help=f"찬양 PPTX 폴더 (기본: {DEFAULT_FOLDER})")
+    parser.add_argument("--template", type=_cli_path, help=f"PPT 템플릿 (기본: 프로그램 폴더의 {DEFAULT_TEMPLATE})")
+    parser.add_argument("-v", "--verbose", action="count", default=0,
+                        help="진행 로그 표시 (-vv: 디버그 로그)")
+    parser.add_argument("--trace", help="단계별 시간 구간을 저장할 Chrome 추적 형식 JSON 파일")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    index = subparsers.add_parser("index", help="찬양 폴더 인덱싱")
+    index.add_argument("--incremental", action="store_true", help="추가/변경/삭제된 파일만 반영")
+    index.add_argument("--jsonl", action="store_true", help="JSON Lines 스트리밍 인덱싱 (중단 시 이어서)")
+    index.add_argument("--restart", action="store_true", help="--jsonl에서 이어 하지 않고 처음부터")
+    index.set_defaults(func=cmd_index)
+
+    search = subparsers.add_parser("search", help="찬양 검색")
+    search.add_argument("query", help="검색어 (AND/OR/NOT/\"구절\" 검색식 가능)")
+    search.add_argument("--type", choices=SEARCH_TYPES, default="title", help="검색 타입 (기본: title)")
+    search.add_argument("--limit", type=int, help="최대 결과 수")
+    search.add_argument("--slides", action="store_true", help="가사에서 일치하는 슬라이드 번호 포함")
+    search.add_argument("--collapse", action="store_true", help="거의 같은 곡은 점수가 가장 높은 하나만")
+    search.add_argument("--json", action="store_true", help="JSON으로 출력")
+    search.set_defaults(func=cmd_search)
+
+    duplicates = subparsers.add_parser("duplicates", help="가사가 거의 같은 곡 묶음 보고")
+    duplicates.add_argument("--threshold", type=_similarity, default=DUPLICATE_THRESHOLD,
+                            help=f"같은 곡으로 보는 가사 유사도 0~1 (기본: {DUPLICATE_THRESHOLD:g})")
+    duplicates.add_argument("--json", action="store_true", help="JSON으로 출력")
+    duplicates.set_defaults(func=cmd_duplicates)
+
+    related = subparsers.add_parser("related", help="가사가 비슷한 관련 찬양")
+    related.add_argument("id", type=int, help="찬양 ID")
+    related.add_argument("--limit", type=int, help="최대 결과 수")
+    related.add_argument("--json", action="store_true", help="JSON으로 출력")
+    related.set_defaults(func=cmd_related)
+
+    check = subparsers.add_parser("check", help="인덱스의 파일 경로와 찬양 폴더 비교")
+    check.add_argument("--repair", action="store_true",
+                       help="경로 갱신, 파일이 없는 찬양 삭제, 색인 안 된 파일 추가")
+    check.add_argument("--json", action="store_true", help="JSON으로 출력")
+    check.set_defaults(func=cmd_check)
+
+    generate = subparsers.add_parser("generate", help="선택한 찬양으로 PPT 생성")
+    generate.add_argument("--ids", type=_id_list, help="찬양 ID 목록 (쉼표로 구분)")
+    generate.add_argument("--titles", nargs="+", help="찬양 제목 목록")
+    generate.add_argument("--setlist", help="콘티 텍스트 파일 (-: 표준 입력)")
+    generate.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help=f"출력 PPTX (기본: {DEFAULT_OUTPUT})")
+    generate.add_argument("--best", action="store_true", help="애매한 제목은 가장 비슷한 곡으로")
+    generate.add_argument("--skip-missing", action="store_true", help="찾지 못한 곡은 빼고 생성")
+    generate.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    generate.set_defaults(func=cmd_generate)
+
+    watch = subparsers.add_parser("watch", help="찬양 폴더를 감시해 바뀐 파일을 계속 인덱스에 반영")
+    watch.add_argument("--poll", action="store_true", help="inotify 대신 폴링으로 감시")
+    watch.add_argument("--interval", type=float, default=POLL_INTERVAL, help=f"폴링 간격 초 (기본: {POLL_INTERVAL:g})")
+    watch.set_defaults(func=cmd_watch)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "generate" and not (args.ids or args.titles or args.setlist):
+        parser.error("generate: --ids, --titles, --setlist 중 하나가 필요합니다")
+    # 생략한 파일은 이름만 넘겨 인덱서/생성기가 프로그램 폴더 기준으로 찾게 한다
+    args.index = args.index or DEFAULT_INDEX
+    args.template = args.template or DEFAULT_TEMPLATE
+
+    # 경고/오류는 기본으로 표시 (PRAISE_LOG_LEVEL 또는 -v로 더 자세히)
+    configure_from_env(default_level="WARNING")
+    if args.verbose:
+        enable_logging("DEBUG" if args.verbose > 1 else "INFO", sys.stderr)
+    if args.trace:
+        tracer.start()
+    try:
+        return args.func(args)
+    finally:
+        # 저장 후 백그라운드에서 만드는 관련 찬양 표를 파일로 남기고 종료
+        indexer = getattr(args, "indexer", None)
+        if indexer is not None:
+            indexer.wait_related()
+        if args.trace:
+            tracer.export(args.trace)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
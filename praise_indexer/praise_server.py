@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+찬양 검색 / PPT 생성 HTTP 서비스 (표준 라이브러리만 사용)
+
+인덱스와 PPT 생성기(템플릿 스타일)를 한 번만 로드해 메모리에 두고 여러
+클라이언트의 요청을 스레드로 동시에 처리한다.
+
+    GET  /health                      상태 (찬양 수, 인덱스 버전)
+    GET  /search?q=은혜&type=both&limit=30&offset=0&slides=1&collapse=1
+    GET  /duplicates                  가사가 거의 같은 곡 묶음
+    GET  /suggest?q=ㅈㄴ&limit=10      제목 자동완성
+    GET  /songs/<id>                  찬양 헤더 + 슬라이드별 가사 + 가사가 비슷한 관련 찬양
+    POST /generate                    {"ids": [..]} | {"titles": [..]} | {"setlist": "..."}
+                                      (+ "best", "skip_missing", "filename") → PPTX
+    POST /reload                      인덱스 다시 로드
+
+--watch를 주면 찬양 폴더를 감시해 바뀐 파일을 바로 인덱스에 반영한다.
+
+- 요청마다 그 시점의 인덱스 스냅샷을 잡아 쓰므로 검색/생성은 잠금 없이
+  동시에 진행되고, 폴더 감시나 다시 로드가 인덱스를 바꾸는 중에도 멈추지 않는다.
+- 응답 본문은 (요청, 인덱스 버전) 키로 LRU 캐시하고 ETag를 붙여
+  If-None-Match 재검증에는 304로 답한다. 생성한 PPT도 곡 목록별로 캐시한다.
+- 다른 PC에서 다시 인덱싱해 인덱스 파일이 바뀌면 다음 요청 때 자동으로
+  다시 로드한다.
+
+    python praise_server.py --host 0.0.0.0 --port 8765
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from urllib.parse import parse_qs, quote, urlsplit
+
+from json_indexer import JSONPraiseIndexer
+from praise_cli import (DEFAULT_FOLDER, DEFAULT_INDEX, DEFAULT_OUTPUT, DEFAULT_TEMPLATE, SEARCH_TYPES, _cli_path,
+                        duplicate_clusters, related_results, resolve_selection, search_results)
+from tracing import configure_from_env, enable_logging, get_logger, span
+
+logger = get_logger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# 캐시할 응답 수 / PPT 수
+RESPONSE_CACHE_SIZE = 512
+DECK_CACHE_SIZE = 8
+# 동시에 만드는 PPT 수 (python-pptx 객체가 메모리를 많이 쓰므로 제한)
+MAX_CONCURRENT_DECKS = 2
+# 인덱스 파일 변경 확인 간격 (초)
+RELOAD_CHECK_INTERVAL = 2.0
+DEFAULT_PAGE_SIZE = 30
+MAX_PAGE_SIZE = 500
+MAX_REQUEST_BYTES = 1024 * 1024
+PPTX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+
+class ServiceError(Exception):
+    """HTTP 오류 응답으로 바꿀 요청 오류"""
+
+    def __init__(self, status, message, **extra):
+        super().__init__(message)
+        self.status = status
+        self.payload = {"error": message, **extra}
+
+
+class _LRUCache:
+    """스레드 안전한 작은 LRU"""
+
+    def __init__(self, size):
+        self.size = size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+class PraiseService:
+    """HTTP와 무관한 서비스 본체 (인덱서, 생성기, 캐시)"""
+
+    def __init__(self, index=DEFAULT_INDEX, folder=DEFAULT_FOLDER, template=DEFAULT_TEMPLATE,
+                 response_cache_size=RESPONSE_CACHE_SIZE, deck_cache_size=DECK_CACHE_SIZE):
+        self.indexer = JSONPraiseIndexer(praise_folder=folder, output_json=index)
+        self.template = template
+        self.generator = None
+        self.responses = _LRUCache(response_cache_size)
+        self.decks = _LRUCache(deck_cache_size)
+        self.deck_slots = threading.BoundedSemaphore(MAX_CONCURRENT_DECKS)
+        self.loaded_mtime = None
+        self.next_reload_check = 0.0
+        self.watcher = None
+
+    def load(self):
+        """인덱스와 PPT 생성기 로드"""
+        with self.indexer.write_lock:
+            ok = self.indexer.load_from_json()
+            self.loaded_mtime = self._index_mtime()
+        self.responses.clear()
+        self.decks.clear()
+        if ok and self.generator is None:
+            from json_ppt_generator_fixed import JSONPPTGeneratorFixed
+
+            self.generator = JSONPPTGeneratorFixed(
+                json_file=str(self.indexer.output_json),
+                template_file=self.template,
+                indexer=self.indexer,
+            )
+        logger.info("인덱스 로드: %s개 찬양", len(self.indexer.praise_data))
+        return ok
+
+    def watch(self):
+        """찬양 폴더 감시 시작"""
+        from folder_watcher import FolderWatcher
+
+        self.watcher = FolderWatcher(self.indexer, on_change=self._on_folder_changed)
+        return self.watcher.start()
+
+    def _on_folder_changed(self, result):
+        # 직접 저장한 인덱스이므로 다시 로드하지 않음 (캐시 키는 인덱스 버전이 바뀌어 자동 무효화)
+        self.loaded_mtime = self._index_mtime()
+
+    def _index_mtime(self):
+        header_path = self.indexer.store.header_path
+        return header_path.stat().st_mtime if header_path.exists() else None
+
+    def reload_if_changed(self):
+        """인덱스 파일이 바뀌었으면 다시 로드 (확인은 RELOAD_CHECK_INTERVAL마다)"""
+        now = time.monotonic()
+        if now < self.next_reload_check:
+            return False
+        self.next_reload_check = now + RELOAD_CHECK_INTERVAL
+        if self._index_mtime() == self.loaded_mtime:
+            return False
+        logger.info("인덱스 파일 변경 감지, 다시 로드")
+        return self.load()
+
+    @property
+    def version(self):
+        return self.indexer.index_version
+
+    def cached(self, key, build):
+        """(본문 bytes, ETag) — 같은 요청은 인덱스가 바뀌기 전까지 캐시에서"""
+        key = (key, self.version)
+        entry = self.responses.get(key)
+        if entry is None:
+            body = json.dumps(build(), ensure_ascii=False).encode("utf-8")
+            etag = '"%s"' % hashlib.sha1(body).hexdigest()[:20]
+            entry = (body, etag)
+            self.responses.put(key, entry)
+        return entry
+
+    def health(self):
+        return {
+            "status": "ok",
+            "songs": len(self.indexer.praise_data),
+            "index_version": self.version,
+            "response_cache": {"hits": self.responses.hits, "misses": self.responses.misses},
+            "deck_cache": {"hits": self.decks.hits, "misses": self.decks.misses},
+        }
+
+    def search(self, query, search_type="title", limit=DEFAULT_PAGE_SIZE, offset=0, with_slides=False,
+               collapse=False):
+        if search_type not in SEARCH_TYPES:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, f"알 수 없는 검색 타입: {search_type}")
+        if not query.strip():
+            return {"query": query, "type": search_type, "offset": offset, "results": [], "has_more": False}
+        # 한 개 더 받아서 다음 페이지가 있는지 확인
+        results = search_results(self.indexer, query, search_type, limit + 1, with_slides, offset, collapse)
+        return {
+            "query": query,
+            "type": search_type,
+            "offset": offset,
+            "results": results[:limit],
+            "has_more": len(results) > limit,
+        }
+
+    def suggest(self, prefix, limit=10):
+        suggestions = self.indexer.suggest_titles(prefix, limit)
+        return {"query": prefix, "results": [{"id": praise_id, "title": title} for praise_id, title in suggestions]}
+
+    def duplicates(self):
+        clusters = duplicate_clusters(self.indexer)
+        return {"count": len(clusters), "clusters": clusters}
+
+    def song(self, praise_id):
+        snapshot = self.indexer.snapshot
+        praise = self.indexer.find_praise(praise_id, snapshot)
+        slides = self.indexer.get_praise_detail(praise_id, snapshot) if praise is not None else None
+        if praise is None:
+            raise ServiceError(HTTPStatus.NOT_FOUND, f"찬양을 찾을 수 없습니다: {praise_id}")
+        return {
+            "id": praise['id'],
+            "title": praise['title'],
+            "filename": praise['filename'],
+            "slide_count": praise.get('slide_count'),
+            "slides": [{"slide_number": slide.get('slide_number'), "text": slide.get('text', '')}
+                       for slide in (slides or [])],
+            "related": related_results(self.indexer, praise_id, snapshot=snapshot),
+        }
+
+    def generate(self, request):
+        """요청 dict → (PPTX bytes, 선택된 곡 목록)"""
+        ids = request.get("ids") or []
+        titles = request.get("titles") or []
+        setlist = request.get("setlist") or ""
+        # 문자열 하나를 목록으로 풀면 글자마다 곡을 찾게 되므로 타입을 먼저 확인
+        if not isinstance(ids, list) or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "ids는 정수 목록이어야 합니다")
+        if not isinstance(titles, list) or not all(isinstance(title, str) for title in titles):
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "titles는 문자열 목록이어야 합니다")
+        if not isinstance(setlist, str):
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "setlist는 문자열이어야 합니다")
+        titles = list(titles)
+        if setlist:
+            from setlist_resolver import parse_setlist
+
+            titles += parse_setlist(setlist)
+        if not ids and not titles:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "ids, titles, setlist 중 하나가 필요합니다")
+        if self.generator is None or not self.generator.template_styles:
+            raise ServiceError(HTTPStatus.SERVICE_UNAVAILABLE, "PPT 템플릿을 불러오지 못했습니다")
+
+        version = self.version
+        selected, missing = resolve_selection(self.indexer, ids, titles, bool(request.get("best")))
+        if missing and not request.get("skip_missing"):
+            raise ServiceError(HTTPStatus.UNPROCESSABLE_ENTITY, "찾지 못한 곡이 있습니다", missing=missing)
+        if not selected:
+            raise ServiceError(HTTPStatus.UNPROCESSABLE_ENTITY, "생성할 찬양이 없습니다", missing=missing)
+
+        key = (tuple(song["id"] for song in selected), version)
+        data = self.decks.get(key)
+        if data is None:
+            with self.deck_slots, span("generate_request", songs=len(selected)):
+                output = BytesIO()
+                if not self.generator.create_ppt_from_lyrics(selected, output):
+                    raise ServiceError(HTTPStatus.INTERNAL_SERVER_ERROR, "PPT 생성 실패")
+                data = output.getvalue()
+            self.decks.put(key, data)
+        return data, selected
+
+
+class PraiseRequestHandler(BaseHTTPRequestHandler):
+    """URL → PraiseService 메서드"""
+
+    server_version = "PraiseService/1.0"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def do_GET(self):
+        self._dispatch(self._route_get)
+
+    def do_POST(self):
+        self._dispatch(self._route_post)
+
+    def _dispatch(self, route):
+        try:
+            self.service.reload_if_changed()
+            url = urlsplit(self.path)
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            with span("http_request", path=url.path):
+                route(url.path.rstrip("/") or "/", params)
+        except ServiceError as e:
+            self._send_json(e.status, e.payload)
+        except Exception as e:
+            logger.exception("요청 처리 실패: %s", self.path)
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)})
+
+    def _route_get(self, path, params):
+        service = self.service
+        if path == "/health":
+            self._send_json(HTTPStatus.OK, service.health())
+        elif path == "/search":
+            query = params.get("q", "")
+            search_type = params.get("type", "title")
+            limit = min(_int_param(params, "limit", DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE)
+            offset = _int_param(params, "offset", 0)
+            with_slides = params.get("slides") in ("1", "true")
+            collapse = params.get("collapse") in ("1", "true")
+            self._send_cached(("search", query, search_type, limit, offset, with_slides, collapse),
+                              lambda: service.search(query, search_type, limit, offset, with_slides, collapse))
+        elif path == "/suggest":
+            prefix = params.get("q", "")
+            limit = min(_int_param(params, "limit", 10), MAX_PAGE_SIZE)
+            self._send_cached(("suggest", prefix, limit), lambda: service.suggest(prefix, limit))
+        elif path == "/duplicates":
+            self._send_cached(("duplicates",), service.duplicates)
+        elif path.startswith("/songs/"):
+            try:
+                praise_id = int(path[len("/songs/"):])
+            except ValueError:
+                raise ServiceError(HTTPStatus.BAD_REQUEST, "찬양 ID는 정수여야 합니다")
+            # 관련 찬양 표는 저장 후 백그라운드에서 바뀌므로 표 버전도 키에 포함
+            self._send_cached(("song", praise_id, service.indexer.related_version),
+                              lambda: service.song(praise_id))
+        else:
+            raise ServiceError(HTTPStatus.NOT_FOUND, f"알 수 없는 경로: {path}")
+
+    def _route_post(self, path, params):
+        if path == "/generate":
+            request = self._read_json()
+            data, selected = self.service.generate(request)
+            filename = str(request.get("filename") or DEFAULT_OUTPUT)
+            self._send(HTTPStatus.OK, data, PPTX_CONTENT_TYPE, {
+                "Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename)}",
+                "X-Praise-Songs": ",".join(str(song["id"]) for song in selected),
+            })
+        elif path == "/reload":
+            ok = self.service.load()
+            self._send_json(HTTPStatus.OK if ok else HTTPStatus.SERVICE_UNAVAILABLE, self.service.health())
+        else:
+            raise ServiceError(HTTPStatus.NOT_FOUND, f"알 수 없는 경로: {path}")
+
+    def _read_json(self):
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if not 0 <= length <= MAX_REQUEST_BYTES:
+            # 본문을 읽지 않았으므로 이 연결은 더 쓰지 않음 (남은 본문을 다음 요청으로 읽지 않도록)
+            self.close_connection = True
+            if length > MAX_REQUEST_BYTES:
+                raise ServiceError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "요청이 너무 큽니다")
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "Content-Length가 올바르지 않습니다")
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "JSON 본문이 올바르지 않습니다")
+        if not isinstance(request, dict):
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "JSON 객체가 필요합니다")
+        return request
+
+    def _send_cached(self, key, build):
+        body, etag = self.service.cached(key, build)
+        if self.headers.get("If-None-Match") == etag:
+            self._send(HTTPStatus.NOT_MODIFIED, b"", None, {"ETag": etag})
+        else:
+            self._send(HTTPStatus.OK, body, "application/json; charset=utf-8", {"ETag": etag})
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self._send(status, body, "application/json; charset=utf-8")
+
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+
+
+def _int_param(params, name, default):
+    try:
+        return max(0, int(params.get(name, default)))
+    except ValueError:
+        raise ServiceError(HTTPStatus.BAD_REQUEST, f"{name}는 정수여야 합니다")
+
+
+def create_server(service, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """요청마다 스레드를 쓰는 HTTP 서버 (service는 미리 load()해 둘 것)"""
+    server = ThreadingHTTPServer((host, port), PraiseRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="찬양 검색 / PPT 생성 HTTP 서비스")
+    parser.add_argument("--host", default=DEFAULT_HOST,
+                        help=f"바인드 주소 (기본: {DEFAULT_HOST}, 다른 PC에서 접속하려면 0.0.0.0)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"포트 (기본: {DEFAULT_PORT})")
+    parser.add_argument("--index", type=_cli_path, help=f"인덱스 파일 (기본: 프로그램 폴더의 {DEFAULT_INDEX})")
+    parser.add_argument("--folder", default=DEFAULT_FOLDER, help=f"찬양 PPTX 폴더 (기본: {DEFAULT_FOLDER})")
+    parser.add_argument("--template", type=_cli_path, help=f"PPT 템플릿 (기본: 프로그램 폴더의 {DEFAULT_TEMPLATE})")
+    parser.add_argument("--watch", action="store_true", help="찬양 폴더를 감시해 바뀐 파일을 바로 반영")
+    parser.add_argument("-v", "--verbose", action="count", default=0, help="요청 로그 표시 (-vv: 디버그)")
+    args = parser.parse_args(argv)
+
+    configure_from_env(default_level="INFO")
+    if args.verbose:
+        enable_logging("DEBUG" if args.verbose > 1 else "INFO")
+
+    service = PraiseService(args.index or DEFAULT_INDEX, args.folder, args.template or DEFAULT_TEMPLATE)
+    if not service.load():
+        logger.error("인덱스를 불러올 수 없습니다: %s (먼저 praise_cli.py index 실행)", service.indexer.output_json)
+        return 1
+    if args.watch:
+        service.watch()
+    server = create_server(service, args.host, args.port)
+    logger.info("http://%s:%s 에서 대기 중 (%s개 찬양)", args.host, args.port, len(service.indexer.praise_data))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
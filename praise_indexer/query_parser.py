@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+검색식 (AND / OR / NOT / -제외어 / "구절" / 괄호)
+
+    사랑 AND 십자가        둘 다 포함 (AND는 생략 가능: "사랑 십자가")
+    은혜 OR 감사           둘 중 하나 포함
+    NOT 크리스마스, -크리스마스   제외
+    "주의 사랑"            구절 (공백/연산자 단어를 그대로 검색어로)
+    (은혜 OR 감사) -성탄    괄호로 묶기
+
+연산자는 대문자로만 인식한다 (가사의 영어 and/or와 구분). 연산자, 따옴표,
+괄호, -제외어가 하나도 없는 검색어는 검색식이 아니므로 parse_query가 None을
+돌려주고, 기존처럼 전체를 하나의 부분 문자열로 검색한다.
+
+파싱 결과는 튜플 트리이며 각 단어(term)는 인덱스의 일치 레코드 집합으로
+바꾼 뒤 집합 연산(교집합/합집합/차집합)으로 계산한다.
+    ("term", 정규화된 검색어)
+    ("and", (자식, ...)) / ("or", (자식, ...)) / ("not", 자식)
+"""
+
+import re
+
+_OPERATORS = {"AND", "OR", "NOT"}
+# 구절("..."), 괄호, 공백으로 구분되는 단어 (닫는 따옴표가 없으면 끝까지 구절)
+_TOKEN = re.compile(r'"([^"]*)"?|(\()|(\))|([^\s()"]+)')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _normalize(text):
+    """JSONPraiseIndexer.normalize_text와 같은 규칙 (공백 제거, 소문자)"""
+    return _WHITESPACE.sub('', text.lower())
+
+
+def _tokenize(query):
+    tokens = []
+    for match in _TOKEN.finditer(query):
+        phrase, open_paren, close_paren, word = match.groups()
+        if phrase is not None:
+            tokens.append(("term", phrase))
+        elif open_paren:
+            tokens.append(("(", None))
+        elif close_paren:
+            tokens.append((")", None))
+        elif word in _OPERATORS:
+            tokens.append((word, None))
+        elif word.startswith("-") and len(word) > 1:
+            tokens.append(("NOT", None))
+            tokens.append(("term", word[1:]))
+        else:
+            tokens.append(("term", word))
+    return tokens
+
+
+def is_boolean_query(query):
+    """검색식 문법을 쓰는 검색어인지 확인"""
+    return any(kind != "term" for kind, _ in _tokenize(query)) or '"' in query
+
+
+def parse_query(query):
+    """검색식 파싱 (검색식이 아니거나 비어 있으면 None)
+
+    잘못된 식도 오류 없이 최대한 해석한다 (닫히지 않은 괄호/따옴표,
+    끝에 남은 연산자 등은 무시). 입력 중인 검색어를 매번 파싱하기 때문이다.
+    """
+    if not is_boolean_query(query):
+        return None
+    parser = _Parser(_tokenize(query))
+    node = parser.parse_or()
+    # 짝이 맞지 않는 닫는 괄호 뒤의 나머지도 AND로 이어서 해석
+    while parser.position < len(parser.tokens):
+        parser.position += 1
+        rest = parser.parse_or()
+        node = _combine("and", [node, rest])
+    return node
+
+
+class _Parser:
+    """재귀 하강 파서 (OR < AND < NOT 순으로 결합)"""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+
+    def _peek(self):
+        if self.position < len(self.tokens):
+            return self.tokens[self.position][0]
+        return None
+
+    def parse_or(self):
+        children = [self.parse_and()]
+        while self._peek() == "OR":
+            self.position += 1
+            children.append(self.parse_and())
+        return _combine("or", children)
+
+    def parse_and(self):
+        children = []
+        while self._peek() not in (None, ")", "OR"):
+            if self._peek() == "AND":
+                self.position += 1
+                continue
+            children.append(self.parse_not())
+        return _combine("and", children)
+
+    def parse_not(self):
+        if self._peek() == "NOT":
+            self.position += 1
+            if self._peek() in (None, ")", "OR"):
+                return None
+            child = self.parse_not()
+            return ("not", child) if child is not None else None
+        return self.parse_atom()
+
+    def parse_atom(self):
+        kind, value = self.tokens[self.position]
+        self.position += 1
+        if kind == "(":
+            node = self.parse_or()
+            if self._peek() == ")":
+                self.position += 1
+            return node
+        if kind == "term":
+            term = _normalize(value)
+            return ("term", term) if term else None
+        # 위치가 맞지 않는 연산자는 무시
+        return None
+
+
+def _combine(op, children):
+    children = tuple(child for child in children if child is not None)
+    if not children:
+        return None
+    if len(children) == 1:
+        return children[0]
+    return (op, children)
+
+
+def positive_terms(node):
+    """결과 강조에 쓸 (NOT 아래가 아닌) 검색어 목록"""
+    if node is None:
+        return []
+    kind = node[0]
+    if kind == "term":
+        return [node[1]]
+    if kind == "not":
+        return []
+    terms = []
+    for child in node[1]:
+        for term in positive_terms(child):
+            if term not in terms:
+                terms.append(term)
+    return terms
+
+
+def evaluate(node, match_term, count):
+    """검색식을 레코드 번호 집합으로 계산
+
+    match_term(term)은 검색어가 들어 있는 레코드 번호 집합을 돌려준다.
+    같은 검색어는 한 번만 조회하고, AND 안의 NOT은 전체 집합을 만들지 않고
+    차집합으로 계산한다.
+    """
+    term_sets = {}
+
+    def term_set(term):
+        if term not in term_sets:
+            term_sets[term] = match_term(term)
+        return term_sets[term]
+
+    def universe():
+        return set(range(count))
+
+    def walk(node):
+        kind = node[0]
+        if kind == "term":
+            return set(term_set(node[1]))
+        if kind == "not":
+            return universe() - walk(node[1])
+        if kind == "or":
+            result = set()
+            for child in node[1]:
+                result |= walk(child)
+            return result
+        # and: 포함 조건끼리 교집합을 먼저 구한 뒤 제외 조건을 뺀다
+        positives = [child for child in node[1] if child[0] != "not"]
+        negatives = [child[1] for child in node[1] if child[0] == "not"]
+        if positives:
+            sets = sorted((walk(child) for child in positives), key=len)
+            result = sets[0]
+            for other in sets[1:]:
+                if not result:
+                    break
+                result &= other
+        else:
+            result = universe()
+        for child in negatives:
+            if not result:
+                break
+            result -= walk(child)
+        return result
+
+    return walk(node)
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+관련 찬양 추천 (가사 TF-IDF 유사도, 미리 계산한 이웃 표)
+
+인덱스를 저장할 때 정규화된 가사의 글자 bigram으로 찬양별 TF-IDF 벡터를
+만들고(희소 행렬, CSR 배열), 곡마다 가장 비슷한 RELATED_TOP_K곡을 골라
+이웃 표(praise_index.related.bin)로 저장해 둔다. 곡을 고를 때는 표에서
+ID로 찾기만 하므로 화면 쪽에서는 유사도 계산을 하지 않는다.
+
+- 절반이 넘는 곡에 나오는 bigram(IDF가 거의 0)은 주제와 무관하므로 버리고,
+  곡마다 가중치가 큰 MAX_TERMS_PER_SONG개만으로 비교해 계산량을 줄인다.
+- 가사가 거의 같은 사본(near_duplicates 묶음)은 서로의 관련 곡에서 뺀다.
+- 곡마다 정규화된 가사의 CRC32(digest)를 함께 저장해, 찬양 ID와 가사가 모두
+  같을 때만 표를 다시 쓴다 (ID가 같아도 가사가 바뀌었으면 새로 계산).
+
+praise_index.related.bin 구조 (리틀 엔디언):
+- 고정 헤더: 매직, 버전, 찬양 수, 곡당 이웃 수(k)
+- 찬양 ID 배열, 가사 digest 배열, 이웃 ID 배열(찬양 수 x k, 빈 칸은 0), 유사도 배열(float32)
+"""
+
+import heapq
+import math
+import os
+import struct
+import zlib
+from array import array
+from pathlib import Path
+
+# 곡마다 저장하는 관련 곡 수
+RELATED_TOP_K = 10
+# 이보다 덜 비슷한 곡은 관련 곡으로 저장하지 않음 (코사인 유사도)
+MIN_SIMILARITY = 0.05
+# 이 비율보다 많은 곡에 나오는 bigram은 버림
+MAX_DF_RATIO = 0.5
+# 곡마다 비교에 쓰는 bigram 수 (가중치가 큰 순서)
+MAX_TERMS_PER_SONG = 48
+
+MAGIC = b"PRAISERL"
+VERSION = 2
+_FIXED_HEADER = struct.Struct("<8sIII")
+
+
+def lyrics_digest(lyrics_normalized):
+    """정규화된 가사의 CRC32 (표를 다시 쓸 수 있는지 비교용)"""
+    return zlib.crc32((lyrics_normalized or "").encode("utf-8"))
+
+
+def content_digests(songs):
+    """(찬양 ID, 정규화된 가사) 목록 → 찬양 ID → 가사 digest"""
+    return {praise_id: lyrics_digest(lyrics_normalized) for praise_id, lyrics_normalized in songs}
+
+
+def lyric_terms(lyrics_normalized):
+    """정규화된 가사의 글자 bigram → 나온 횟수"""
+    counts = {}
+    text = lyrics_normalized or ""
+    for i in range(len(text) - 1):
+        term = text[i:i + 2]
+        counts[term] = counts.get(term, 0) + 1
+    return counts
+
+
+class TfidfMatrix:
+    """찬양별 TF-IDF 벡터 (행: 찬양, 열: bigram)
+
+    CSR 배열(indptr, indices, data)로 보관하고 행 벡터는 L2 정규화되어
+    있으므로 두 행의 내적이 곧 코사인 유사도다. 가중치는 (1 + log tf) x idf.
+    """
+
+    def __init__(self, songs):
+        """songs: (찬양 ID, 정규화된 가사) 목록"""
+        self.ids = array("I")
+        rows = []
+        document_frequency = {}
+        for praise_id, lyrics_normalized in songs:
+            counts = lyric_terms(lyrics_normalized)
+            self.ids.append(praise_id)
+            rows.append(counts)
+            for term in counts:
+                document_frequency[term] = document_frequency.get(term, 0) + 1
+
+        count = len(rows)
+        max_df = max(1, int(count * MAX_DF_RATIO))
+        self.terms = {}
+        idf = array("f")
+        for term, df in document_frequency.items():
+            if df <= max_df:
+                self.terms[term] = len(idf)
+                idf.append(math.log(count / df))
+        self.idf = idf
+
+        self.indptr = array("I", [0])
+        self.indices = array("I")
+        self.data = array("f")
+        for counts in rows:
+            weights = []
+            for term, tf in counts.items():
+                column = self.terms.get(term)
+                if column is not None:
+                    weights.append(((1.0 + math.log(tf)) * idf[column], column))
+            norm = math.sqrt(sum(weight * weight for weight, _ in weights)) or 1.0
+            # 가중치가 큰 bigram만 남기되 정규화는 전체 벡터 기준
+            weights = heapq.nlargest(MAX_TERMS_PER_SONG, weights)
+            weights.sort(key=lambda item: item[1])
+            self.indices.extend(column for _, column in weights)
+            self.data.extend(weight / norm for weight, _ in weights)
+            self.indptr.append(len(self.indices))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def columns(self):
+        """열(bigram)별 (행 번호, 가중치) 목록 (전치 행렬, 이웃 계산용)"""
+        postings = [[] for _ in range(len(self.idf))]
+        indptr, indices, data = self.indptr, self.indices, self.data
+        for row in range(len(self.ids)):
+            for k in range(indptr[row], indptr[row + 1]):
+                postings[indices[k]].append((row, data[k]))
+        return postings
+
+    def top_neighbors(self, k=RELATED_TOP_K, groups=None):
+        """곡마다 가장 비슷한 k곡의 이웃 표
+
+        groups(행 번호 → 묶음 번호)에서 같은 묶음인 곡(거의 같은 사본)은 뺀다.
+        행마다 그 행의 bigram 열만 따라가며 내적을 누적하므로, 공유하는
+        bigram이 없는 곡 쌍은 계산하지 않는다.
+        """
+        groups = groups or {}
+        postings = self.columns()
+        indptr, indices, data, ids = self.indptr, self.indices, self.data, self.ids
+        neighbors = array("I", bytes(4 * k * len(ids)))
+        scores = array("f", bytes(4 * k * len(ids)))
+        for row in range(len(ids)):
+            totals = {}
+            for position in range(indptr[row], indptr[row + 1]):
+                weight = data[position]
+                for other, other_weight in postings[indices[position]]:
+                    totals[other] = totals.get(other, 0.0) + weight * other_weight
+            totals.pop(row, None)
+            group = groups.get(row)
+            best = heapq.nlargest(k, ((score, other) for other, score in totals.items()
+                                      if score >= MIN_SIMILARITY
+                                      and (group is None or groups.get(other) != group)))
+            for slot, (score, other) in enumerate(best):
+                neighbors[row * k + slot] = ids[other]
+                scores[row * k + slot] = score
+        return RelatedTable(ids, neighbors, scores, k)
+
+
+class RelatedTable:
+    """찬양 ID → 관련 곡 (ID, 유사도) 목록 (미리 계산한 이웃 표)"""
+
+    def __init__(self, ids, neighbors, scores, k, digests=None):
+        self.ids = ids
+        self.neighbors = neighbors
+        self.scores = scores
+        self.k = k
+        # 행별 가사 digest (표를 만들 때의 가사)
+        self.digests = digests if digests is not None else array("I", bytes(4 * len(ids)))
+        self._rows = {praise_id: row for row, praise_id in enumerate(ids)}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def matches(self, digests):
+        """찬양 ID → 가사 digest가 표를 만들 때와 모두 같은지 (같으면 표를 다시 써도 됨)"""
+        return len(digests) == len(self.ids) and all(
+            digests.get(praise_id) == digest for praise_id, digest in zip(self.ids, self.digests))
+
+    def related(self, praise_id):
+        """관련 곡 (ID, 유사도) 목록, 유사도 높은 순 (표에 없는 곡은 빈 목록)"""
+        row = self._rows.get(praise_id)
+        if row is None:
+            return []
+        start = row * self.k
+        return [(self.neighbors[i], self.scores[i]) for i in range(start, start + self.k)
+                if self.neighbors[i]]
+
+    def write(self, path):
+        """이웃 표 파일 저장 (임시 파일에 쓴 뒤 교체)"""
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(_FIXED_HEADER.pack(MAGIC, VERSION, len(self.ids), self.k))
+            for values in (self.ids, self.digests, self.neighbors, self.scores):
+                f.write(values.tobytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def read(cls, path):
+        """이웃 표 파일 로드"""
+        with open(path, "rb") as f:
+            magic, version, count, k = _FIXED_HEADER.unpack(f.read(_FIXED_HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"지원하지 않는 관련 곡 파일: {path}")
+            ids, digests, neighbors, scores = array("I"), array("I"), array("I"), array("f")
+            ids.fromfile(f, count)
+            digests.fromfile(f, count)
+            neighbors.fromfile(f, count * k)
+            scores.fromfile(f, count * k)
+        return cls(ids, neighbors, scores, k, digests)
+
+
+def build_related_table(songs, groups=None, k=RELATED_TOP_K):
+    """(찬양 ID, 정규화된 가사) 목록으로 이웃 표 생성"""
+    table = TfidfMatrix(songs).top_neighbors(k, groups)
+    table.digests = array("I", (lyrics_digest(lyrics_normalized) for _, lyrics_normalized in songs))
+    return table
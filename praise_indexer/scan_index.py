@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+이어 붙인 문자열 버퍼로 하는 찬양 부분 문자열 검색
+
+역색인을 따로 만들지 않고, 모든 찬양의 정규화된 제목/가사를 구분 문자로
+이어 붙인 버퍼 하나와 레코드별 시작 위치 배열만 둔다. 검색은 버퍼 전체에
+str.find를 반복하고 일치 위치를 bisect로 레코드 번호로 바꾸므로, 레코드마다
+파이썬 루프를 도는 것보다 훨씬 빠르다. 추가 메모리는 버퍼와 오프셋 배열뿐이다.
+
+저장 전(메모리 목록) 데이터 검색에 쓰며, BinaryPraiseIndex와 같은
+match_scores 인터페이스를 제공한다.
+"""
+
+from array import array
+from bisect import bisect_right
+
+# 레코드 구분 문자 (정규화된 텍스트에는 나오지 않음)
+SEPARATOR = "\x00"
+
+# 버퍼를 만드는 필드 (정규화된 텍스트와 두벌식 키 입력 형태)
+SCAN_FIELDS = ("title_normalized", "lyrics_normalized", "title_qwerty", "lyrics_qwerty")
+
+
+class ConcatenatedScanIndex:
+    """정규화된 필드별로 이어 붙인 버퍼와 시작 위치 배열"""
+
+    def __init__(self, records):
+        self._count = len(records)
+        self._buffers = {}
+        self._starts = {}
+        for field in SCAN_FIELDS:
+            values = [(r.get(field) or "").replace(SEPARATOR, "") for r in records]
+            starts = array("L")
+            position = 0
+            for value in values:
+                starts.append(position)
+                position += len(value) + 1
+            # 마지막 레코드 끝 (다음 레코드 시작 위치로 취급)
+            starts.append(position)
+            self._buffers[field] = SEPARATOR.join(values) + SEPARATOR
+            self._starts[field] = starts
+
+    def __len__(self):
+        return self._count
+
+    def matching_indices(self, field, query_normalized, candidates=None):
+        """정규화된 필드에 검색어가 들어 있는 레코드 번호 (오름차순)
+
+        candidates(오름차순 레코드 번호)를 주면 그 레코드 구간만 확인한다.
+        """
+        if not query_normalized:
+            return list(range(self._count)) if candidates is None else list(candidates)
+        if SEPARATOR in query_normalized:
+            return []
+
+        buffer = self._buffers[field]
+        starts = self._starts[field]
+        find = buffer.find
+        if candidates is not None:
+            return [i for i in candidates if find(query_normalized, starts[i], starts[i + 1] - 1) >= 0]
+        result = []
+        position = 0
+        while True:
+            hit = find(query_normalized, position)
+            if hit < 0:
+                return result
+            # 구분 문자가 있으므로 일치 구간은 항상 한 레코드 안에 있음
+            index = bisect_right(starts, hit) - 1
+            result.append(index)
+            position = starts[index + 1]
+
+    def match_scores(self, query_normalized, search_type="title", candidates=None):
+        """검색 타입별 점수 (레코드 번호 → 점수), JSONPraiseIndexer.score_praise와 동일 기준"""
+        if search_type == "title":
+            return dict.fromkeys(self.matching_indices("title_normalized", query_normalized, candidates), 100)
+        if search_type == "lyrics":
+            return dict.fromkeys(self.matching_indices("lyrics_normalized", query_normalized, candidates), 100)
+        if search_type == "both":
+            scores = dict.fromkeys(self.matching_indices("title_normalized", query_normalized, candidates), 50)
+            for i in self.matching_indices("lyrics_normalized", query_normalized, candidates):
+                scores[i] = scores.get(i, 0) + 50
+            return scores
+        return {}
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+슬라이드/줄 단위 검색 위치
+
+정규화된 가사(lyrics_normalized)는 모든 줄을 정규화해 이어 붙인 문자열이다.
+인덱싱할 때 줄마다 정규화된 길이의 누적값(line_ends)과 슬라이드마다 줄 수의
+누적값(slide_ends)을 함께 저장해 두면, 정규화된 가사에서 찾은 위치를
+bisect만으로 (슬라이드, 줄, 줄 안의 위치)로 바꿀 수 있다. 가사 원문을 다시
+훑지 않으므로 헤더/바이너리 인덱스만으로 일치 슬라이드를 알 수 있다.
+"""
+
+import re
+from bisect import bisect_right
+
+# JSONPraiseIndexer.normalize_text와 같은 규칙 (공백 제거, 소문자)
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_line(text):
+    """검색용 정규화 (줄 하나)"""
+    return _WHITESPACE.sub('', text.lower()) if text else ""
+
+
+def slide_lines(slide):
+    """슬라이드의 줄 목록 (text_lines가 없으면 text를 나눔)"""
+    lines = slide.get('text_lines')
+    if lines is None:
+        lines = slide.get('text', '').split("\n")
+    return lines
+
+
+def line_offsets(slides_text):
+    """slides_text의 (line_ends, slide_ends)
+
+    line_ends[k]: k번째 줄까지의 정규화된 길이 누적값
+    slide_ends[s]: s번째 슬라이드까지의 줄 수 누적값
+    """
+    line_ends = []
+    slide_ends = []
+    total = 0
+    for slide in slides_text or []:
+        for line in slide_lines(slide):
+            total += len(normalize_line(line))
+            line_ends.append(total)
+        slide_ends.append(len(line_ends))
+    return line_ends, slide_ends
+
+
+def find_hits(lyrics_normalized, line_ends, slide_ends, query_normalized, limit=None):
+    """정규화된 가사에서 검색어 위치를 슬라이드/줄 단위로 변환
+
+    반환값은 {"slide_index", "line_index", "start", "end"} 목록이다.
+    slide_index는 slides_text 안의 순서, line_index는 슬라이드 안의 줄 순서,
+    start/end는 그 줄의 정규화된 텍스트 기준 위치다. 두 줄에 걸친 일치는
+    줄마다 하나씩 나뉘어 들어간다.
+    """
+    hits = []
+    if not query_normalized or not line_ends:
+        return hits
+    length = len(query_normalized)
+    position = lyrics_normalized.find(query_normalized)
+    while position >= 0:
+        end = position + length
+        line = bisect_right(line_ends, position)
+        while line < len(line_ends):
+            line_start = line_ends[line - 1] if line else 0
+            if line_start >= end:
+                break
+            if line_ends[line] > line_start:
+                slide = bisect_right(slide_ends, line)
+                first_line = slide_ends[slide - 1] if slide else 0
+                hits.append({
+                    "slide_index": slide,
+                    "line_index": line - first_line,
+                    "start": max(position, line_start) - line_start,
+                    "end": min(end, line_ends[line]) - line_start,
+                })
+            line += 1
+        if limit is not None and len(hits) >= limit:
+            return hits[:limit]
+        position = lyrics_normalized.find(query_normalized, end)
+    return hits
+
+
+def text_span(line, start, end):
+    """줄의 정규화된 위치(start, end)를 원문 줄의 글자 위치로 변환"""
+    positions = []
+    for i, char in enumerate(line):
+        if char.isspace():
+            continue
+        # 소문자 변환으로 글자 수가 바뀌는 경우도 원문 위치에 맞춤
+        positions.extend([i] * len(char.lower()))
+    if not positions or start >= len(positions):
+        return len(line), len(line)
+    return positions[start], positions[min(end, len(positions)) - 1] + 1
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+콘티(세트리스트) 일괄 찾기
+
+문자로 받은 콘티를 그대로 붙여넣으면 줄마다 번호/키 표시를 떼어 내고
+모든 제목과 한 번에 비교해 가장 비슷한 찬양과 대안 후보를 찾는다.
+- 정규화된 제목이 정확히 같으면 바로 확정
+- rapidfuzz가 설치되어 있으면 C 구현의 process.extract로, 없으면 difflib로
+  전체 제목과 유사도 비교 (오타 허용)
+- 제목이 충분히 비슷하지 않으면 가사 일부로 보고 가사 검색 결과도 후보에 추가
+"""
+
+import re
+from difflib import SequenceMatcher
+
+try:
+    from rapidfuzz import fuzz, process
+    HAS_RAPIDFUZZ = True
+except ImportError:
+    HAS_RAPIDFUZZ = False
+
+# 이 점수 이상이고 다음 후보와 차이가 충분하면 자동 확정
+RESOLVE_SCORE = 85
+RESOLVE_MARGIN = 5
+# 가사 일부로 찾은 후보의 점수 (정확한 제목 일치보다 낮게)
+LYRICS_MATCH_SCORE = 90
+
+# 줄 앞 번호/글머리표 ("1.", "2)", "-", "•" 등)
+_LINE_PREFIX = re.compile(r'^\s*(?:\d+\s*[.)\]:\-]|[\-*•·▶>]+)\s*')
+# 줄 끝 키 표시 ("(G)", "[A키]", "(Bb key)" 등)
+_KEY_SUFFIX = re.compile(r'\s*[(\[]\s*[A-Ga-g][#b]?m?\s*(?:키|key|Key)?\s*[)\]]\s*$')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _normalize(text):
+    """JSONPraiseIndexer.normalize_text와 같은 규칙 (공백 제거, 소문자)"""
+    return _WHITESPACE.sub('', text.lower())
+
+
+def parse_setlist(text):
+    """붙여넣은 콘티를 곡 제목(또는 가사 일부) 목록으로"""
+    entries = []
+    for line in text.splitlines():
+        line = _KEY_SUFFIX.sub('', _LINE_PREFIX.sub('', line)).strip()
+        if line:
+            entries.append(line)
+    return entries
+
+
+class SetlistResolver:
+    """제목 목록에 대한 일괄 유사도 검색"""
+
+    def __init__(self, titles, lyrics_search=None):
+        """titles: {찬양 ID: (제목, 정규화된 제목)}
+        lyrics_search(정규화된 검색어): 가사에 검색어가 있는 찬양 ID 목록 (선택)
+        """
+        self.ids = list(titles)
+        self.titles = [titles[praise_id][0] for praise_id in self.ids]
+        self.normalized = [titles[praise_id][1] for praise_id in self.ids]
+        self.lyrics_search = lyrics_search
+        self.positions = {praise_id: i for i, praise_id in enumerate(self.ids)}
+        # 정규화된 제목 → 찬양 번호 목록 (정확히 일치하는 제목 바로 찾기)
+        self.exact = {}
+        for i, key in enumerate(self.normalized):
+            self.exact.setdefault(key, []).append(i)
+
+    def resolve(self, entries, limit=3):
+        """줄마다 {"query", "matches": [(찬양 ID, 제목, 점수), ...], "resolved"} 목록"""
+        return [self.resolve_one(entry, limit) for entry in entries]
+
+    def resolve_one(self, entry, limit=3):
+        query = _normalize(entry)
+        candidates = {}
+
+        for i in self.exact.get(query, ()):
+            candidates[i] = 100.0
+        if not candidates and query:
+            for i, score in self._fuzzy(query, limit):
+                candidates[i] = score
+
+        best = max(candidates.values(), default=0)
+        if best < RESOLVE_SCORE and self.lyrics_search is not None and len(query) >= 2:
+            for praise_id in self.lyrics_search(query)[:limit]:
+                i = self.positions.get(praise_id)
+                if i is not None:
+                    candidates[i] = max(candidates.get(i, 0), LYRICS_MATCH_SCORE)
+
+        ranked = sorted(candidates.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        matches = [(self.ids[i], self.titles[i], round(score, 1)) for i, score in ranked]
+        return {
+            "query": entry,
+            "matches": matches,
+            "resolved": self._is_resolved(matches),
+        }
+
+    def _fuzzy(self, query, limit):
+        """정규화된 제목 전체와 유사도 비교, 상위 limit개의 (번호, 점수)"""
+        if HAS_RAPIDFUZZ:
+            return [(i, score) for _, score, i in
+                    process.extract(query, self.normalized, scorer=fuzz.WRatio, limit=limit)]
+
+        matcher = SequenceMatcher(autojunk=False)
+        matcher.set_seq2(query)
+        scored = []
+        floor = 0.0
+        for i, title in enumerate(self.normalized):
+            matcher.set_seq1(title)
+            # 상한값으로 먼저 걸러 비싼 ratio 계산을 줄임
+            if matcher.real_quick_ratio() <= floor or matcher.quick_ratio() <= floor:
+                continue
+            ratio = matcher.ratio()
+            scored.append((ratio, i))
+            if len(scored) >= limit:
+                scored.sort(reverse=True)
+                del scored[limit:]
+                floor = scored[-1][0]
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [(i, ratio * 100) for ratio, i in scored[:limit]]
+
+    @staticmethod
+    def _is_resolved(matches):
+        if not matches or matches[0][2] < RESOLVE_SCORE:
+            return False
+        if len(matches) == 1 or (matches[0][2] == 100 and matches[1][2] < 100):
+            return True
+        return matches[0][2] - matches[1][2] >= RESOLVE_MARGIN
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+테스트 공통 준비 (작은 찬양 PPTX 라이브러리와 인덱서)
+
+모듈들은 praise_indexer 폴더를 기준으로 서로를 가져오므로 그 폴더를 경로에 넣는다.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from json_indexer import JSONPraiseIndexer  # noqa: E402
+
+
+def write_pptx(path, slides):
+    """슬라이드별 줄 목록으로 PPTX 작성 (slides: [["줄", ...], ...])"""
+    from pptx import Presentation
+    from pptx.util import Inches
+
+    prs = Presentation()
+    for lines in slides:
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        frame = slide.shapes.add_textbox(Inches(1), Inches(1), Inches(8), Inches(4)).text_frame
+        for i, line in enumerate(lines):
+            paragraph = frame.paragraphs[0] if i == 0 else frame.add_paragraph()
+            paragraph.text = line
+    prs.save(str(path))
+    return Path(path)
+
+
+@pytest.fixture
+def praise_folder(tmp_path):
+    folder = tmp_path / "Praise_PPT"
+    folder.mkdir()
+    return folder
+
+
+@pytest.fixture
+def make_song(praise_folder):
+    """찬양 폴더에 곡 하나 작성: make_song("제목", ["가사 줄", ...], ...)"""
+    def make(title, *slides):
+        return write_pptx(praise_folder / f"{title}.pptx", slides or [[title]])
+    return make
+
+
+@pytest.fixture
+def indexer(tmp_path, praise_folder):
+    indexer = JSONPraiseIndexer(praise_folder=praise_folder, output_json=tmp_path / "praise_index.json")
+    yield indexer
+    indexer.wait_related()
+    indexer.close_binary_index()
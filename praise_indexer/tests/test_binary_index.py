@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""바이너리 인덱스 (bigram 포스팅 리스트)와 이어 붙인 버퍼 검색의 결과 비교"""
+
+import pytest
+
+from binary_index import BinaryPraiseIndex, write_binary_index
+from scan_index import ConcatenatedScanIndex
+
+TEXTS = [
+    ("주님의사랑", "주님의사랑놀라워라나의주님"),
+    ("감사해", "감사해요주님감사"),
+    ("은혜", "놀라운은혜나같은죄인"),
+    ("abc", "aaaaab"),
+    ("", ""),
+    ("주주주", "주님주님주님"),
+]
+QUERIES = ["주", "주님", "주님의", "님의사", "감사", "은혜나", "aa", "aab", "aaaaab", "없는말", "의사랑놀", "주주"]
+
+
+@pytest.fixture
+def records():
+    return [{"id": i * 10 + 1, "title": title, "filename": f"{i}.pptx", "title_normalized": title,
+             "lyrics_normalized": lyrics, "mtime_ns": 1_700_000_000_000_000_000 + i, "size": 1000 + i}
+            for i, (title, lyrics) in enumerate(TEXTS)]
+
+
+@pytest.fixture
+def binary(tmp_path, records):
+    path = tmp_path / "praise_index.bin"
+    write_binary_index(records, path)
+    index = BinaryPraiseIndex(path)
+    yield index
+    index.close()
+
+
+@pytest.mark.parametrize("field", ["title_normalized", "lyrics_normalized"])
+def test_matching_indices_match_scan(binary, records, field):
+    scan = ConcatenatedScanIndex(records)
+    for query in QUERIES:
+        expected = [i for i, record in enumerate(records) if query in record[field]]
+        assert binary.matching_indices(field, query) == expected, query
+        assert scan.matching_indices(field, query) == expected, query
+        candidates = [0, 2, 3, 5]
+        assert binary.matching_indices(field, query, candidates) == [i for i in expected if i in candidates]
+
+
+@pytest.mark.parametrize("search_type", ["title", "lyrics", "both"])
+def test_match_scores_match_scan(binary, records, search_type):
+    scan = ConcatenatedScanIndex(records)
+    for query in QUERIES:
+        assert binary.match_scores(query, search_type) == scan.match_scores(query, search_type), query
+
+
+def test_records_and_fields(binary, records):
+    assert len(binary) == len(records)
+    assert binary.index_of_id(31) == 3
+    assert binary.index_of_id(99) == -1
+    assert binary.field(2, "title") == "은혜"
+    assert binary.number_field(4, "mtime_ns") == records[4]["mtime_ns"]
+    assert binary.number_field(4, "size") == 1004
+    assert binary[0]["lyrics_normalized"] == records[0]["lyrics_normalized"]
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""파일별 추출 실패 이유 (깨진 파일, 가사 없는 파일)"""
+
+from conftest import write_pptx
+from folder_watcher import FolderWatcher
+from integrity import check_integrity, repair
+from json_indexer import NO_LYRICS
+
+
+def test_add_files_reports_reason_per_file(indexer, make_song, praise_folder):
+    good = make_song("감사해", ["감사해 감사해"])
+    broken = praise_folder / "깨진 파일.pptx"
+    broken.write_bytes(b"not a zip")
+    empty = write_pptx(praise_folder / "빈 파일.pptx", [[]])
+    missing = praise_folder / "없는 파일.pptx"
+
+    results = indexer.add_files([good, broken, empty, missing])
+    assert [(ok, path) for path, ok, _ in results] == [(True, str(good)), (False, str(broken)),
+                                                        (False, str(empty)), (False, str(missing))]
+    reasons = [message for _, _, message in results]
+    assert "BadZip" in reasons[1] or "Package" in reasons[1]
+    assert reasons[2] == NO_LYRICS
+    assert reasons[3] == "파일이 존재하지 않습니다"
+
+
+def test_full_index_skips_broken_file(indexer, make_song, praise_folder):
+    make_song("감사해", ["감사해 감사해"])
+    (praise_folder / "깨진 파일.pptx").write_bytes(b"not a zip")
+    assert indexer.index_praise_files()
+    assert [p['title'] for p in indexer.praise_data] == ["감사해"]
+
+
+def test_watcher_and_repair_report_reasons(indexer, make_song, praise_folder):
+    make_song("감사해", ["감사해 감사해"])
+    assert indexer.index_praise_files()
+    (praise_folder / "깨진 파일.pptx").write_bytes(b"not a zip")
+
+    report = check_integrity(indexer)
+    result = repair(indexer, report, add_orphaned=True)
+    assert result["failed"] == 1
+    assert result["errors"][0]["file"] == "깨진 파일.pptx" and result["errors"][0]["error"]
+
+    result = FolderWatcher(indexer, use_inotify=False).apply({"깨진 파일.pptx"})
+    [(name, message)] = result["failed"]
+    assert name == "깨진 파일.pptx" and message
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""찬양 폴더 감시 (시작할 때 꺼져 있는 동안의 변경 찾기, 변경 반영)"""
+
+import os
+import threading
+
+import pytest
+
+from conftest import write_pptx
+from folder_watcher import FolderWatcher
+
+
+@pytest.fixture
+def library(indexer, make_song):
+    make_song("주님의 사랑", ["주님의 사랑 놀라워"])
+    make_song("감사해", ["감사해 감사해"])
+    make_song("은혜", ["놀라운 은혜"])
+    assert indexer.index_praise_files()
+    return indexer
+
+
+def edit(path, *slides):
+    """파일 내용을 바꾸되 수정 시각은 인덱스 저장보다 이전으로"""
+    stat = path.stat()
+    write_pptx(path, slides)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10_000_000_000))
+
+
+def test_initial_changes_include_edits_before_a_later_save(library, praise_folder):
+    edit(praise_folder / "감사해.pptx", ["감사해 감사해", "고친 줄"])
+    library.remove_praise_by_id(library.find_selected({"title": "은혜"})['id'])
+    assert library.save_to_json()
+    write_pptx(praise_folder / "새 노래.pptx", [["새 노래"]])
+    os.remove(praise_folder / "주님의 사랑.pptx")
+
+    watcher = FolderWatcher(library, use_inotify=False)
+    # 은혜.pptx는 인덱스에서만 지웠으므로 새 파일로 다시 추가
+    assert watcher._initial_changes() == {"감사해.pptx", "새 노래.pptx", "주님의 사랑.pptx", "은혜.pptx"}
+
+
+def test_start_applies_offline_changes(library, praise_folder):
+    edit(praise_folder / "감사해.pptx", ["감사해 감사해", "고친 줄"])
+    applied = threading.Event()
+    results = []
+
+    def on_change(result):
+        results.append(result)
+        applied.set()
+
+    watcher = FolderWatcher(library, on_change=on_change, debounce=0.05, poll_interval=0.05, use_inotify=False)
+    assert watcher.start()
+    try:
+        assert applied.wait(10)
+    finally:
+        watcher.stop()
+    assert results[0]["changed"] == ["감사해.pptx"]
+    assert [p['title'] for p in library.search_praises("고친줄", "lyrics")] == ["감사해"]
+
+
+def test_apply_keeps_id_of_changed_file(library, praise_folder):
+    before = library.find_selected({"title": "감사해"})
+    ids = [p['id'] for p in library.praise_data]
+    write_pptx(praise_folder / "감사해.pptx", [["감사해 감사해", "고친 줄"]])
+
+    result = FolderWatcher(library, use_inotify=False).apply({"감사해.pptx"})
+    assert result["changed"] == ["감사해.pptx"]
+    assert [p['id'] for p in library.praise_data] == ids
+    assert library.find_praise(before['id'])['title'] == "감사해"
+    assert library.get_praise_detail(before['id'])[0]['text_lines'] == ["감사해 감사해", "고친 줄"]
+    assert library.suggest_titles("감사")[0][0] == before['id']
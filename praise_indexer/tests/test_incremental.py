@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""증분 인덱싱 (곡마다 기록한 수정 시각/크기로 바뀐 파일 찾기)"""
+
+import os
+
+import pytest
+
+import praise_cli
+from conftest import write_pptx
+from json_indexer import JSONPraiseIndexer
+
+
+def touch_later(path, seconds=10):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 1_000_000_000))
+
+
+@pytest.fixture
+def library(indexer, make_song):
+    make_song("주님의 사랑", ["주님의 사랑 놀라워"])
+    make_song("감사해", ["감사해 감사해"])
+    make_song("은혜", ["놀라운 은혜"])
+    assert indexer.index_praise_files()
+    return indexer
+
+
+def run_incremental(indexer, capsys):
+    code = praise_cli.main(["--index", str(indexer.output_json), "--folder", str(indexer.praise_folder),
+                            "index", "--incremental"])
+    assert code == 0
+    return capsys.readouterr().out
+
+
+def reopen(indexer):
+    other = JSONPraiseIndexer(praise_folder=indexer.praise_folder, output_json=indexer.output_json)
+    assert other.load_from_json()
+    return other
+
+
+def test_records_file_stat(library):
+    praise = library.find_selected({"title": "감사해"})
+    stat = (library.praise_folder / "감사해.pptx").stat()
+    assert (praise['mtime_ns'], praise['size']) == (stat.st_mtime_ns, stat.st_size)
+
+
+def test_unchanged_folder_has_no_changes(library):
+    assert library.file_changes() == ([], [], [])
+
+
+def test_edit_is_found_after_a_later_save(library, make_song, capsys):
+    # 곡 하나를 고친 뒤 다른 곡을 지우고 저장 (GUI 삭제처럼) → 헤더가 고친 파일보다 최신
+    path = make_song("주님의 사랑", ["주님의 사랑 놀라워", "새로 넣은 후렴"])
+    touch_later(path, -10)
+    removed = library.find_selected({"title": "은혜"})
+    library.remove_praise_by_id(removed['id'])
+    assert library.save_to_json()
+    os.remove(library.praise_folder / "은혜.pptx")
+
+    added, changed, gone = library.file_changes()
+    assert (added, gone) == ([], [])
+    assert [p.name for _, p in changed] == ["주님의 사랑.pptx"]
+
+    out = run_incremental(library, capsys)
+    assert "추가 0개, 변경 1개, 삭제 0개" in out
+    other = reopen(library)
+    try:
+        assert [p['title'] for p in other.search_praises("새로넣은", "lyrics")] == ["주님의 사랑"]
+    finally:
+        other.wait_related()
+        other.close_binary_index()
+
+
+def test_added_and_removed_files(library, praise_folder, capsys):
+    write_pptx(praise_folder / "새 노래.pptx", [["새 노래로 찬양"]])
+    os.remove(praise_folder / "감사해.pptx")
+    out = run_incremental(library, capsys)
+    assert "추가 1개, 변경 0개, 삭제 1개" in out
+    other = reopen(library)
+    try:
+        assert sorted(p['title'] for p in other.praise_data) == ["새 노래", "은혜", "주님의 사랑"]
+        assert other.file_changes() == ([], [], [])
+    finally:
+        other.wait_related()
+        other.close_binary_index()
+
+
+def test_changed_file_keeps_its_id(library, make_song, capsys):
+    ids = {p['title']: p['id'] for p in library.praise_data}
+    touch_later(make_song("은혜", ["놀라운 은혜", "고친 줄"]))
+    assert "변경 1개" in run_incremental(library, capsys)
+    other = reopen(library)
+    try:
+        assert {p['title']: p['id'] for p in other.praise_data} == ids
+        assert other.get_praise_detail(ids["은혜"])[0]['text_lines'] == ["놀라운 은혜", "고친 줄"]
+    finally:
+        other.wait_related()
+        other.close_binary_index()
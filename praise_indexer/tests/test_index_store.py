@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""헤더/상세 세그먼트 저장소와 헤더 형식 버전 변환"""
+
+import json
+
+import pytest
+
+from binary_index import binary_index_paths
+from json_index_store import HEADER_VERSION
+from json_indexer import JSONPraiseIndexer
+
+
+@pytest.fixture
+def library(indexer, make_song):
+    make_song("주님의 사랑", ["주님의 사랑 놀라워", "나를 살리셨네"], ["할렐루야"])
+    make_song("감사해", ["감사해 감사해"])
+    assert indexer.index_praise_files()
+    return indexer
+
+
+def reopen(indexer):
+    other = JSONPraiseIndexer(praise_folder=indexer.praise_folder, output_json=indexer.output_json)
+    assert other.load_from_json()
+    return other
+
+
+def test_header_records_version(library):
+    assert library.store.read_version() == HEADER_VERSION
+    version, headers = library.store.read_header()
+    assert version == HEADER_VERSION
+    assert sorted(h['title'] for h in headers) == ["감사해", "주님의 사랑"]
+
+
+def test_old_header_version_is_migrated(library):
+    header_path = library.store.header_path
+    header = json.loads(header_path.read_text(encoding="utf-8"))
+    # 버전 1 헤더: 줄 경계/키 입력 형태/MinHash가 없음
+    for song in header["songs"]:
+        for field in ("line_ends", "slide_ends", "title_qwerty", "lyrics_qwerty", "minhash"):
+            song.pop(field)
+    header["version"] = 1
+    header_path.write_text(json.dumps(header, ensure_ascii=False), encoding="utf-8")
+    # 예전 헤더보다 최신인 바이너리 인덱스가 있어도 버전으로 판단
+    for path in binary_index_paths(library.binary_path):
+        if path.exists():
+            path.touch()
+
+    other = reopen(library)
+    try:
+        assert other.store.read_version() == HEADER_VERSION
+        praise = other.find_selected({"title": "주님의 사랑"})
+        assert praise['title_qwerty'] == "wnsladmltkfkd"
+        assert praise['minhash'] and praise['line_ends']
+        assert other.search_praises("wnsla")[0]['title'] == "주님의 사랑"
+    finally:
+        other.wait_related()
+        other.close_binary_index()
+
+
+def test_newer_header_version_is_rejected(library):
+    header_path = library.store.header_path
+    header = json.loads(header_path.read_text(encoding="utf-8"))
+    header["version"] = HEADER_VERSION + 1
+    header_path.write_text(json.dumps(header, ensure_ascii=False), encoding="utf-8")
+    with pytest.raises(ValueError):
+        library.store.read_header()
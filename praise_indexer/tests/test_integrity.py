@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""인덱스 무결성 검사 (저장된 경로 ↔ 찬양 폴더)"""
+
+import pytest
+
+from conftest import write_pptx
+from integrity import check_integrity, relink_files, repair
+
+
+@pytest.fixture
+def library(indexer, make_song):
+    for title in ("주님의 사랑", "감사해", "은혜"):
+        make_song(title, [f"{title} 가사"])
+    assert indexer.index_praise_files()
+    return indexer
+
+
+def ids_by_title(indexer):
+    return {praise["title"]: praise["id"] for praise in indexer.praise_data}
+
+
+def test_clean_index(library):
+    report = check_integrity(library)
+    assert report.clean
+    assert report.ok == 3
+
+
+def test_relink_old_paths(library):
+    ids = ids_by_title(library)
+    library.set_file_paths({ids["감사해"]: "praise_indexer\\Praise_PPT\\감사해.pptx"})
+    report = relink_files(library)
+    assert report.relinked == [(ids["감사해"], "praise_indexer\\Praise_PPT\\감사해.pptx", "감사해.pptx")]
+    assert check_integrity(library).clean
+    # 경로 갱신은 저장까지 함
+    assert library.load_from_json()
+    assert library.snapshot.find(ids["감사해"])["file_path"] == "감사해.pptx"
+
+
+def test_missing_and_orphaned(library, make_song, praise_folder):
+    ids = ids_by_title(library)
+    (praise_folder / "은혜.pptx").unlink()
+    make_song("새 노래", ["새 노래 가사"])
+    report = check_integrity(library)
+    assert report.missing == [(ids["은혜"], "은혜.pptx")]
+    assert report.orphaned == ["새 노래.pptx"]
+    assert report.to_dict()["orphaned"] == ["새 노래.pptx"]
+
+    # 옵션 없이는 레코드를 지우거나 추가하지 않음
+    result = repair(library, report)
+    assert (result["removed"], result["added"]) == (0, 0)
+    assert len(library.praise_data) == 3
+
+    result = repair(library, report, remove_missing=True, add_orphaned=True)
+    assert (result["removed"], result["added"], result["failed"]) == (1, 1, 0)
+    assert sorted(ids_by_title(library)) == ["감사해", "새 노래", "주님의 사랑"]
+    assert check_integrity(library).clean
+
+
+def test_outside_file_is_ok(library, tmp_path):
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    path = write_pptx(outside / "밖의 노래.pptx", [["밖의 노래"]])
+    assert library.add_single_file(path)
+    report = check_integrity(library)
+    assert report.clean and report.ok == 4
+
+
+def test_relink_without_folder(library, praise_folder):
+    for path in praise_folder.iterdir():
+        path.unlink()
+    praise_folder.rmdir()
+    assert relink_files(library) is None
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""JSON Lines 스트리밍 인덱싱 (중단 후 이어 하기, 완료 후 작업 파일 정리)"""
+
+import os
+
+import pytest
+
+from jsonl_index import JsonlIndexWriter, iter_jsonl_index
+
+
+@pytest.fixture
+def songs(make_song):
+    return [make_song(title, [f"{title} 가사"]) for title in ("주님의 사랑", "감사해", "은혜", "십자가")]
+
+
+def interrupted(indexer, paths, tail=b""):
+    """앞의 곡들만 기록하고 완료 표시 없이 끊긴 JSON Lines"""
+    writer = JsonlIndexWriter(indexer.jsonl_path, resume=False)
+    for praise_id, path in enumerate(paths, 1):
+        writer.write(indexer.build_praise_entry(path, praise_id))
+    writer._file.write(tail)
+    writer.close()
+
+
+def titles(indexer):
+    return sorted(praise["title"] for praise in indexer.praise_data)
+
+
+def test_complete_build_removes_work_file(indexer, songs):
+    assert indexer.index_praise_files_jsonl()
+    assert not indexer.jsonl_path.exists()
+    assert indexer.store.header_path.exists()
+    assert titles(indexer) == sorted(path.stem for path in songs)
+
+
+def test_resume_skips_written_files(indexer, songs, monkeypatch):
+    interrupted(indexer, songs[:2], tail=b'{"id": 3, "filena')
+    extracted = []
+    build = indexer.build_praise_entry
+    monkeypatch.setattr(indexer, "build_praise_entry",
+                        lambda path, praise_id: extracted.append(path.name) or build(path, praise_id))
+    assert indexer.index_praise_files_jsonl()
+    assert sorted(extracted) == sorted(path.name for path in songs[2:])
+    assert titles(indexer) == sorted(path.stem for path in songs)
+    assert len({praise["id"] for praise in indexer.praise_data}) == len(songs)
+    assert not indexer.jsonl_path.exists()
+
+
+def test_resume_drops_changed_and_removed_files(indexer, songs, monkeypatch):
+    interrupted(indexer, songs[:3])
+    stat = songs[0].stat()
+    os.utime(songs[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000_000))
+    songs[1].unlink()
+    extracted = []
+    build = indexer.build_praise_entry
+    monkeypatch.setattr(indexer, "build_praise_entry",
+                        lambda path, praise_id: extracted.append(path.name) or build(path, praise_id))
+    assert indexer.index_praise_files_jsonl()
+    assert sorted(extracted) == sorted([songs[0].name, songs[3].name])
+    praise = next(p for p in indexer.praise_data if p["filename"] == songs[0].name)
+    assert praise["mtime_ns"] == songs[0].stat().st_mtime_ns
+    assert titles(indexer) == sorted(path.stem for path in (songs[0], songs[2], songs[3]))
+
+
+def test_writer_reports_dropped_lines(indexer, songs):
+    interrupted(indexer, songs[:3])
+    writer = JsonlIndexWriter(indexer.jsonl_path, is_current=lambda record: record["filename"] == songs[2].name)
+    writer.close()
+    assert writer.dropped == 2 and writer.count == 1 and writer.last_id == 3
+    assert [record["filename"] for record in iter_jsonl_index(indexer.jsonl_path)] == [songs[2].name]
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""거의 같은 찬양 찾기 (MinHash + LSH)"""
+
+from near_duplicates import (NUM_PERMUTATIONS, DuplicateIndex, minhash_signature, shingles,
+                             signature_similarity)
+
+LYRICS = "주님의사랑놀라워라나의모든죄를씻으신주님의보혈그사랑으로나를구원하셨네할렐루야찬양하리"
+
+
+def test_shingles():
+    assert shingles("") == set()
+    assert shingles("주님") == {"주님"}
+    assert shingles("주님의사") == {"주님의", "님의사"}
+
+
+def test_signature():
+    signature = minhash_signature(LYRICS)
+    assert len(signature) == NUM_PERMUTATIONS
+    # 인덱스 파일에 저장하므로 실행마다 같은 값
+    assert signature == minhash_signature(LYRICS)
+    assert signature_similarity(signature, signature) == 1.0
+    assert len(minhash_signature("")) == 0
+    assert signature_similarity(minhash_signature(""), signature) == 0.0
+
+
+def test_clusters_and_collapse():
+    signatures = [
+        minhash_signature(LYRICS),
+        minhash_signature("감사해요깨닫지못했었는데감사해요날위한주님의사랑"),
+        minhash_signature(LYRICS + "아멘"),
+        minhash_signature(""),
+        minhash_signature(LYRICS),
+    ]
+    duplicates = DuplicateIndex(signatures)
+    assert duplicates.clusters == [[0, 2, 4]]
+    assert duplicates.duplicate_count() == 2
+    # 묶음마다 점수가 가장 높은 곡, 같으면 앞의 곡
+    assert duplicates.collapse({0: 50, 1: 100, 2: 100, 4: 100}) == {1: 100, 2: 100}
+    assert duplicates.collapse({0: 100, 4: 100, 3: 40}) == {0: 100, 3: 40}
+
+
+def test_find_duplicates_and_collapsed_search(indexer, make_song):
+    lines = ["주님의 사랑 놀라워라", "나의 모든 죄를 씻으신", "주님의 보혈 그 사랑으로", "나를 구원하셨네 할렐루야"]
+    make_song("주님의 사랑", lines)
+    make_song("주님의 사랑_v2", lines + ["아멘"])
+    make_song("감사해", ["감사해요 깨닫지 못했었는데", "감사해요 날 위한 주님의 사랑"])
+    assert indexer.index_praise_files()
+    groups = indexer.find_duplicates()
+    assert [sorted(praise["title"] for praise, _ in group) for group in groups] == [["주님의 사랑", "주님의 사랑_v2"]]
+    assert len(indexer.search_praises("주님의 사랑", "title")) == 2
+    assert len(indexer.search_praises("주님의 사랑", "title", collapse=True)) == 1
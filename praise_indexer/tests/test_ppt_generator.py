@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""PPT 생성기 (인덱서 없이 만든 생성기의 상세 로드)"""
+
+import os
+
+import pytest
+
+from benchmark import generate_template
+from binary_index import binary_index_paths, latest_binary_index_path
+from json_ppt_generator_fixed import JSONPPTGeneratorFixed
+
+
+@pytest.fixture
+def generator(tmp_path, indexer):
+    return JSONPPTGeneratorFixed(json_file=str(indexer.output_json),
+                                 template_file=str(generate_template(tmp_path / "template.pptx")))
+
+
+def lines(details):
+    return [[line for slide in detail['slides_text'] for line in slide['text_lines']] if detail else None
+            for detail in details]
+
+
+def test_standalone_generator_reads_split_index(indexer, make_song, generator, tmp_path):
+    make_song("주님의 사랑", ["주님의 사랑 놀라워"])
+    make_song("감사해", ["감사해 감사해"])
+    assert indexer.index_praise_files()
+    assert not indexer.output_json.exists()
+
+    details = generator.load_praise_details([{'title': "감사해"}, {'title': "없는 곡"}])
+    assert lines(details) == [["감사해 감사해"], None]
+    assert generator.create_ppt_from_lyrics([{'title': "감사해"}], str(tmp_path / "out.pptx"))
+
+
+def test_standalone_generator_ignores_stale_binary_index(indexer, make_song, generator):
+    make_song("주님의 사랑", ["주님의 사랑 놀라워"])
+    make_song("감사해", ["감사해 감사해"])
+    assert indexer.index_praise_files()
+    indexer.close_binary_index()
+    stale = latest_binary_index_path(indexer.binary_path).read_bytes()
+
+    make_song("주님의 사랑", ["주님의 사랑 놀라워", "새로 넣은 후렴"], ["할렐루야"])
+    assert indexer.index_praise_files()
+    indexer.close_binary_index()
+    # 헤더보다 오래된 바이너리 인덱스만 남김 (다른 프로그램이 헤더만 새로 쓴 경우 등)
+    for path in binary_index_paths(indexer.binary_path):
+        if path.exists():
+            path.unlink()
+    header_mtime = indexer.store.header_path.stat().st_mtime_ns
+    indexer.binary_path.write_bytes(stale)
+    os.utime(indexer.binary_path, ns=(header_mtime, header_mtime - 5_000_000_000))
+
+    details = generator.load_praise_details([{'title': "주님의 사랑"}])
+    assert lines(details) == [["주님의 사랑 놀라워", "새로 넣은 후렴", "할렐루야"]]
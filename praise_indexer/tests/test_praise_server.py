@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""HTTP 서비스 요청 검사 (Content-Length, /generate 본문 타입)"""
+
+import http.client
+import json
+import threading
+
+import pytest
+
+from benchmark import generate_template
+from praise_server import PraiseService, create_server
+
+
+@pytest.fixture
+def server(tmp_path, indexer, make_song):
+    make_song("주님의 사랑", ["주님의 사랑 놀라워"])
+    make_song("감사해", ["감사해 감사해"])
+    assert indexer.index_praise_files()
+    indexer.wait_related()
+    service = PraiseService(str(indexer.output_json), str(indexer.praise_folder),
+                            str(generate_template(tmp_path / "template.pptx")))
+    assert service.load()
+    server = create_server(service, "127.0.0.1", 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    service.indexer.wait_related()
+    service.indexer.close_binary_index()
+
+
+def post(server, body, headers=None):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=10)
+    try:
+        if headers is None:
+            connection.request("POST", "/generate", body=body)
+        else:
+            connection.putrequest("POST", "/generate")
+            for name, value in headers.items():
+                connection.putheader(name, value)
+            connection.endheaders()
+            connection.send(body)
+        response = connection.getresponse()
+        return response.status, response.read()
+    finally:
+        connection.close()
+
+
+def post_json(server, request):
+    return post(server, json.dumps(request, ensure_ascii=False).encode("utf-8"))
+
+
+@pytest.mark.parametrize("length, status", [("-1", 400), ("abc", 400), (str(10 ** 12), 413)])
+def test_invalid_content_length(server, length, status):
+    assert post(server, b"{}", {"Content-Length": length})[0] == status
+
+
+@pytest.mark.parametrize("request_body", [
+    {"titles": "주님의 사랑"},
+    {"titles": ["주님의 사랑", 3]},
+    {"setlist": ["주님의 사랑"]},
+    {"setlist": 7},
+    {"ids": "1"},
+    {"ids": [True]},
+])
+def test_generate_rejects_wrong_types(server, request_body):
+    status, body = post_json(server, request_body)
+    assert status == 400
+    assert "error" in json.loads(body)
+
+
+def test_generate_by_title_and_setlist(server):
+    status, body = post_json(server, {"titles": ["주님의 사랑"], "setlist": "감사해\n"})
+    assert status == 200
+    assert body.startswith(b"PK")
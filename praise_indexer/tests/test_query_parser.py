@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""검색식 파서 (AND / OR / NOT / 구절 / 괄호)"""
+
+import pytest
+
+from query_parser import evaluate, is_boolean_query, parse_query, positive_terms
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("주님 사랑", None),
+    ("", None),
+    ("사랑 AND 십자가", ("and", (("term", "사랑"), ("term", "십자가")))),
+    ("은혜 OR 감사", ("or", (("term", "은혜"), ("term", "감사")))),
+    ("-크리스마스", ("not", ("term", "크리스마스"))),
+    ("NOT 크리스마스", ("not", ("term", "크리스마스"))),
+    ('"주의 사랑"', ("term", "주의사랑")),
+    ('"AND"', ("term", "and")),
+    ("(은혜 OR 감사) -성탄", ("and", (("or", (("term", "은혜"), ("term", "감사"))), ("not", ("term", "성탄"))))),
+    ("은혜 OR 감사 십자가", ("or", (("term", "은혜"), ("and", (("term", "감사"), ("term", "십자가")))))),
+])
+def test_parse_query(query, expected):
+    assert parse_query(query) == expected
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("(은혜 OR 감사", ("or", (("term", "은혜"), ("term", "감사")))),
+    ('"주의 사랑', ("term", "주의사랑")),
+    ("사랑 AND", ("term", "사랑")),
+    ("사랑 NOT", ("term", "사랑")),
+    ("은혜) 감사", ("and", (("term", "은혜"), ("term", "감사")))),
+    ("OR", None),
+    ('""', None),
+])
+def test_parse_incomplete_query(query, expected):
+    # 입력 중인 검색어도 오류 없이 해석
+    assert parse_query(query) == expected
+
+
+def test_lowercase_operators_are_terms():
+    assert not is_boolean_query("rock and roll")
+    assert is_boolean_query("rock AND roll")
+    assert is_boolean_query('"rock"')
+
+
+def test_positive_terms():
+    node = parse_query('(은혜 OR 감사) -성탄 은혜 "주의 사랑"')
+    assert positive_terms(node) == ["은혜", "감사", "주의사랑"]
+    assert positive_terms(None) == []
+
+
+def test_evaluate():
+    texts = ["은혜 감사", "은혜 성탄", "감사", "십자가"]
+
+    def run(query):
+        lookups = []
+
+        def match_term(term):
+            lookups.append(term)
+            return {i for i, text in enumerate(texts) if term in text}
+
+        return evaluate(parse_query(query), match_term, len(texts)), lookups
+
+    assert run("은혜 AND 감사")[0] == {0}
+    assert run("은혜 OR 십자가")[0] == {0, 1, 3}
+    assert run("-은혜")[0] == {2, 3}
+    assert run("(은혜 OR 감사) -성탄")[0] == {0, 2}
+    # 같은 검색어는 한 번만 조회
+    result, lookups = run("은혜 OR (은혜 감사)")
+    assert result == {0, 1}
+    assert lookups.count("은혜") == 1
+
+
+def test_boolean_search(indexer, make_song):
+    make_song("은혜와 감사", ["은혜 감사 노래"])
+    make_song("성탄 은혜", ["성탄의 은혜"])
+    make_song("감사해", ["감사해요"])
+    assert indexer.index_praise_files()
+    titles = {praise["title"] for praise in indexer.search_praises("(은혜 OR 감사) -성탄", "title")}
+    assert titles == {"은혜와 감사", "감사해"}
+    titles = {praise["title"] for praise in indexer.search_praises("은혜 AND 감사", "lyrics")}
+    assert titles == {"은혜와 감사"}
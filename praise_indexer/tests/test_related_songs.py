@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""관련 찬양 이웃 표 (가사 TF-IDF, 가사 digest로 다시 계산할지 판단)"""
+
+from array import array
+
+import pytest
+
+from conftest import write_pptx
+from related_songs import RelatedTable, build_related_table, content_digests
+
+SONGS = [
+    (1, "주님의사랑놀라워라나의모든죄를씻으신주님의보혈"),
+    (2, "주님의사랑크고놀라워나의죄를씻으신보혈의능력"),
+    (3, "감사해요깨닫지못했었는데감사해요"),
+    (4, "감사해요날위한그은혜를감사해요"),
+    (5, "할렐루야할렐루야전능하신주"),
+]
+
+
+def test_build_and_round_trip(tmp_path):
+    table = build_related_table(SONGS, k=2)
+    assert table.related(1)[0][0] == 2
+    assert table.related(3)[0][0] == 4
+    assert table.related(99) == []
+    assert table.matches(content_digests(SONGS))
+    assert not table.matches(content_digests(SONGS[:-1]))
+    changed = SONGS[:-1] + [(5, "할렐루야새노래")]
+    assert not table.matches(content_digests(changed))
+
+    path = tmp_path / "praise_index.related.bin"
+    table.write(path)
+    loaded = RelatedTable.read(path)
+    assert list(loaded.ids) == list(table.ids)
+    assert loaded.related(1) == table.related(1)
+    assert loaded.matches(content_digests(SONGS))
+
+
+def test_duplicates_are_not_related():
+    # 같은 묶음(거의 같은 사본)은 서로의 관련 곡에서 뺀다
+    table = build_related_table(SONGS, groups={0: 0, 1: 0}, k=2)
+    assert 2 not in [praise_id for praise_id, _ in table.related(1)]
+
+
+def test_read_rejects_other_files(tmp_path):
+    path = tmp_path / "praise_index.related.bin"
+    path.write_bytes(b"NOTRELAT" + bytes(12))
+    with pytest.raises(ValueError):
+        RelatedTable.read(path)
+
+
+@pytest.fixture
+def library(indexer, make_song):
+    make_song("주님의 사랑", ["주님의 사랑 놀라워라", "나의 모든 죄를 씻으신"])
+    make_song("보혈", ["주님의 사랑 크고 놀라워", "나의 죄를 씻으신 보혈"])
+    make_song("감사해", ["감사해요 깨닫지 못했었는데"])
+    assert indexer.index_praise_files()
+    assert indexer.wait_related(10)
+    return indexer
+
+
+def test_path_only_change_reuses_table(library):
+    table = library.related
+    assert table is not None and len(table) == 3
+    library.set_file_paths({praise["id"]: f"moved/{praise['filename']}" for praise in library.praise_data})
+    library.save_to_json()
+    assert library.wait_related(10)
+    assert library.related is table
+
+
+def test_lyrics_change_rebuilds_table(library, praise_folder):
+    table = library.related
+    praise = next(p for p in library.praise_data if p["title"] == "감사해")
+    path = write_pptx(praise_folder / praise["filename"], [["할렐루야 전능하신 주"]])
+    library.replace_entries({praise["id"]: library.build_praise_entry(path, praise["id"])})
+    library.save_to_json()
+    assert library.wait_related(10)
+    assert library.related is not table
+    assert library.related.matches(content_digests(library.snapshot.lyrics()))
+    assert isinstance(library.related.digests, array)
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""검색 캐시 (검색어가 길어질 때 이전 결과로 좁히기)와 키 입력 형태 검색"""
+
+import pytest
+
+from json_indexer import JSONPraiseIndexer
+from keystroke import is_keystroke_query, to_qwerty
+
+TITLES = ("주님의 사랑", "주님 앞에", "나의 주님", "하나님의 은혜", "감사해", "십자가의 길", "wn 노래")
+
+
+@pytest.fixture
+def library(indexer, make_song):
+    for title in TITLES:
+        make_song(title, [f"{title} 가사", "할렐루야"])
+    assert indexer.index_praise_files()
+    return indexer
+
+
+def typed(indexer, query, search_type):
+    """GUI처럼 한 글자씩 입력하며 검색한 마지막 결과"""
+    for length in range(1, len(query) + 1):
+        results = indexer.search_praises(query[:length], search_type)
+    return results
+
+
+def fresh(indexer, query, search_type):
+    """캐시 없이 새로 검색한 결과"""
+    other = JSONPraiseIndexer(praise_folder=indexer.praise_folder, output_json=indexer.output_json)
+    try:
+        return other.search_praises(query, search_type)
+    finally:
+        other.wait_related()
+        other.close_binary_index()
+
+
+def test_to_qwerty():
+    assert to_qwerty("주님") == "wnsla"
+    assert to_qwerty("하나님") == "gksksla"
+    assert to_qwerty("abc") == ""
+    assert is_keystroke_query("wn")
+    assert not is_keystroke_query("w")
+    assert not is_keystroke_query("주님")
+
+
+@pytest.mark.parametrize("binary", [True, False])
+@pytest.mark.parametrize("search_type", ["title", "lyrics", "both"])
+@pytest.mark.parametrize("query", ["wnsla", "gksksla", "주님의", "하나님"])
+def test_typed_query_matches_fresh_search(library, binary, search_type, query):
+    if not binary:
+        library.close_binary_index()
+    expected = [praise['id'] for praise in fresh(library, query, search_type)]
+    assert expected
+    assert [praise['id'] for praise in typed(library, query, search_type)] == expected
+
+
+def test_keystroke_matches_rank_below_hangul_matches(library):
+    # "wn"은 "wn 노래"의 제목에 그대로 있고, 나머지는 "주"의 키 입력 형태로만 일치
+    results = library.search_praises("wn")
+    assert results[0]['title'] == "wn 노래"
+    assert {praise['title'] for praise in results[1:]} == {"주님의 사랑", "주님 앞에", "나의 주님"}
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""검색어 위치를 슬라이드/줄 단위로 바꾸기"""
+
+from search_hits import find_hits, line_offsets, normalize_line, text_span
+
+SLIDES = [
+    {"slide_number": 1, "text_lines": ["주님의 사랑", "놀라워라"]},
+    {"slide_number": 3, "text": "나의 주님\n사랑해요"},
+]
+
+
+def lyrics_normalized(slides):
+    return "".join(normalize_line(line) for slide in slides
+                   for line in slide.get("text_lines") or slide["text"].split("\n"))
+
+
+def test_line_offsets():
+    assert line_offsets(SLIDES) == ([5, 9, 13, 17], [2, 4])
+    assert line_offsets(None) == ([], [])
+
+
+def test_find_hits():
+    line_ends, slide_ends = line_offsets(SLIDES)
+    hits = find_hits(lyrics_normalized(SLIDES), line_ends, slide_ends, "사랑")
+    assert hits == [
+        {"slide_index": 0, "line_index": 0, "start": 3, "end": 5},
+        {"slide_index": 1, "line_index": 1, "start": 0, "end": 2},
+    ]
+    assert len(find_hits(lyrics_normalized(SLIDES), line_ends, slide_ends, "사랑", limit=1)) == 1
+    assert find_hits(lyrics_normalized(SLIDES), line_ends, slide_ends, "없는말") == []
+
+
+def test_hit_across_lines_is_split():
+    line_ends, slide_ends = line_offsets(SLIDES)
+    # "주님" + "사랑해요": 슬라이드 안의 두 줄에 걸침
+    hits = find_hits(lyrics_normalized(SLIDES), line_ends, slide_ends, "주님사랑")
+    assert hits == [
+        {"slide_index": 1, "line_index": 0, "start": 2, "end": 4},
+        {"slide_index": 1, "line_index": 1, "start": 0, "end": 2},
+    ]
+
+
+def test_empty_lines_are_skipped():
+    slides = [{"slide_number": 1, "text_lines": ["은혜", "", "감사"]}]
+    line_ends, slide_ends = line_offsets(slides)
+    hits = find_hits(lyrics_normalized(slides), line_ends, slide_ends, "혜감")
+    assert [(hit["line_index"], hit["start"], hit["end"]) for hit in hits] == [(0, 1, 2), (2, 0, 1)]
+
+
+def test_text_span():
+    line = "나의  주님 Love"
+    assert text_span(line, 2, 4) == (4, 6)
+    assert text_span(line, 4, 8) == (7, 11)
+    assert text_span(line, 20, 22) == (len(line), len(line))
+
+
+def test_indexer_find_hits(indexer, make_song):
+    make_song("주님의 사랑", ["주님의 사랑", "놀라워라"], ["나의 주님", "사랑해요"])
+    assert indexer.index_praise_files()
+    praise = indexer.praise_data[0]
+    assert praise["line_ends"] and praise["slide_ends"]
+    assert indexer.get_matching_slides(praise, "사랑해") == [1]
+    assert indexer.get_matching_slides(praise, "주님 OR 놀라워") == [0, 1]
+    hits = indexer.find_hits(praise, "주님 -없는말")
+    assert [(hit["slide_index"], hit["line_index"]) for hit in hits] == [(0, 0), (1, 0)]
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""검색 결과 페이지 나누기 (커서)"""
+
+import pytest
+
+from json_indexer import StaleCursorError
+
+
+@pytest.fixture
+def library(indexer, make_song):
+    for number in range(1, 8):
+        make_song(f"주님 찬양 {number}", [f"주님 찬양 {number} 가사"])
+    make_song("다른 노래", ["주님 가사"])
+    assert indexer.index_praise_files()
+    return indexer
+
+
+def test_pages_cover_all_results_once(library):
+    expected = [praise["id"] for praise in library.search_praises("주님", "both")]
+    ids, cursor = [], None
+    while True:
+        page, cursor = library.search_page("주님", "both", cursor=cursor, page_size=3)
+        ids.extend(praise["id"] for praise in page)
+        if cursor is None:
+            break
+    assert ids == expected
+    assert len(ids) == 8
+
+
+def test_cursor_rejected_after_index_changes(library):
+    page, cursor = library.search_page("주님", "title", page_size=3)
+    assert len(page) == 3 and cursor is not None
+    library.remove_praise_by_id(page[0]["id"])
+    with pytest.raises(StaleCursorError):
+        library.search_page("주님", "title", cursor=cursor, page_size=3)
+    # 처음부터 다시 검색하면 바뀐 인덱스로 이어진다
+    page, cursor = library.search_page("주님", "title", page_size=3)
+    rest, _ = library.search_page("주님", "title", cursor=cursor, page_size=10)
+    assert len(page) + len(rest) == 6
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""콘티 일괄 찾기"""
+
+from setlist_resolver import RESOLVE_SCORE, SetlistResolver, parse_setlist
+
+TITLES = {
+    1: ("주님의 사랑", "주님의사랑"),
+    2: ("주님의 은혜", "주님의은혜"),
+    3: ("감사해", "감사해"),
+    4: ("십자가의 길", "십자가의길"),
+}
+
+
+def test_parse_setlist():
+    text = "1. 주님의 사랑 (G)\n2) 감사해 [A키]\n\n- 십자가의 길 (Bb key)\n• 은혜\n나의 주님"
+    assert parse_setlist(text) == ["주님의 사랑", "감사해", "십자가의 길", "은혜", "나의 주님"]
+
+
+def test_exact_title_is_resolved():
+    result = SetlistResolver(TITLES).resolve_one("주님의  사랑")
+    assert result["matches"][0] == (1, "주님의 사랑", 100.0)
+    assert result["resolved"]
+
+
+def test_typo_matches_closest_title():
+    result = SetlistResolver(TITLES).resolve_one("십자가에 길")
+    assert result["matches"][0][0] == 4
+    assert result["matches"][0][2] >= RESOLVE_SCORE - 10
+
+
+def test_ambiguous_title_is_not_resolved():
+    result = SetlistResolver(TITLES).resolve_one("주님의")
+    assert {praise_id for praise_id, _, _ in result["matches"][:2]} == {1, 2}
+    assert not result["resolved"]
+
+
+def test_lyrics_fallback():
+    resolver = SetlistResolver(TITLES, lyrics_search=lambda query: [3] if query == "깨닫지못했었는데" else [])
+    result = resolver.resolve_one("깨닫지 못했었는데")
+    assert result["matches"][0][0] == 3
+
+
+def test_indexer_resolve_setlist(indexer, make_song):
+    make_song("주님의 사랑", ["주님의 사랑 놀라워라"])
+    make_song("감사해", ["감사해요 깨닫지 못했었는데"])
+    assert indexer.index_praise_files()
+    results = indexer.resolve_setlist("1. 주님의 사랑 (G)\n2. 깨닫지 못했었는데")
+    assert [result["matches"][0][1] for result in results] == ["주님의 사랑", "감사해"]
+    assert results[0]["resolved"]
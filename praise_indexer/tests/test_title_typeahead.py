@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""제목 자동완성 (접두어 / 초성)"""
+
+from title_typeahead import TitleTypeahead, is_chosung_query, to_chosung
+
+TITLES = [
+    (1, "주님의 은혜", "주님의은혜"),
+    (2, "주님 앞에", "주님앞에"),
+    (3, "감사해", "감사해"),
+    (4, "주 은혜", "주은혜"),
+]
+
+
+def test_to_chosung():
+    assert to_chosung("주님의은혜") == "ㅈㄴㅇㅇㅎ"
+    assert to_chosung("ab까치") == "abㄲㅊ"
+    assert is_chosung_query("ㅈㄴ")
+    assert not is_chosung_query("ㅈ님")
+    assert not is_chosung_query("")
+
+
+def test_suggest_prefix_and_chosung():
+    typeahead = TitleTypeahead(TITLES)
+    assert typeahead.suggest("주님") == [(2, "주님 앞에"), (1, "주님의 은혜")]
+    assert typeahead.suggest("ㅈㄴ") == [(2, "주님 앞에"), (1, "주님의 은혜")]
+    assert typeahead.suggest("ㅈ", limit=1) == [(2, "주님 앞에")]
+    assert typeahead.suggest("은혜") == []
+    assert typeahead.suggest("") == []
+
+
+def test_add_remove_on_copy():
+    typeahead = TitleTypeahead(TITLES)
+    clone = typeahead.copy()
+    clone.remove(2)
+    clone.add(3, "감사하세", "감사하세")
+    clone.add(5, "주님께", "주님께")
+    assert clone.suggest("주님") == [(5, "주님께"), (1, "주님의 은혜")]
+    assert clone.suggest("ㄱㅅ") == [(3, "감사하세")]
+    assert not clone.remove(2)
+    # 원본(게시한 스냅샷의 자동완성)은 그대로
+    assert typeahead.suggest("주님") == [(2, "주님 앞에"), (1, "주님의 은혜")]
+    assert len(typeahead) == 4 and len(clone) == 4
+
+
+def test_indexer_suggest_titles(indexer, make_song):
+    for title in ("주님의 은혜", "주님 앞에", "감사해"):
+        make_song(title, [f"{title} 가사"])
+    assert indexer.index_praise_files()
+    assert [title for _, title in indexer.suggest_titles("ㅈㄴ")] == ["주님 앞에", "주님의 은혜"]
+    assert indexer.suggest_titles("주님 OR 감사") == []
+    praise_id = next(p["id"] for p in indexer.praise_data if p["title"] == "주님 앞에")
+    indexer.remove_praise_by_id(praise_id)
+    assert [title for _, title in indexer.suggest_titles("주님")] == ["주님의 은혜"]
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""로그 레벨 설정과 시간 구간 추적"""
+
+import io
+import logging
+
+import pytest
+
+import tracing
+
+
+@pytest.fixture(autouse=True)
+def restore_logger():
+    logger = logging.getLogger(tracing.LOGGER_NAME)
+    level, handlers = logger.level, list(logger.handlers)
+    yield
+    logger.setLevel(level)
+    logger.handlers[:] = handlers
+
+
+def test_invalid_env_level_falls_back_with_warning(monkeypatch):
+    monkeypatch.setenv(tracing.LOG_LEVEL_ENV, "VERBOSE")
+    monkeypatch.delenv(tracing.TRACE_ENV, raising=False)
+    tracing.configure_from_env(default_level="WARNING")
+    logger = logging.getLogger(tracing.LOGGER_NAME)
+    assert logger.level == logging.WARNING
+
+
+def test_invalid_level_warns_on_console():
+    stream = io.StringIO()
+    tracing.enable_logging("nonsense", stream)
+    assert logging.getLogger(tracing.LOGGER_NAME).level == logging.INFO
+    assert "nonsense" in stream.getvalue()
+
+
+@pytest.mark.parametrize("level, expected", [("debug", logging.DEBUG), (" Warning ", logging.WARNING),
+                                             (logging.ERROR, logging.ERROR)])
+def test_valid_levels(level, expected):
+    tracing.enable_logging(level, io.StringIO())
+    assert logging.getLogger(tracing.LOGGER_NAME).level == expected
+
+
+def test_span_records_only_when_enabled():
+    tracer = tracing.Tracer()
+    with tracer.span("off"):
+        pass
+    tracer.start()
+    with tracer.span("on", songs=3):
+        pass
+    tracer.stop()
+    assert list(tracer.summary()) == ["on"]
+    assert tracer.to_chrome_trace()["traceEvents"][0]["args"] == {"songs": "3"}
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+제목 자동완성 (정렬 배열 기반 접두어 인덱스)
+
+정규화된 제목(title_normalized)과 그 초성 형태("주님의은혜" → "ㅈㄴㅇㅇㅎ")를
+각각 정렬된 배열로 유지한다. 접두어 검색은 bisect로 시작 위치를 찾고
+앞에서부터 N개를 잘라 오므로 찬양 수와 거의 무관하게 빠르다.
+찬양 추가/삭제 시에는 전체를 다시 만들지 않고 해당 항목만 넣고 뺀다.
+"""
+
+from bisect import bisect_left
+
+# 한글 음절의 초성 (호환용 자모)
+CHOSUNG = (
+    "ㄱ", "ㄲ", "ㄴ", "ㄷ", "ㄸ", "ㄹ", "ㅁ", "ㅂ", "ㅃ", "ㅅ",
+    "ㅆ", "ㅇ", "ㅈ", "ㅉ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ",
+)
+_CHOSUNG_SET = frozenset(CHOSUNG)
+
+_HANGUL_FIRST = 0xAC00
+_HANGUL_LAST = 0xD7A3
+# 초성 하나당 음절 수 (중성 21 × 종성 28)
+_SYLLABLES_PER_CHOSUNG = 588
+
+
+def to_chosung(text):
+    """한글 음절을 초성으로 바꾼 문자열 (한글이 아닌 글자는 그대로)"""
+    chars = []
+    for char in text:
+        code = ord(char)
+        if _HANGUL_FIRST <= code <= _HANGUL_LAST:
+            chars.append(CHOSUNG[(code - _HANGUL_FIRST) // _SYLLABLES_PER_CHOSUNG])
+        else:
+            chars.append(char)
+    return "".join(chars)
+
+
+def is_chosung_query(text):
+    """초성만으로 된 검색어인지 확인 (예: "ㅈㄴㅇ")"""
+    return bool(text) and all(char in _CHOSUNG_SET for char in text)
+
+
+class PrefixIndex:
+    """(키, 찬양 ID)를 키 순서로 정렬해 둔 배열"""
+
+    def __init__(self, entries=()):
+        entries = sorted(entries)
+        self.keys = [key for key, _ in entries]
+        self.ids = [praise_id for _, praise_id in entries]
+
+    def copy(self):
+        clone = PrefixIndex.__new__(PrefixIndex)
+        clone.keys = list(self.keys)
+        clone.ids = list(self.ids)
+        return clone
+
+    def add(self, key, praise_id):
+        position = bisect_left(self.keys, key)
+        # 같은 키 안에서는 ID 순서 유지
+        while position < len(self.keys) and self.keys[position] == key and self.ids[position] < praise_id:
+            position += 1
+        self.keys.insert(position, key)
+        self.ids.insert(position, praise_id)
+
+    def remove(self, key, praise_id):
+        position = bisect_left(self.keys, key)
+        while position < len(self.keys) and self.keys[position] == key:
+            if self.ids[position] == praise_id:
+                del self.keys[position]
+                del self.ids[position]
+                return True
+            position += 1
+        return False
+
+    def prefix_ids(self, prefix, limit):
+        """prefix로 시작하는 키의 찬양 ID (키 순서, 최대 limit개)"""
+        keys = self.keys
+        position = bisect_left(keys, prefix)
+        result = []
+        while position < len(keys) and len(result) < limit and keys[position].startswith(prefix):
+            result.append(self.ids[position])
+            position += 1
+        return result
+
+
+class TitleTypeahead:
+    """제목 / 초성 접두어 자동완성"""
+
+    def __init__(self, titles=()):
+        """titles: (찬양 ID, 제목, 정규화된 제목) 목록"""
+        self.titles = {}
+        title_entries = []
+        chosung_entries = []
+        for praise_id, title, title_normalized in titles:
+            chosung = to_chosung(title_normalized)
+            self.titles[praise_id] = (title, title_normalized, chosung)
+            title_entries.append((title_normalized, praise_id))
+            chosung_entries.append((chosung, praise_id))
+        self.title_index = PrefixIndex(title_entries)
+        self.chosung_index = PrefixIndex(chosung_entries)
+
+    def __len__(self):
+        return len(self.titles)
+
+    def copy(self):
+        """복사본 (게시한 인덱스 스냅샷의 자동완성은 그대로 두고 복사본에 추가/삭제)"""
+        clone = TitleTypeahead.__new__(TitleTypeahead)
+        clone.titles = dict(self.titles)
+        clone.title_index = self.title_index.copy()
+        clone.chosung_index = self.chosung_index.copy()
+        return clone
+
+    def add(self, praise_id, title, title_normalized):
+        """찬양 하나 추가 (이미 있으면 교체)"""
+        self.remove(praise_id)
+        chosung = to_chosung(title_normalized)
+        self.titles[praise_id] = (title, title_normalized, chosung)
+        self.title_index.add(title_normalized, praise_id)
+        self.chosung_index.add(chosung, praise_id)
+
+    def remove(self, praise_id):
+        """찬양 하나 제거"""
+        entry = self.titles.pop(praise_id, None)
+        if entry is None:
+            return False
+        _, title_normalized, chosung = entry
+        self.title_index.remove(title_normalized, praise_id)
+        self.chosung_index.remove(chosung, praise_id)
+        return True
+
+    def suggest(self, prefix_normalized, limit=10):
+        """정규화된 접두어로 시작하는 제목 (찬양 ID, 제목) 목록
+
+        초성만 입력하면 초성 형태로, 아니면 정규화된 제목으로 찾는다.
+        """
+        if not prefix_normalized:
+            return []
+        index = self.chosung_index if is_chosung_query(prefix_normalized) else self.title_index
+        return [(praise_id, self.titles[praise_id][0]) for praise_id in index.prefix_ids(prefix_normalized, limit)]
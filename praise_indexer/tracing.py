@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+로그와 시간 구간 추적
+
+모든 모듈은 get_logger()로 "praise_indexer" 아래의 로거를 받아 쓴다.
+기본으로는 NullHandler만 붙어 있어 아무것도 출력하지 않으며, 메시지도
+%-형식 인자로 넘기므로 꺼져 있을 때는 문자열을 만들지 않는다.
+콘솔 출력이 필요하면 enable_logging()을 호출하거나 PRAISE_LOG_LEVEL
+환경 변수(DEBUG/INFO/WARNING/ERROR)를 지정한다.
+
+span("이름")으로 감싼 구간은 추적이 켜져 있을 때만 기록되고, 기록은
+Chrome 추적 형식(chrome://tracing, Perfetto에서 열림) JSON으로 내보낼 수
+있다. PRAISE_TRACE 환경 변수에 파일 경로를 지정하면 종료할 때 저장한다.
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+
+LOGGER_NAME = "praise_indexer"
+LOG_FORMAT = "[%(levelname)s] %(message)s"
+LOG_LEVEL_ENV = "PRAISE_LOG_LEVEL"
+# 알 수 없는 레벨을 지정했을 때 쓰는 레벨
+DEFAULT_LOG_LEVEL = "INFO"
+TRACE_ENV = "PRAISE_TRACE"
+
+logging.getLogger(LOGGER_NAME).addHandler(logging.NullHandler())
+
+
+def get_logger(name):
+    """모듈별 로거 ("praise_indexer.<name>")"""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+def enable_logging(level="INFO", stream=None, fallback=DEFAULT_LOG_LEVEL):
+    """콘솔 로그 출력 켜기 (이미 켠 콘솔 출력은 교체)
+
+    알 수 없는 레벨(PRAISE_LOG_LEVEL 오타 등)이면 예외 대신 경고를 남기고 fallback으로 켠다.
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    for handler in list(logger.handlers):
+        if getattr(handler, "praise_console", False):
+            logger.removeHandler(handler)
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    handler.praise_console = True
+    logger.addHandler(handler)
+    resolved = _log_level(level)
+    if resolved is None:
+        resolved = _log_level(fallback) or logging.INFO
+        logger.setLevel(resolved)
+        logger.warning("알 수 없는 로그 레벨 %r → %s 레벨로 표시 (DEBUG/INFO/WARNING/ERROR 중 하나)",
+                       level, logging.getLevelName(resolved))
+    else:
+        logger.setLevel(resolved)
+    return handler
+
+
+def _log_level(level):
+    """로그 레벨 이름/숫자 → logging 레벨 숫자 (알 수 없으면 None)"""
+    if isinstance(level, int) and not isinstance(level, bool):
+        return level
+    if isinstance(level, str):
+        value = logging.getLevelName(level.strip().upper())
+        if isinstance(value, int):
+            return value
+    return None
+
+
+class _NullSpan:
+    """추적이 꺼져 있을 때 쓰는 빈 구간"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.add(self.name, self.start, time.perf_counter(), self.args)
+        return False
+
+
+class Tracer:
+    """시간 구간 기록기 (스레드 안전)"""
+
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+        self.origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """기록 시작 (이전 기록은 지움)"""
+        with self._lock:
+            self.events = []
+            self.origin = time.perf_counter()
+            self.enabled = True
+
+    def stop(self):
+        self.enabled = False
+
+    def span(self, name, **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def add(self, name, start, end, args=None):
+        event = (name, start, end, threading.get_ident(), args or None)
+        with self._lock:
+            self.events.append(event)
+
+    def summary(self):
+        """구간 이름별 {"count", "total_ms", "max_ms"}"""
+        result = {}
+        with self._lock:
+            events = list(self.events)
+        for name, start, end, _, _ in events:
+            elapsed = (end - start) * 1000
+            entry = result.setdefault(name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] += elapsed
+            entry["max_ms"] = max(entry["max_ms"], elapsed)
+        return result
+
+    def to_chrome_trace(self):
+        """Chrome 추적 형식 (완료 이벤트, 마이크로초 단위)"""
+        with self._lock:
+            events = list(self.events)
+        pid = os.getpid()
+        trace_events = []
+        for name, start, end, thread_id, args in events:
+            event = {
+                "name": name,
+                "ph": "X",
+                "ts": (start - self.origin) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": pid,
+                "tid": thread_id,
+            }
+            if args:
+                event["args"] = {key: str(value) for key, value in args.items()}
+            trace_events.append(event)
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def export(self, path):
+        """기록을 Chrome 추적 형식 JSON 파일로 저장"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f, ensure_ascii=False)
+        return path
+
+
+tracer = Tracer()
+
+
+def span(name, **args):
+    """시간 구간 (추적이 꺼져 있으면 아무것도 하지 않음)
+
+        with span("save", file=output_file):
+            prs.save(output_file)
+    """
+    if not tracer.enabled:
+        return _NULL_SPAN
+    return _Span(tracer, name, args)
+
+
+def configure_from_env(default_level=None):
+    """환경 변수(PRAISE_LOG_LEVEL, PRAISE_TRACE)에 따라 로그/추적 켜기
+
+    PRAISE_LOG_LEVEL이 없으면 default_level로 켠다 (None이면 꺼진 채로 둠).
+    PRAISE_LOG_LEVEL이 올바르지 않으면 경고와 함께 default_level(없으면 DEFAULT_LOG_LEVEL)로 켠다.
+    """
+    level = os.environ.get(LOG_LEVEL_ENV) or default_level
+    if level:
+        enable_logging(level, fallback=default_level or DEFAULT_LOG_LEVEL)
+    trace_path = os.environ.get(TRACE_ENV)
+    if trace_path:
+        tracer.start()
+        atexit.register(tracer.export, trace_path)